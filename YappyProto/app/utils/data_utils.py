@@ -5,6 +5,11 @@ from pathlib import Path
 from typing import List
 import pandas as pd
 
+try:  # mismo motor de .xlsx que YappySA (rápido, memoria constante, hojas partidas)
+    from YappySA.infra.reporting.xlsx_writer import write_xlsx
+except ImportError:  # YappyProto corrido solo, sin YappySA en el path
+    write_xlsx = None
+
 # ----- Config básica -----
 REQUIRED_COLS = ["name","email","national_id","client_type","company_name","alias","phone"]
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -95,8 +100,11 @@ def export_outputs(personal: pd.DataFrame, commercial: pd.DataFrame) -> Path:
 
     personal.to_csv(p_path, index=False, encoding="utf-8")
     commercial.to_csv(c_path, index=False, encoding="utf-8")
-    with pd.ExcelWriter(all_path, engine="openpyxl") as xlw:
-        personal.to_excel(xlw, sheet_name="personal", index=False)
-        commercial.to_excel(xlw, sheet_name="commercial", index=False)
+    if write_xlsx is not None:
+        write_xlsx(all_path, {"personal": personal, "commercial": commercial})
+    else:
+        with pd.ExcelWriter(all_path, engine="openpyxl") as xlw:
+            personal.to_excel(xlw, sheet_name="personal", index=False)
+            commercial.to_excel(xlw, sheet_name="commercial", index=False)
 
     return OUT_DIR
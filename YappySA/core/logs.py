@@ -0,0 +1,46 @@
+# YappySA/core/logs.py
+"""
+Logging de la app: outputs/logs/yappysa.log y slow_sql.log (rotativos).
+
+Los módulos usan logging.getLogger("yappysa.<área>"); setup_logging() lo
+llama la app de escritorio al arrancar. Sin llamarlo (herramientas,
+scripts) los mensajes siguen la configuración de logging del proceso.
+"""
+from __future__ import annotations
+
+import logging
+from logging.handlers import RotatingFileHandler
+
+from YappySA.core.paths import outputs_dir
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+_configured = False
+
+
+def _rotating(path) -> RotatingFileHandler:
+    handler = RotatingFileHandler(path, maxBytes=2_000_000, backupCount=5, encoding="utf-8")
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    return handler
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """
+    Agrega los archivos rotativos (una sola vez): yappysa.log para el logger
+    "yappysa" y slow_sql.log solo para las sentencias lentas.
+    """
+    global _configured
+    if _configured:
+        return
+    log_dir = outputs_dir() / "logs"
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        main, slow = _rotating(log_dir / "yappysa.log"), _rotating(log_dir / "slow_sql.log")
+    except OSError:
+        return  # sin permisos de escritura: la app sigue sin log en archivo
+    root = logging.getLogger("yappysa")
+    root.addHandler(main)
+    root.setLevel(level)
+    slow_sql = logging.getLogger("yappysa.sql.slow")
+    slow_sql.addHandler(slow)
+    slow_sql.propagate = False  # no repetir cada sentencia en yappysa.log
+    _configured = True
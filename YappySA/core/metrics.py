@@ -0,0 +1,66 @@
+# YappySA/core/metrics.py
+"""
+Mediciones livianas para reportar tiempos por etapa y memoria.
+
+- StageTimer: tiempo de pared y de CPU (del hilo actual) por etapa.
+- peak_rss_mb(): pico de memoria residente del proceso.
+"""
+from __future__ import annotations
+
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class StageTimer:
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self._open: Dict[str, tuple] = {}
+
+    def start(self, name: str) -> None:
+        self._open[name] = (time.perf_counter(), time.thread_time())
+
+    def stop(self, name: str) -> None:
+        """Acumula en `name` lo transcurrido desde start(name) (se puede repetir la etapa)."""
+        wall0, cpu0 = self._open.pop(name)
+        acc = self.stages.setdefault(name, {"wall_s": 0.0, "cpu_s": 0.0})
+        acc["wall_s"] += time.perf_counter() - wall0
+        acc["cpu_s"] += time.thread_time() - cpu0
+
+    @contextmanager
+    def stage(self, name: str):
+        """with timer.stage("x"): ...  equivale a start("x") / stop("x")."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos desde que se creó el timer."""
+        return time.perf_counter() - self._t0
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"wall_s": round(v["wall_s"], 4), "cpu_s": round(v["cpu_s"], 4)}
+            for name, v in self.stages.items()
+        }
+
+
+def peak_rss_mb() -> float | None:
+    """Pico de memoria residente del proceso (MB), si el sistema lo informa."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    except ImportError:
+        pass
+    try:
+        import psutil  # Windows: no hay módulo resource
+        info = psutil.Process().memory_info()
+        return round(getattr(info, "peak_wset", info.rss) / 2**20, 1)
+    except ImportError:
+        return None
@@ -0,0 +1,15 @@
+# YappySA/core/paths.py
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+
+def outputs_dir() -> Path:
+    """
+    Carpeta outputs/: junto al ejecutable en el .exe (PyInstaller)
+    y en la raíz del repo en desarrollo.
+    """
+    if getattr(sys, "frozen", False):
+        return Path(sys.executable).resolve().parent / "outputs"
+    return Path(__file__).resolve().parents[2] / "outputs"
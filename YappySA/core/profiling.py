@@ -0,0 +1,167 @@
+# YappySA/core/profiling.py
+"""
+Perfilado opcional (cProfile + tracemalloc) de las rutas pesadas.
+
+Se activa con la variable de entorno YAPPYSA_PROFILE, leída al decorar
+(al importar el módulo de la función). Apagado, @profiled devuelve la
+función original: costo cero.
+
+  YAPPYSA_PROFILE=1              todo lo decorado
+  YAPPYSA_PROFILE=import,pdf     solo esos nombres (import, query, export, pdf)
+
+En el .exe basta con poner la variable en el .env junto al ejecutable:
+run_yappysa.py lo carga en el entorno antes de importar la app.
+
+Cada llamada deja en outputs/profiles/:
+  <fecha>_<nombre>.pstats   para snakeviz / `python -m pstats`
+  <fecha>_<nombre>.txt      parámetros, tiempo, pico de memoria, funciones
+                            más costosas y líneas que más memoria reservaron
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import io
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+from YappySA.core.paths import outputs_dir
+
+PROFILE_ENV = "YAPPYSA_PROFILE"
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 25
+
+log = logging.getLogger("yappysa.profile")
+
+_LOCK = threading.Lock()
+_active = 0            # llamadas perfiladas en curso (tracemalloc es de todo el proceso)
+_owns_tracing = False  # tracemalloc lo encendimos aquí (y aquí se apaga)
+_local = threading.local()
+
+
+def enabled_for(name: str) -> bool:
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return False
+    if value in ("1", "true", "yes", "on", "all"):
+        return True
+    return name.lower() in {v.strip() for v in value.split(",")}
+
+
+def _describe(value) -> str:
+    """Parámetro legible y corto (DataFrames por forma, widgets por clase)."""
+    shape = getattr(value, "shape", None)
+    if shape is not None and hasattr(value, "columns"):
+        return f"DataFrame({shape[0]} filas x {shape[1]} columnas)"
+    if type(value).__module__.startswith("PySide6"):
+        return type(value).__name__
+    text = repr(value)
+    return text if len(text) <= 200 else text[:197] + "..."
+
+
+def _params(func, args, kwargs) -> dict:
+    try:
+        bound = inspect.signature(func).bind(*args, **kwargs)
+    except TypeError:
+        return {"args": _describe(args), "kwargs": _describe(kwargs)}
+    return {k: _describe(v) for k, v in bound.arguments.items()}
+
+
+def _write_report(name, func, params, profiler, wall, peak, snapshot, error) -> None:
+    import pstats
+    import tracemalloc
+
+    out_dir = outputs_dir() / "profiles"
+    stem = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{name}"
+    try:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        if profiler is not None:
+            profiler.dump_stats(out_dir / f"{stem}.pstats")
+
+        buf = io.StringIO()
+        buf.write(f"{name}: {func.__module__}.{func.__qualname__}\n")
+        for k, v in params.items():
+            buf.write(f"  {k} = {v}\n")
+        buf.write(f"\nTiempo: {wall:.3f} s\n")
+        if peak is not None:
+            buf.write(f"Pico de memoria reservada (tracemalloc): {peak / 2**20:.1f} MB\n")
+        if error is not None:
+            buf.write(f"Terminó con error: {error!r}\n")
+
+        if profiler is not None:
+            buf.write(f"\n=== Funciones (acumulado, top {TOP_FUNCTIONS}) ===\n")
+            pstats.Stats(profiler, stream=buf).strip_dirs().sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+
+        if snapshot is not None:
+            buf.write(f"=== Memoria aún reservada al terminar, por línea (top {TOP_ALLOCATIONS}) ===\n")
+            snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+            for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+                buf.write(f"{stat}\n")
+        (out_dir / f"{stem}.txt").write_text(buf.getvalue(), encoding="utf-8")
+    except OSError as e:
+        log.warning("no se pudo guardar el perfil de %s (%s)", name, e)
+        return
+    log.info("perfil de %s guardado en %s", name, out_dir / stem)
+
+
+def profiled(name: str):
+    """
+    Decorador: con el perfilado activo para `name`, corre la función bajo
+    cProfile y tracemalloc y guarda el reporte. Si no, no la toca.
+    """
+    def decorate(func):
+        if not enabled_for(name):
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            # Llamadas anidadas (p. ej. export dentro de import) van en el perfil externo
+            if getattr(_local, "busy", False):
+                return func(*args, **kwargs)
+
+            import cProfile
+            import tracemalloc
+
+            global _active, _owns_tracing
+            with _LOCK:
+                if _active == 0 and not tracemalloc.is_tracing():
+                    tracemalloc.start()
+                    _owns_tracing = True
+                _active += 1
+            tracemalloc.reset_peak()
+
+            params = _params(func, args, kwargs)
+            profiler = cProfile.Profile()
+            error = None
+            _local.busy = True
+            t0 = time.perf_counter()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: un solo cProfile activo por proceso; esta llamada
+                # (concurrente con otra perfilada) queda solo con tiempo y memoria
+                profiler = None
+            try:
+                return func(*args, **kwargs)
+            except BaseException as e:
+                error = e
+                raise
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                wall = time.perf_counter() - t0
+                _local.busy = False
+                peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+                snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+                with _LOCK:
+                    _active -= 1
+                    if _active == 0 and _owns_tracing:
+                        tracemalloc.stop()
+                        _owns_tracing = False
+                _write_report(name, func, params, profiler, wall, peak, snapshot, error)
+
+        return wrapper
+    return decorate
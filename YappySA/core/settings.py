@@ -13,6 +13,20 @@ class Settings(BaseSettings):
     MSSQL_PWD: str | None = Field(default=None)
     ODBC_DRIVER: str = Field(default="ODBC Driver 17 for SQL Server")
     TRUSTED_CONN: bool = Field(default=False)  # true/1/yes habilita autenticación integrada
+    CLIENT_SEARCH_ENABLED: bool = Field(default=False)  # lecturas desde la tabla client_search
+    SEARCH_INDEX_ENABLED: bool = Field(default=False)   # mantener client_token al importar
+    FETCH_BACKEND: str = Field(default="pandas")        # "pandas" o "arrow" (requiere pyarrow)
+    LOCAL_REPLICA_PATH: str | None = Field(default=None)  # archivo SQLite de la réplica local
+    READ_REPLICA_URLS: str | None = Field(default=None)   # URLs SQLAlchemy de réplicas de lectura, separadas por coma
+    READ_REPLICA_CHECK_SECONDS: int = Field(default=30)   # cada cuánto se revisa si una réplica responde
+    DB_POOL_SIZE: int = Field(default=5)          # conexiones que el pool mantiene abiertas
+    DB_MAX_OVERFLOW: int = Field(default=5)       # conexiones extra permitidas en picos
+    DB_POOL_TIMEOUT: int = Field(default=30)      # segundos esperando una conexión libre
+    DB_POOL_RECYCLE: int = Field(default=1800)    # segundos antes de reabrir una conexión
+    SQL_TRACE_ENABLED: bool = Field(default=False) # hooks de traza SQL en cada engine (costo por sentencia)
+    SQL_TRACE_BUFFER: int = Field(default=2000)    # sentencias que guarda el buffer en memoria
+    SQL_SLOW_MS: int = Field(default=500)          # desde cuántos ms una sentencia va al log de lentas
+    SPILL_ROWS: int = Field(default=100_000)       # "Ver todo": con más filas el resultado va a disco (Arrow)
 
     # Dónde leer el .env
     model_config = SettingsConfigDict(
@@ -29,4 +43,35 @@ class Settings(BaseSettings):
         # Autenticación SQL normal
         return f"mssql+pyodbc://{self.MSSQL_USER}:{self.MSSQL_PWD}@{self.MSSQL_SERVER}/{self.MSSQL_DB}?driver={drv}"
 
-settings = Settings()
+    @property
+    def read_replica_urls(self) -> list[str]:
+        return [u.strip() for u in (self.READ_REPLICA_URLS or "").split(",") if u.strip()]
+
+_SETTINGS: Settings | None = None
+
+
+def get_settings() -> Settings:
+    """
+    Settings del proceso. Se leen del entorno / .env la primera vez que se
+    piden (no al importar), así importar la app no exige un .env válido.
+    """
+    global _SETTINGS
+    if _SETTINGS is None:
+        _SETTINGS = Settings()
+    return _SETTINGS
+
+
+def override_settings(value: Settings | None) -> None:
+    """
+    Reemplaza los settings del proceso (pruebas, herramientas).
+    None vuelve a leerlos del entorno en el próximo get_settings().
+    """
+    global _SETTINGS
+    _SETTINGS = value
+
+
+def __getattr__(name: str):
+    # Compatibilidad: `from YappySA.core.settings import settings`
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,71 @@
+# YappySA/core/startup.py
+"""
+Tiempos de arranque de la app de escritorio.
+
+run_yappysa.py importa este módulo primero y se llama mark() en cada etapa
+(UI importada, ventana visible, primer pintado, pandas/BD listos).
+write_report() guarda en outputs/startup.json cuánto duró cada etapa y qué
+paquetes se importaron en ella, al estilo de `python -X importtime`
+pero agrupado por etapa.
+
+Para el detalle módulo a módulo y el presupuesto de arranque:
+  python -m YappySA.tools.startup_budget
+"""
+from __future__ import annotations
+
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from YappySA.core.paths import outputs_dir
+
+log = logging.getLogger("yappysa.startup")
+
+_T0 = time.perf_counter()
+_LOCK = threading.Lock()
+_last = _T0
+_seen = set(sys.modules)
+_stages: list[dict] = []
+
+
+def mark(stage: str) -> None:
+    """Cierra la etapa actual: duración y paquetes importados desde la marca anterior."""
+    global _last, _seen
+    with _LOCK:
+        now = time.perf_counter()
+        loaded = set(sys.modules)
+        new = loaded - _seen
+        packages = Counter(name.split(".", 1)[0] for name in new)
+        _stages.append({
+            "stage": stage,
+            "at_ms": round((now - _T0) * 1000, 1),
+            "took_ms": round((now - _last) * 1000, 1),
+            "modules": len(new),
+            "packages": dict(packages.most_common(10)),
+        })
+        _last, _seen = now, loaded
+
+
+def report() -> dict:
+    with _LOCK:
+        return {
+            "python": sys.version.split()[0],
+            "frozen": bool(getattr(sys, "frozen", False)),
+            "stages": list(_stages),
+        }
+
+
+def write_report(path: str | Path | None = None) -> Path | None:
+    """Guarda report() como JSON. No interrumpe la app si no se puede escribir."""
+    out = Path(path) if path else outputs_dir() / "startup.json"
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_text(json.dumps(report(), indent=2, ensure_ascii=False), encoding="utf-8")
+    except OSError as e:
+        log.warning("No se pudo guardar el reporte de arranque: %s", e)
+        return None
+    return out
@@ -1,2 +1,8 @@
 # YappySA/infra/db/__init__.py
-from .session import engine, SessionLocal
+def __getattr__(name: str):
+    # engine / SessionLocal se crean al primer uso (ver session.py); importar el
+    # paquete no carga SQLAlchemy (la UI importa cancellation al arrancar)
+    if name in ("engine", "SessionLocal"):
+        from . import session
+        return getattr(session, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,111 @@
+# YappySA/infra/db/arrow_fetch.py
+"""
+Lectura columnar de resultados (Arrow) con tipos compactos para pandas.
+
+pd.read_sql_query arma columnas object fila a fila; aquí las filas del
+cursor se leen por lotes, se transponen a columnas y se convierten en
+RecordBatch de Arrow con tipo fijo por columna:
+
+  client_type  -> dictionary  (pandas: category)
+  client_id    -> string      (pandas: string[pyarrow], un buffer contiguo)
+  national_id, ruc, email, phone, alias, display_name -> string[pyarrow]
+  created_at   -> timestamp   (pandas: datetime64)
+
+Requiere pyarrow (se importa solo si settings.FETCH_BACKEND == "arrow").
+"""
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+DEFAULT_BATCH_ROWS = 50_000
+
+_CATEGORY_COLUMNS = {"client_type"}
+_TIMESTAMP_COLUMNS = {"created_at"}
+_TIMESTAMP = pa.timestamp("us")
+
+
+def _to_array(name: str, values, dictionary: bool = True) -> pa.Array:
+    if name in _TIMESTAMP_COLUMNS:
+        try:
+            return pa.array(values, type=_TIMESTAMP)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+            # SQLite devuelve las fechas como texto ISO
+            return pa.array([None if v is None else str(v) for v in values], pa.string()).cast(_TIMESTAMP)
+    if dictionary and name in _CATEGORY_COLUMNS:
+        return pa.array(values, pa.string()).dictionary_encode()
+    try:
+        return pa.array(values, pa.string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        # uniqueidentifier como uuid.UUID, números en columnas de texto, etc.
+        return pa.array([None if v is None else str(v) for v in values], pa.string())
+
+
+def iter_batches(result, batch_rows: int = DEFAULT_BATCH_ROWS, dictionary: bool = True):
+    """
+    RecordBatch de a `batch_rows` filas desde un Result de SQLAlchemy (fetchmany).
+    dictionary=False deja client_type como string: un archivo IPC no admite
+    diccionarios distintos en cada lote (ver spill.py).
+    """
+    names = list(result.keys())
+    while True:
+        rows = result.fetchmany(batch_rows)
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [_to_array(n, col, dictionary) for n, col in zip(names, columns)], names=names
+        )
+
+
+def empty_table(names, dictionary: bool = True) -> pa.Table:
+    return pa.table({n: _to_array(n, [], dictionary) for n in names})
+
+
+def read_arrow(conn, statement, params: Optional[dict] = None, batch_rows: int = DEFAULT_BATCH_ROWS) -> pa.Table:
+    """
+    Ejecuta `statement` en `conn` (Connection de SQLAlchemy) y devuelve un pa.Table
+    construido lote a lote con fetchmany.
+    """
+    result = conn.execute(statement, params or {})
+    batches = list(iter_batches(result, batch_rows))
+    if not batches:
+        return empty_table(result.keys())
+    # Los diccionarios pueden variar entre lotes; se unifican al combinar
+    table = pa.Table.from_batches(batches)
+    return table.unify_dictionaries() if len(batches) > 1 else table
+
+
+def _types_mapper(arrow_type):
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.StringDtype("pyarrow")
+    return None
+
+
+def to_compact_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Convierte a DataFrame sin pasar por object: strings respaldados por Arrow,
+    diccionarios como category y timestamps como datetime64.
+    El Table no debe reutilizarse después (self_destruct libera sus buffers).
+    """
+    return table.to_pandas(types_mapper=_types_mapper, split_blocks=True, self_destruct=True)
+
+
+def memory_report(df: pd.DataFrame) -> Dict[str, int]:
+    """Bytes por columna (deep) más la clave "__total__"."""
+    usage = df.memory_usage(index=False, deep=True)
+    report = {str(col): int(n) for col, n in usage.items()}
+    report["__total__"] = int(usage.sum())
+    return report
+
+
+def read_frame(conn, statement, params: Optional[dict] = None) -> pd.DataFrame:
+    """
+    read_arrow + to_compact_pandas. Deja en df.attrs["fetch"] el backend,
+    las filas y la memoria por columna.
+    """
+    df = to_compact_pandas(read_arrow(conn, statement, params))
+    df.attrs["fetch"] = {"backend": "arrow", "rows": len(df), "memory": memory_report(df)}
+    return df
@@ -0,0 +1,95 @@
+# YappySA/infra/db/cancellation.py
+"""
+Cancelación de consultas en curso desde otro hilo.
+
+La UI crea un CancelToken por petición y lo pasa a las funciones de
+queries.py; si llega una petición más nueva, llama token.cancel(), que usa
+el mecanismo del driver:
+  - pyodbc:  cursor.cancel()        (SQLCancel)
+  - sqlite3: connection.interrupt()
+La consulta cancelada termina con QueryCancelled.
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager, nullcontext
+
+
+class QueryCancelled(Exception):
+    """La consulta fue cancelada porque llegó una petición más reciente."""
+
+
+class CancelToken:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._cursors: list = []
+        self._dbapi_conns: list = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def raise_if_cancelled(self) -> None:
+        if self._cancelled:
+            raise QueryCancelled()
+
+    def cancel(self) -> None:
+        """
+        Marca el token y cancela lo que esté ejecutándose (seguro desde cualquier hilo).
+
+        Se cancela con el lock tomado: watch() quita los cursores bajo el mismo
+        lock antes de devolver la conexión al pool, así que no se puede
+        interrumpir una conexión que ya usa otra consulta. cancel() e
+        interrupt() no esperan a que la consulta termine.
+        """
+        with self._lock:
+            self._cancelled = True
+            for cur in self._cursors:
+                if hasattr(cur, "cancel"):
+                    try:
+                        cur.cancel()
+                    except Exception:
+                        pass
+            for dbapi_conn in self._dbapi_conns:
+                if hasattr(dbapi_conn, "interrupt"):
+                    try:
+                        dbapi_conn.interrupt()
+                    except Exception:
+                        pass
+
+    def _register(self, conn, cursor, *_args) -> None:
+        with self._lock:
+            if self._cancelled:
+                raise QueryCancelled()
+            self._cursors.append(cursor)
+            self._dbapi_conns.append(conn.connection.dbapi_connection)
+
+    @contextmanager
+    def watch(self, conn):
+        """
+        Registra los cursores que se ejecuten en `conn` (Connection de SQLAlchemy)
+        mientras dure el bloque.
+        """
+        from sqlalchemy import event  # la UI importa este módulo al arrancar
+
+        self.raise_if_cancelled()
+        event.listen(conn, "before_cursor_execute", self._register)
+        try:
+            yield conn
+        except QueryCancelled:
+            raise
+        except Exception as e:
+            if self._cancelled:
+                raise QueryCancelled() from e
+            raise
+        finally:
+            event.remove(conn, "before_cursor_execute", self._register)
+            with self._lock:
+                self._cursors.clear()
+                self._dbapi_conns.clear()
+
+
+def watch(conn, token: CancelToken | None):
+    """token.watch(conn) o un contexto vacío si no hay token."""
+    return token.watch(conn) if token is not None else nullcontext(conn)
@@ -0,0 +1,134 @@
+# YappySA/infra/db/client_search.py
+"""
+Tabla desnormalizada `client_search`: una fila por cliente con las mismas
+columnas que _BASE_SELECT (display_name ya resuelto), para que las lecturas
+no tengan que hacer los LEFT JOIN + CASE en cada consulta.
+
+- La mantiene el pipeline de importación (sync_client, misma transacción).
+- Las consultas la usan si settings.CLIENT_SEARCH_ENABLED es True.
+- rebuild() / check_consistency() para reconstruirla y verificarla
+  (CLI: python -m YappySA.tools.client_search).
+"""
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from YappySA.infra.db.queries import _BASE_SELECT
+
+SEARCH_COLUMNS = (
+    "client_id",
+    "client_type",
+    "display_name",
+    "national_id",
+    "ruc",
+    "email",
+    "phone",
+    "alias",
+    "created_at",
+)
+_COLS = ", ".join(SEARCH_COLUMNS)
+
+CREATE_TABLE_SQL = """
+IF OBJECT_ID('dbo.client_search', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.client_search (
+        client_id     UNIQUEIDENTIFIER NOT NULL PRIMARY KEY NONCLUSTERED,
+        client_type   NVARCHAR(20)     NOT NULL,
+        display_name  NVARCHAR(300)    NULL,
+        national_id   NVARCHAR(50)     NULL,
+        ruc           NVARCHAR(50)     NULL,
+        email         NVARCHAR(320)    NULL,
+        phone         NVARCHAR(50)     NULL,
+        alias         NVARCHAR(100)    NULL,
+        created_at    DATETIME2        NULL
+    );
+    CREATE CLUSTERED INDEX cx_client_search_created ON dbo.client_search (created_at DESC);
+    CREATE INDEX ix_client_search_nid ON dbo.client_search (national_id) WHERE national_id IS NOT NULL;
+    CREATE INDEX ix_client_search_ruc ON dbo.client_search (ruc) WHERE ruc IS NOT NULL;
+END
+"""
+
+# Misma tabla para la base local de pruebas (SQLite)
+_CREATE_TABLE_SQLITE = [
+    """
+    CREATE TABLE IF NOT EXISTS client_search (
+        client_id     TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,
+        client_type   TEXT NOT NULL,
+        display_name  TEXT NULL,
+        national_id   TEXT NULL,
+        ruc           TEXT NULL,
+        email         TEXT NULL,
+        phone         TEXT NULL,
+        alias         TEXT NULL,
+        created_at    TIMESTAMP NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS cx_client_search_created ON client_search (created_at DESC)",
+    "CREATE INDEX IF NOT EXISTS ix_client_search_nid ON client_search (national_id) WHERE national_id IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_client_search_ruc ON client_search (ruc) WHERE ruc IS NOT NULL",
+]
+
+
+def create_table(conn) -> None:
+    """Crea client_search (y sus índices) si no existe."""
+    if conn.dialect.name == "mssql":
+        conn.execute(text(CREATE_TABLE_SQL))
+        return
+    for stmt in _CREATE_TABLE_SQLITE:
+        conn.execute(text(stmt))
+
+
+def sync_client(session, client_id) -> None:
+    """
+    Inserta/reemplaza la fila de un cliente a partir de las tablas normalizadas.
+    Pensado para llamarse dentro de la misma transacción que el INSERT.
+    """
+    params = {"cid": client_id}
+    session.execute(text("DELETE FROM client_search WHERE client_id = :cid"), params)
+    session.execute(
+        text(f"INSERT INTO client_search ({_COLS})\n{_BASE_SELECT}\nWHERE c.client_id = :cid"),
+        params,
+    )
+
+
+def rebuild(conn) -> int:
+    """
+    Vacía y vuelve a llenar client_search con todos los clientes.
+    Devuelve el número de filas resultante.
+    """
+    conn.execute(text("DELETE FROM client_search"))
+    conn.execute(text(f"INSERT INTO client_search ({_COLS})\n{_BASE_SELECT}"))
+    return int(conn.execute(text("SELECT COUNT(*) FROM client_search")).scalar_one())
+
+
+def check_consistency(conn) -> dict:
+    """
+    Compara client_search con la vista consolidada.
+
+    Devuelve:
+      - missing:  clientes sin fila en client_search
+      - orphans:  filas de client_search sin cliente
+      - mismatch: filas presentes en ambos lados pero con valores distintos
+      - ok:       True si todo cuadra
+    """
+    base = f"SELECT {_COLS} FROM ({_BASE_SELECT}) b"
+    search = f"SELECT {_COLS} FROM client_search"
+
+    missing = conn.execute(text("""
+        SELECT COUNT(*) FROM client c
+        WHERE NOT EXISTS (SELECT 1 FROM client_search s WHERE s.client_id = c.client_id)
+    """)).scalar_one()
+    orphans = conn.execute(text("""
+        SELECT COUNT(*) FROM client_search s
+        WHERE NOT EXISTS (SELECT 1 FROM client c WHERE c.client_id = s.client_id)
+    """)).scalar_one()
+    # Filas de la vista que no aparecen idénticas en client_search, menos las que faltan
+    differing = conn.execute(text(f"SELECT COUNT(*) FROM ({base} EXCEPT {search}) d")).scalar_one()
+    mismatch = int(differing) - int(missing)
+
+    return {
+        "missing": int(missing),
+        "orphans": int(orphans),
+        "mismatch": max(0, mismatch),
+        "ok": not (missing or orphans or mismatch > 0),
+    }
@@ -0,0 +1,100 @@
+# YappySA/infra/db/dialects.py
+"""
+Diferencias de SQL entre SQL Server (producción) y SQLite (base local para
+pruebas y benchmarks), en un solo lugar.
+
+repository.py, queries.py y migrations.py piden el dialecto de su conexión
+con dialect_of(...) y usan:
+  - insert_client():  alta en `client` devolviendo el client_id
+                      (NEWID() + OUTPUT en SQL Server, uuid4 en SQLite)
+  - first_rows:       "primeras :n filas" después del ORDER BY
+  - no_seek():        una condición que no debe guiar el plan (ver queries.py)
+  - tables_ddl:       CREATE TABLE de las tablas base (ver migrations.py)
+
+Verificación de que ambos motores se comportan igual: tests/test_dialects.py
+(SQL Server solo con YAPPYSA_TEST_MSSQL_URL).
+"""
+from __future__ import annotations
+
+import uuid
+from abc import ABC, abstractmethod
+from typing import List
+
+from sqlalchemy import text
+
+
+class Dialect(ABC):
+    name: str = ""
+    first_rows: str = ""
+
+    @property
+    @abstractmethod
+    def tables_ddl(self) -> List[str]:
+        """CREATE TABLE de las tablas base."""
+
+    @abstractmethod
+    def insert_client(self, conn, kind: str):
+        """Inserta en client y devuelve el client_id generado."""
+
+    def no_seek(self, expr: str) -> str:
+        """`expr` escrita para que el motor no elija su índice como acceso principal."""
+        return expr
+
+
+class MSSQLDialect(Dialect):
+    name = "mssql"
+    first_rows = "OFFSET 0 ROWS FETCH NEXT :n ROWS ONLY;"
+
+    @property
+    def tables_ddl(self) -> List[str]:
+        from YappySA.infra.db.migrations import _TABLES_MSSQL
+        return _TABLES_MSSQL
+
+    def insert_client(self, conn, kind: str):
+        res = conn.execute(text("""
+            INSERT INTO client (client_id, client_type)
+            OUTPUT inserted.client_id
+            VALUES (NEWID(), :kind)
+        """), {"kind": kind})
+        return res.scalar_one()
+
+
+class SQLiteDialect(Dialect):
+    name = "sqlite"
+    first_rows = "LIMIT :n;"
+
+    @property
+    def tables_ddl(self) -> List[str]:
+        from YappySA.infra.db.migrations import _TABLES_SQLITE
+        return _TABLES_SQLITE
+
+    def insert_client(self, conn, kind: str):
+        # SQLite no genera UUID: se crea aquí con el mismo formato que NEWID()
+        client_id = str(uuid.uuid4()).upper()
+        conn.execute(text("""
+            INSERT INTO client (client_id, client_type)
+            VALUES (:cid, :kind)
+        """), {"cid": client_id, "kind": kind})
+        return client_id
+
+    def no_seek(self, expr: str) -> str:
+        # El + unario descarta el índice de la columna; sin ANALYZE SQLite
+        # prefiere el índice por tipo aunque haya un filtro por clave
+        return f"+{expr}"
+
+
+DIALECTS = {d.name: d for d in (MSSQLDialect(), SQLiteDialect())}
+
+
+def get_dialect(name: str) -> Dialect:
+    try:
+        return DIALECTS[name]
+    except KeyError:
+        raise ValueError(f"Motor de base de datos no soportado: {name!r}") from None
+
+
+def dialect_of(bind) -> Dialect:
+    """Dialecto de un Engine, Connection o Session."""
+    if hasattr(bind, "get_bind"):
+        bind = bind.get_bind()
+    return get_dialect(bind.dialect.name)
@@ -0,0 +1,231 @@
+# YappySA/infra/db/instrumentation.py
+"""
+Instrumentación SQL con los eventos de SQLAlchemy.
+
+- count_round_trips(): cuenta las sentencias de un bloque (pipeline).
+- instrument(engine): lo llama make_engine() en cada engine. Guarda en un
+  buffer circular (SQL_TRACE_BUFFER entradas) la forma de cada sentencia,
+  su duración y filas afectadas; las que superan SQL_SLOW_MS van además al
+  logger "yappysa.sql.slow" (outputs/logs/slow_sql.log con setup_logging()).
+- TimedQueuePool: QueuePool que mide la espera por una conexión libre.
+- summary() / export_json(): agregados por forma de sentencia, para el
+  diálogo "Diagnóstico SQL" de la app de escritorio.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+from YappySA.core.settings import get_settings
+
+slow_log = logging.getLogger("yappysa.sql.slow")
+
+_LOCK = threading.Lock()
+_STATEMENTS: deque | None = None   # dicts: ts, db, shape, ms, rows, batch
+_WAITS: deque | None = None        # (ts, ms) de cada checkout del pool
+_SHAPE_MAX = 400
+
+
+@contextmanager
+def count_round_trips(engine):
+    """
+    Cuenta las sentencias que el hilo actual envía a `engine` dentro del bloque
+    (un executemany cuenta como una). Las consultas de otros hilos, p. ej.
+    la UI mientras corre una importación, no se cuentan.
+
+        with count_round_trips(engine) as counter:
+            ...
+        counter["statements"]
+    """
+    counter = {"statements": 0}
+    tid = threading.get_ident()
+
+    def _count(*_args):
+        if threading.get_ident() == tid:
+            counter["statements"] += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+# -------------------------------------------------
+# Forma de la sentencia
+# -------------------------------------------------
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w:@])-?\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"(?::\w+|%\(\w+\)s|\?)")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)+\s*\)", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(sql: str) -> str:
+    """
+    SQL sin literales ni nombres de parámetros: las consultas que solo
+    cambian de valores (o de largo de un IN (...)) comparten forma.
+    """
+    shape = _SPACES.sub(" ", sql).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("IN (?...)", shape)
+    return shape[:_SHAPE_MAX]
+
+
+# -------------------------------------------------
+# Buffer y hooks
+# -------------------------------------------------
+def _buffers() -> tuple[deque, deque]:
+    global _STATEMENTS, _WAITS
+    if _STATEMENTS is None:
+        with _LOCK:
+            if _STATEMENTS is None:
+                size = get_settings().SQL_TRACE_BUFFER
+                _WAITS = deque(maxlen=size)
+                _STATEMENTS = deque(maxlen=size)
+    return _STATEMENTS, _WAITS
+
+
+def _record_wait(ms: float) -> None:
+    _buffers()[1].append((time.time(), ms))
+
+
+def instrument(engine) -> None:
+    """Registra los hooks de traza en `engine` (una vez por engine)."""
+    if engine.dialect.name == "sqlite" and engine.url.database in (None, "", ":memory:"):
+        label = "sqlite:memory"
+    else:
+        label = f"{engine.dialect.name}:{engine.url.host or engine.url.database}"
+    slow_ms = get_settings().SQL_SLOW_MS
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_trace_t0", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_trace_t0")
+        if not stack:
+            return
+        ms = (time.perf_counter() - stack.pop()) * 1000
+        rows = getattr(cursor, "rowcount", -1)
+        entry = {
+            "ts": time.time(),
+            "db": label,
+            "shape": statement_shape(statement),
+            "ms": round(ms, 3),
+            "rows": rows if rows is not None and rows >= 0 else None,
+            "batch": len(parameters) if executemany else 1,
+        }
+        _buffers()[0].append(entry)
+        if ms >= slow_ms:
+            slow_log.info(json.dumps(entry, ensure_ascii=False))
+
+    @event.listens_for(engine, "handle_error")
+    def _error(exc_context):
+        # La sentencia falló: after_cursor_execute no corre, se descarta su inicio
+        conn = exc_context.connection
+        if conn is not None and conn.info.get("_trace_t0"):
+            conn.info["_trace_t0"].pop()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que anota cuánto se esperó cada conexión (incluye abrirla si no había)."""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            _record_wait((time.perf_counter() - t0) * 1000)
+
+
+# -------------------------------------------------
+# Resumen / exportación
+# -------------------------------------------------
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def recent(limit: int | None = None) -> list[dict]:
+    """Últimas sentencias del buffer (la más reciente al final)."""
+    items = list(_buffers()[0])
+    return items[-limit:] if limit else items
+
+
+def summary() -> dict:
+    """
+    Agregados del buffer: por forma de sentencia (ordenadas por tiempo total)
+    y esperas del pool.
+    """
+    statements, waits = _buffers()
+    groups: dict[tuple, dict] = {}
+    durations: dict[tuple, list] = {}
+    for e in list(statements):
+        key = (e["db"], e["shape"])
+        g = groups.get(key)
+        if g is None:
+            g = groups[key] = {"db": e["db"], "shape": e["shape"], "count": 0,
+                               "total_ms": 0.0, "rows": 0, "batch": 0}
+            durations[key] = []
+        g["count"] += 1
+        g["total_ms"] += e["ms"]
+        g["rows"] += e["rows"] or 0
+        g["batch"] += e["batch"]
+        durations[key].append(e["ms"])
+
+    rows = []
+    for key, g in groups.items():
+        ms = sorted(durations[key])
+        g.update(
+            total_ms=round(g["total_ms"], 1),
+            avg_ms=round(g["total_ms"] / g["count"], 2),
+            p95_ms=round(_percentile(ms, 95), 2),
+            max_ms=round(ms[-1], 2),
+        )
+        rows.append(g)
+    rows.sort(key=lambda g: g["total_ms"], reverse=True)
+
+    wait_ms = sorted(ms for _, ms in list(waits))
+    return {
+        "statements": rows,
+        "count": sum(g["count"] for g in rows),
+        "slow_ms": get_settings().SQL_SLOW_MS,
+        "pool": {
+            "checkouts": len(wait_ms),
+            "avg_ms": round(sum(wait_ms) / len(wait_ms), 2) if wait_ms else 0.0,
+            "p95_ms": round(_percentile(wait_ms, 95), 2),
+            "max_ms": round(wait_ms[-1], 2) if wait_ms else 0.0,
+        },
+    }
+
+
+def export_json(path: str | Path) -> Path:
+    """Guarda summary() y las sentencias del buffer como JSON."""
+    path = Path(path)
+    data = {"generated_at": datetime.now().isoformat(timespec="seconds"), **summary(), "recent": recent()}
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+    return path
+
+
+def clear() -> None:
+    """Vacía el buffer (sentencias y esperas del pool)."""
+    statements, waits = _buffers()
+    statements.clear()
+    waits.clear()
@@ -0,0 +1,208 @@
+# YappySA/infra/db/migrations.py
+"""
+DDL del esquema de clientes e índices que necesitan las consultas de
+queries.py, para SQL Server (producción) y SQLite (base local de pruebas).
+
+- create_schema(engine):    crea las tablas si no existen.
+- validate_indexes(engine): informa qué índices están, faltan o no aplican.
+- ensure_indexes(engine):   crea los índices faltantes.
+
+CLI: python -m YappySA.tools.db_diagnostics
+"""
+from __future__ import annotations
+
+from typing import List, NamedTuple, Tuple
+
+from sqlalchemy import inspect, text
+
+# -------------------------------------------------
+# Tablas base
+# -------------------------------------------------
+_TABLES_MSSQL = [
+    """
+    IF OBJECT_ID('dbo.client', 'U') IS NULL
+    CREATE TABLE dbo.client (
+        client_id    UNIQUEIDENTIFIER NOT NULL CONSTRAINT pk_client PRIMARY KEY DEFAULT NEWID(),
+        client_type  NVARCHAR(20)     NOT NULL,
+        created_at   DATETIME2        NOT NULL CONSTRAINT df_client_created_at DEFAULT SYSDATETIME()
+    )
+    """,
+    """
+    IF OBJECT_ID('dbo.personal_client', 'U') IS NULL
+    CREATE TABLE dbo.personal_client (
+        client_id    UNIQUEIDENTIFIER NOT NULL CONSTRAINT pk_personal_client PRIMARY KEY
+                     REFERENCES dbo.client (client_id),
+        full_name    NVARCHAR(200)    NOT NULL,
+        national_id  NVARCHAR(50)     NULL
+    )
+    """,
+    """
+    IF OBJECT_ID('dbo.commercial_client', 'U') IS NULL
+    CREATE TABLE dbo.commercial_client (
+        client_id       UNIQUEIDENTIFIER NOT NULL CONSTRAINT pk_commercial_client PRIMARY KEY
+                        REFERENCES dbo.client (client_id),
+        company_name    NVARCHAR(200)    NULL,
+        representative  NVARCHAR(200)    NULL,
+        ruc             NVARCHAR(50)     NOT NULL
+    )
+    """,
+    """
+    IF OBJECT_ID('dbo.contact_info', 'U') IS NULL
+    CREATE TABLE dbo.contact_info (
+        client_id  UNIQUEIDENTIFIER NOT NULL CONSTRAINT pk_contact_info PRIMARY KEY
+                   REFERENCES dbo.client (client_id),
+        email      NVARCHAR(320)    NULL,
+        phone      NVARCHAR(50)     NULL,
+        alias      NVARCHAR(100)    NULL
+    )
+    """,
+]
+
+_TABLES_SQLITE = [
+    """
+    CREATE TABLE IF NOT EXISTS client (
+        client_id    TEXT NOT NULL PRIMARY KEY COLLATE NOCASE,  -- uniqueidentifier no distingue mayúsculas
+        client_type  TEXT NOT NULL,
+        created_at   TIMESTAMP NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS personal_client (
+        client_id    TEXT NOT NULL PRIMARY KEY REFERENCES client (client_id),
+        full_name    TEXT NOT NULL,
+        national_id  TEXT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS commercial_client (
+        client_id       TEXT NOT NULL PRIMARY KEY REFERENCES client (client_id),
+        company_name    TEXT NULL,
+        representative  TEXT NULL,
+        ruc             TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS contact_info (
+        client_id  TEXT NOT NULL PRIMARY KEY REFERENCES client (client_id),
+        email      TEXT NULL,
+        phone      TEXT NULL,
+        alias      TEXT NULL
+    )
+    """,
+]
+
+
+def create_schema(engine) -> None:
+    """Crea client, personal_client, commercial_client y contact_info si no existen."""
+    from YappySA.infra.db.dialects import dialect_of
+
+    with engine.begin() as conn:
+        for stmt in dialect_of(conn).tables_ddl:
+            conn.execute(text(stmt))
+
+
+# -------------------------------------------------
+# Índices requeridos por queries.py
+# -------------------------------------------------
+class IndexSpec(NamedTuple):
+    name: str
+    table: str
+    columns: Tuple[str, ...]          # "col" o "col DESC"
+    include: Tuple[str, ...] = ()     # SQL Server: INCLUDE; SQLite: se agregan a la clave
+    unique: bool = False
+    where: str | None = None          # índice filtrado (ambos motores lo soportan)
+    reason: str = ""
+
+
+INDEXES: List[IndexSpec] = [
+    IndexSpec(
+        "ix_client_created_at", "client", ("created_at DESC",), include=("client_type", "client_id"),
+        reason="ORDER BY created_at DESC de 'últimas N' (cubre client_type)",
+    ),
+    IndexSpec(
+        "ix_client_type_created_at", "client", ("client_type", "created_at DESC"), include=("client_id",),
+        reason="filtro por tipo + fecha desde, ordenado por fecha",
+    ),
+    IndexSpec(
+        "ux_personal_client_national_id", "personal_client", ("national_id",), unique=True,
+        where="national_id IS NOT NULL",
+        reason="búsqueda por cédula y duplicados en importación",
+    ),
+    IndexSpec(
+        "ux_commercial_client_ruc", "commercial_client", ("ruc",), unique=True,
+        reason="búsqueda por RUC y duplicados en importación",
+    ),
+]
+
+
+def _bare(col: str) -> str:
+    return col.split()[0].lower()
+
+
+def _key_columns(spec: IndexSpec, dialect_name: str) -> List[str]:
+    cols = list(spec.columns)
+    if dialect_name != "mssql":
+        cols += [c for c in spec.include]
+    return cols
+
+
+def create_index_sql(spec: IndexSpec, dialect_name: str) -> str:
+    unique = "UNIQUE " if spec.unique else ""
+    cols = ", ".join(_key_columns(spec, dialect_name))
+    sql = f"CREATE {unique}INDEX {spec.name} ON {spec.table} ({cols})"
+    if dialect_name == "mssql" and spec.include:
+        sql += f" INCLUDE ({', '.join(spec.include)})"
+    if spec.where:
+        sql += f" WHERE {spec.where}"
+    return sql
+
+
+def _existing_keys(insp, table: str) -> List[Tuple[str, List[str]]]:
+    """(nombre, columnas) de índices, PK y UNIQUE existentes en la tabla."""
+    found = []
+    for ix in insp.get_indexes(table):
+        found.append((ix.get("name") or "", [str(c).lower() for c in ix.get("column_names") or [] if c]))
+    pk = insp.get_pk_constraint(table) or {}
+    if pk.get("constrained_columns"):
+        found.append((pk.get("name") or "PRIMARY KEY", [c.lower() for c in pk["constrained_columns"]]))
+    for uq in insp.get_unique_constraints(table):
+        found.append((uq.get("name") or "", [c.lower() for c in uq.get("column_names") or []]))
+    return found
+
+
+def validate_indexes(engine) -> List[dict]:
+    """
+    Revisa cada IndexSpec. Un índice creado a mano con otro nombre cuenta
+    si empieza por las mismas columnas.
+
+    Cada resultado: {name, table, status: ok|missing|no_table, matched_by, reason}
+    """
+    insp = inspect(engine)
+    tables = {t.lower() for t in insp.get_table_names()}
+    report = []
+    for spec in INDEXES:
+        row = {"name": spec.name, "table": spec.table, "status": "missing", "matched_by": None, "reason": spec.reason}
+        if spec.table.lower() not in tables:
+            row["status"] = "no_table"
+            report.append(row)
+            continue
+        wanted = [_bare(c) for c in spec.columns]
+        for name, cols in _existing_keys(insp, spec.table):
+            if name.lower() == spec.name.lower() or cols[: len(wanted)] == wanted:
+                row["status"] = "ok"
+                row["matched_by"] = name
+                break
+        report.append(row)
+    return report
+
+
+def ensure_indexes(engine) -> List[str]:
+    """Crea los índices faltantes. Devuelve los nombres creados."""
+    created = []
+    missing = [r for r in validate_indexes(engine) if r["status"] == "missing"]
+    specs = {s.name: s for s in INDEXES}
+    with engine.begin() as conn:
+        for r in missing:
+            conn.execute(text(create_index_sql(specs[r["name"]], engine.dialect.name)))
+            created.append(r["name"])
+    return created
@@ -1,12 +1,21 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Iterable, List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Union
 
 import pandas as pd
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
 
-from YappySA.infra.db.session import engine
+from YappySA.core.profiling import profiled
+from YappySA.core.settings import get_settings
+from YappySA.infra.db import search_index
+from YappySA.infra.db.cancellation import CancelToken, watch
+from YappySA.infra.db.dialects import get_dialect
+from YappySA.infra.db.session import get_engine, mark_unhealthy, read_engine
+
+if TYPE_CHECKING:
+    from YappySA.infra.db.spill import SpilledResult
 
 
 # -------------------------------------------------
@@ -62,29 +71,316 @@ LEFT JOIN commercial_client m  ON m.client_id = c.client_id
 LEFT JOIN contact_info      ci ON ci.client_id = c.client_id
 """
 
+# Columnas filtrables/ordenables dentro de _BASE_SELECT
+_BASE_COLUMNS = {
+    "client_id": "c.client_id",
+    "client_type": "c.client_type",
+    "national_id": "p.national_id",
+    "ruc": "m.ruc",
+    "created_at": "c.created_at",
+}
+
+
+# -------------------------------------------------
+# Misma proyección leída de la tabla desnormalizada
+# (ver YappySA/infra/db/client_search.py)
+# -------------------------------------------------
+_SEARCH_SELECT = """
+SELECT
+    c.client_id,
+    c.client_type,
+    c.display_name,
+    c.national_id,
+    c.ruc,
+    c.email,
+    c.phone,
+    c.alias,
+    c.created_at
+FROM client_search c
+"""
+
+_SEARCH_COLUMNS = {
+    "client_id": "c.client_id",
+    "client_type": "c.client_type",
+    "national_id": "c.national_id",
+    "ruc": "c.ruc",
+    "created_at": "c.created_at",
+}
+
+# Filtro por cédula / RUC ({} = lista de parámetros). Sobre las tablas va por
+# el índice único de personal_client / commercial_client: con la condición
+# sobre el LEFT JOIN el plan recorre client por tipo y descarta después.
+_BASE_LOOKUPS = {
+    "national_id": "c.client_id IN (SELECT client_id FROM personal_client WHERE national_id IN ({}))",
+    "ruc": "c.client_id IN (SELECT client_id FROM commercial_client WHERE ruc IN ({}))",
+}
+_SEARCH_LOOKUPS = {
+    "national_id": "c.national_id IN ({})",
+    "ruc": "c.ruc IN ({})",
+}
+
+
+# Orígenes de lectura:
+#   "auto"    réplica de lectura sana (settings.READ_REPLICA_URLS) o la principal
+#   "primary" siempre la principal (p. ej. leer lo que se acaba de importar)
+#   "local"   réplica SQLite local (ver YappySA/infra/db/replica.py)
+def _source(source: str = "auto") -> tuple[str, dict]:
+    """
+    Devuelve (SELECT, columnas) según el origen y settings.CLIENT_SEARCH_ENABLED.
+    La réplica local siempre tiene la forma de client_search.
+    """
+    if source == "local" or get_settings().CLIENT_SEARCH_ENABLED:
+        return _SEARCH_SELECT, _SEARCH_COLUMNS
+    return _BASE_SELECT, _BASE_COLUMNS
+
+
+def _engine_for(source: str = "auto"):
+    """Engine del origen de lectura indicado."""
+    if source == "local":
+        from YappySA.infra.db.replica import replica_engine
+        return replica_engine()
+    if source == "auto":
+        return read_engine()
+    return get_engine()
+
+
+# Errores al abrir la conexión: la réplica está caída o no se alcanza
+_CONNECT_ERRORS = (OperationalError, InterfaceError)
+
+
+def _connection_lost(exc: Exception) -> bool:
+    """
+    True si el error de una consulta ya abierta se debe a la conexión
+    (no a la consulta). pd.read_sql_query envuelve el error del driver en su
+    propio DatabaseError; el original queda en __cause__.
+    """
+    if isinstance(exc, pd.errors.DatabaseError):
+        exc = exc.__cause__
+    return isinstance(exc, DBAPIError) and exc.connection_invalidated
+
+
+def _run_read(source: str, work, cancel: Optional[CancelToken] = None):
+    """
+    Ejecuta work(conn) en el engine del origen. Si una réplica de lectura no
+    acepta la conexión o la pierde a mitad de la consulta, se marca como no
+    sana y se reintenta en la principal. Cualquier otro error (sintaxis,
+    restricciones, tiempo de espera, cancelación) se propaga tal cual: no
+    dice nada de la salud de la réplica y repetirlo en la principal solo
+    le sumaría carga.
+    """
+    eng = _engine_for(source)
+    failover = source == "auto" and eng is not get_engine()
+    try:
+        conn = eng.connect()
+    except _CONNECT_ERRORS:
+        if not failover:
+            raise
+    else:
+        try:
+            with conn, watch(conn, cancel):
+                return work(conn)
+        except (DBAPIError, pd.errors.DatabaseError) as e:
+            if not (failover and _connection_lost(e)):
+                raise
+    mark_unhealthy(eng)
+    with get_engine().connect() as conn, watch(conn, cancel):
+        return work(conn)
+
+
+def _read_frame(conn, sql: str, params: dict) -> pd.DataFrame:
+    """
+    Ejecuta y devuelve un DataFrame con el backend configurado:
+      - "pandas": pd.read_sql_query (columnas object)
+      - "arrow":  lectura columnar con tipos compactos (ver arrow_fetch.py)
+    """
+    if get_settings().FETCH_BACKEND.lower() == "arrow":
+        from YappySA.infra.db.arrow_fetch import read_frame
+        return read_frame(conn, text(sql), params)
+    return pd.read_sql_query(text(sql), conn, params=params)
+
+
+def _first_rows(dialect_name: str) -> str:
+    """
+    Cláusula "primeras :n filas" (va después del ORDER BY) según el motor.
+    SQL Server en producción; SQLite como base local de pruebas.
+    """
+    return get_dialect(dialect_name).first_rows
+
 
 # -------------------------------------------------
 # Últimos N clientes (pantalla "Ver últimas 100")
 # -------------------------------------------------
-def fetch_recent_clients(limit: int = 100) -> pd.DataFrame:
+def build_recent_query(
+    limit: int = 100, dialect_name: str = "mssql", source: str = "auto"
+) -> tuple[str, dict]:
     """
-    Devuelve los últimos N clientes usando el SELECT consolidado.
+    Devuelve (sql, params) de fetch_recent_clients sin ejecutarlo
+    (lo reutilizan las herramientas de diagnóstico).
     """
     limit = max(1, int(limit or 100))
 
-    sql = _BASE_SELECT + """
+    select, cols = _source(source)
+    sql = select + f"""
 WHERE 1 = 1
-ORDER BY c.created_at DESC
-OFFSET 0 ROWS FETCH NEXT :n ROWS ONLY;
+ORDER BY {cols['created_at']} DESC
+{_first_rows(dialect_name)}
 """
-    with engine.connect() as conn:
-        return pd.read_sql_query(text(sql), conn, params={"n": limit})
+    return sql, {"n": limit}
+
+
+def fetch_recent_clients(
+    limit: int = 100, cancel: Optional[CancelToken] = None, source: str = "auto"
+) -> pd.DataFrame:
+    """
+    Devuelve los últimos N clientes usando el SELECT consolidado.
+    Por defecto lee de una réplica de lectura si hay; source="local" lee de la réplica local.
+    """
+    def work(conn):
+        sql, params = build_recent_query(limit, conn.dialect.name, source)
+        return _read_frame(conn, sql, params)
+
+    return _run_read(source, work, cancel)
+
+
+# -------------------------------------------------
+# Filas concretas por client_id (refresco tras importar)
+# -------------------------------------------------
+_IDS_PER_QUERY = 1000  # SQL Server admite ~2100 parámetros por sentencia
+
+
+def _fetch_by_ids(conn, ids: List[str], source: str) -> pd.DataFrame:
+    select, cols = _source(source)
+    frames: List[pd.DataFrame] = []
+    for start in range(0, len(ids), _IDS_PER_QUERY):
+        chunk = ids[start:start + _IDS_PER_QUERY]
+        params = {f"id_{i}": cid for i, cid in enumerate(chunk)}
+        holders = ", ".join(f":{key}" for key in params)
+        sql = select + f"\nWHERE {cols['client_id']} IN ({holders})\n"
+        frames.append(_read_frame(conn, sql, params))
+
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return df.sort_values("created_at", ascending=False, kind="stable").reset_index(drop=True)
+
+
+def fetch_clients_by_ids(
+    client_ids: Sequence[str], cancel: Optional[CancelToken] = None, source: str = "primary"
+) -> pd.DataFrame:
+    """
+    Devuelve las filas consolidadas de los client_id indicados,
+    ordenadas como "Ver últimas 100" (más recientes primero).
+
+    Se usa para fusionar en la vista lo recién importado sin volver
+    a pedir los últimos N clientes; por eso lee de la principal
+    (una réplica podría no tener todavía esas filas).
+    """
+    ids = _normalize_list(list(client_ids or [])) or []
+    if not ids:
+        return pd.DataFrame()
+    return _run_read(source, lambda conn: _fetch_by_ids(conn, ids, source), cancel)
+
+
+# -------------------------------------------------
+# Búsqueda parcial (nombre, email, alias, teléfono)
+# -------------------------------------------------
+_SEARCH_WEIGHTS = {"display_name": 1.0, "alias": 0.9, "email": 0.8, "phone": 0.7}
+
+
+def _match_level(q: str, value: str) -> float:
+    """
+    Qué tan bien coincide la búsqueda normalizada con un valor normalizado:
+    3 = igual, 2.5 = prefijo del valor, 2 = prefijo de palabra, 1 = subcadena, 0 = nada.
+    Con varias palabras, todas deben aparecer y cuenta la peor.
+    """
+    if not q or not value:
+        return 0
+    if value == q:
+        return 3
+    if value.startswith(q):
+        return 2.5
+    level = 2.0
+    for word in q.split():
+        if f" {word}" in f" {value}":
+            continue
+        if word in value:
+            level = 1.0
+        else:
+            return 0
+    return level
+
+
+SEARCH_INDEX_EMPTY = (
+    "El índice de búsqueda (client_token) está vacío. "
+    "Constrúyelo con: python -m YappySA.tools.client_search tokens"
+)
+
+
+def search_clients(
+    q: str,
+    *,
+    kinds: Optional[Iterable[str]] = None,
+    since_date: Optional[datetime] = None,
+    fields: Optional[Iterable[str]] = None,
+    limit: Optional[int] = 50,
+    cancel: Optional[CancelToken] = None,
+) -> pd.DataFrame:
+    """
+    Búsqueda por texto parcial en display_name, email, alias y phone,
+    usando el índice de trigramas (client_token).
+
+    Devuelve las columnas de la vista consolidada más `score`,
+    ordenadas de mejor a peor coincidencia. Si la búsqueda tuvo más de
+    search_index.CANDIDATE_CAP candidatos solo se revisaron los mejores:
+    df.attrs["truncated"] queda en True (conviene afinar la búsqueda).
+
+    Si client_token está vacío lanza RuntimeError en lugar de devolver un
+    resultado vacío que parezca "sin coincidencias".
+    """
+    fields = [f for f in (fields or _SEARCH_WEIGHTS) if f in _SEARCH_WEIGHTS]
+    q_text = search_index.normalize(q)
+    q_digits = search_index.normalize(q, "phone")
+    if not q_text or not fields:
+        return pd.DataFrame()
+    kinds = [k for k in (kinds or []) if k]
+    truncated = False
+
+    def work(conn):
+        nonlocal truncated
+        # Candidatos y filas del mismo origen (una réplica puede ir atrasada)
+        cap = search_index.CANDIDATE_CAP
+        ids = search_index.candidate_ids(conn, q, fields=fields, cap=cap, kinds=kinds, since_date=since_date)
+        truncated = len(ids) >= cap
+        if not ids and search_index.is_empty(conn):
+            raise RuntimeError(SEARCH_INDEX_EMPTY)
+        return _fetch_by_ids(conn, ids, "auto") if ids else pd.DataFrame()
+
+    df = _run_read("auto", work, cancel)
+    df.attrs["truncated"] = truncated
+    if df.empty:
+        return df
+
+    # Verificación exacta sobre los candidatos + ranking por campo
+    score = pd.Series(0.0, index=df.index)
+    for field in fields:
+        needle = q_digits if field == "phone" else q_text
+        if not needle:
+            continue
+        norm = df[field].map(lambda v, f=field: search_index.normalize(v, f))
+        level = norm.map(lambda v, n=needle: _match_level(n, v))
+        score = score.where(score >= level * _SEARCH_WEIGHTS[field], level * _SEARCH_WEIGHTS[field])
+
+    df = df.assign(score=score.round(2))
+    df = df[df["score"] > 0].sort_values(["score", "created_at"], ascending=[False, False], kind="stable")
+    if limit:
+        df = df.head(int(limit))
+    df = df.reset_index(drop=True)
+    df.attrs["truncated"] = truncated
+    return df
 
 
 # -------------------------------------------------
 # Consulta filtrada (pantalla "Consultar / Exportar")
 # -------------------------------------------------
-def query_clients_filtered(
+def build_filtered_query(
     *,
     kinds: Iterable[str],
     since_date: Optional[datetime] = None,
@@ -92,32 +388,37 @@ def query_clients_filtered(
     national_id: Optional[Union[str, Sequence[str]]] = None,
     ruc: Optional[Union[str, Sequence[str]]] = None,
     limit: Optional[int] = 200,
-) -> pd.DataFrame:
+    dialect_name: str = "mssql",
+    source: str = "auto",
+) -> Optional[tuple[str, dict]]:
     """
-    Consulta filtrada para la pantalla 'Consultar / Exportar'.
-
-    Soporta:
-      - tipos de cliente (PERSONAL / COMMERCIAL)
-      - fecha desde
-      - uno o varios UUID
-      - una o varias cédulas (national_id)
-      - uno o varios RUC
+    Arma (sql, params) de query_clients_filtered sin ejecutarlo.
+    Devuelve None si no hay tipos de cliente seleccionados.
     """
 
     # Normalizar tipos de cliente
     kinds = [k for k in (kinds or []) if k]
     if not kinds:
         # La UI ya protege esto, pero por seguridad
-        return pd.DataFrame()
+        return None
 
     # Normalizar filtros a listas
     uuid_list = _normalize_list(uuid)
     nid_list = _normalize_list(national_id)
     ruc_list = _normalize_list(ruc)
 
+    select, cols = _source(source)
+    lookups = _BASE_LOOKUPS if cols is _BASE_COLUMNS else _SEARCH_LOOKUPS
     where: List[str] = ["1=1"]
     params: dict = {}
 
+    # Con filtro por clave (uuid, cédula, RUC) el plan debe ir por esa clave;
+    # tipo y fecha solo descartan filas
+    keyed = bool(uuid_list or nid_list or ruc_list)
+    dialect = get_dialect(dialect_name)
+    type_col = dialect.no_seek(cols["client_type"]) if keyed else cols["client_type"]
+    date_col = dialect.no_seek(cols["created_at"]) if keyed else cols["created_at"]
+
     # Tipos de cliente (IN)
     if kinds:
         holders = []
@@ -125,11 +426,11 @@ def query_clients_filtered(
             key = f"k{i}"
             holders.append(f":{key}")
             params[key] = k
-        where.append(f"c.client_type IN ({', '.join(holders)})")
+        where.append(f"{type_col} IN ({', '.join(holders)})")
 
     # Fecha desde
     if since_date is not None:
-        where.append("c.created_at >= :since")
+        where.append(f"{date_col} >= :since")
         params["since"] = since_date
 
     # UUID(s)
@@ -139,7 +440,7 @@ def query_clients_filtered(
             key = f"uuid_{i}"
             holders.append(f":{key}")
             params[key] = u
-        where.append(f"c.client_id IN ({', '.join(holders)})")
+        where.append(f"{cols['client_id']} IN ({', '.join(holders)})")
 
     # Cédula(s)
     if nid_list:
@@ -148,7 +449,7 @@ def query_clients_filtered(
             key = f"nid_{i}"
             holders.append(f":{key}")
             params[key] = n
-        where.append(f"p.national_id IN ({', '.join(holders)})")
+        where.append(lookups["national_id"].format(", ".join(holders)))
 
     # RUC(s)
     if ruc_list:
@@ -157,13 +458,63 @@ def query_clients_filtered(
             key = f"ruc_{i}"
             holders.append(f":{key}")
             params[key] = r_
-        where.append(f"m.ruc IN ({', '.join(holders)})")
+        where.append(lookups["ruc"].format(", ".join(holders)))
 
     # Construir SQL final
-    sql = _BASE_SELECT + f"\nWHERE {' AND '.join(where)}\nORDER BY c.created_at DESC\n"
+    sql = select + f"\nWHERE {' AND '.join(where)}\nORDER BY {cols['created_at']} DESC\n"
     if limit:
-        sql += "OFFSET 0 ROWS FETCH NEXT :n ROWS ONLY;"
+        sql += _first_rows(dialect_name)
         params["n"] = int(limit)
 
-    with engine.connect() as conn:
-        return pd.read_sql_query(text(sql), conn, params=params)
+    return sql, params
+
+
+@profiled("query")
+def query_clients_filtered(
+    *,
+    kinds: Iterable[str],
+    since_date: Optional[datetime] = None,
+    uuid: Optional[Union[str, Sequence[str]]] = None,
+    national_id: Optional[Union[str, Sequence[str]]] = None,
+    ruc: Optional[Union[str, Sequence[str]]] = None,
+    limit: Optional[int] = 200,
+    cancel: Optional[CancelToken] = None,
+    source: str = "auto",
+    spill_rows: Optional[int] = None,
+) -> pd.DataFrame | SpilledResult:
+    """
+    Consulta filtrada para la pantalla 'Consultar / Exportar'.
+
+    Soporta:
+      - tipos de cliente (PERSONAL / COMMERCIAL)
+      - fecha desde
+      - uno o varios UUID
+      - una o varias cédulas (national_id)
+      - uno o varios RUC
+
+    Por defecto lee de una réplica de lectura si hay (ver session.read_engine);
+    source="local" consulta la réplica local.
+
+    Con spill_rows, un resultado de más filas no se arma en memoria: vuelve
+    como SpilledResult (archivo Arrow mapeado; ver spill.py, requiere pyarrow).
+    """
+    def work(conn):
+        built = build_filtered_query(
+            kinds=kinds,
+            since_date=since_date,
+            uuid=uuid,
+            national_id=national_id,
+            ruc=ruc,
+            limit=limit,
+            dialect_name=conn.dialect.name,
+            source=source,
+        )
+        if built is None:
+            return pd.DataFrame()
+        sql, params = built
+        if spill_rows is not None:
+            from YappySA.infra.db.spill import read_or_spill
+            return read_or_spill(conn, text(sql), params, spill_rows=spill_rows, cancel=cancel)
+        return _read_frame(conn, sql, params)
+
+    return _run_read(source, work, cancel)
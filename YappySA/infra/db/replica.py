@@ -0,0 +1,194 @@
+# YappySA/infra/db/replica.py
+"""
+Réplica local (SQLite) de la vista consolidada para consultas y exportaciones
+de solo lectura sin cargar el SQL Server principal.
+
+- La réplica guarda una tabla client_search (misma forma que la desnormalizada
+  del servidor), así queries.py la consulta con _SEARCH_SELECT.
+- refresh() trae solo lo nuevo usando created_at como marca de agua. Relee
+  desde marca - WATERMARK_OVERLAP para no perder filas que se confirmaron
+  tarde con un created_at anterior; INSERT OR REPLACE evita duplicados.
+- Los borrados en la base principal no se ven por la marca de agua: cada
+  RECONCILE_EVERY refresh() compara los client_id con la principal y elimina
+  de la réplica los que ya no existen (o forzarlo con reconcile=True).
+- refresh(full=True) la reconstruye completa.
+
+Archivo: settings.LOCAL_REPLICA_PATH o outputs/replica.sqlite.
+CLI: python -m YappySA.tools.replica refresh|status
+"""
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+
+from YappySA.core.settings import get_settings
+from YappySA.infra.db import client_search
+
+_REPLICA_ENGINE = None
+
+WATERMARK_OVERLAP = timedelta(minutes=10)
+RECONCILE_EVERY = timedelta(hours=24)
+
+_META_DDL = "CREATE TABLE IF NOT EXISTS replica_meta (key TEXT PRIMARY KEY, value TEXT)"
+_COLS = client_search.SEARCH_COLUMNS
+_INSERT_SQL = (
+    f"INSERT OR REPLACE INTO client_search ({', '.join(_COLS)}) "
+    f"VALUES ({', '.join(':' + c for c in _COLS)})"
+)
+
+
+def replica_path() -> Path:
+    path = get_settings().LOCAL_REPLICA_PATH
+    if path:
+        return Path(path)
+    return Path(__file__).resolve().parents[3] / "outputs" / "replica.sqlite"
+
+
+def replica_available() -> bool:
+    """True si ya existe un archivo de réplica (aunque esté desactualizado)."""
+    return replica_path().is_file()
+
+
+def replica_engine():
+    """Engine SQLite de la réplica (se crea una vez)."""
+    global _REPLICA_ENGINE
+    if _REPLICA_ENGINE is None:
+        from YappySA.infra.db.session import make_engine
+        path = replica_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _REPLICA_ENGINE = make_engine(f"sqlite:///{path}")
+    return _REPLICA_ENGINE
+
+
+def _get_meta(conn, key: str):
+    return conn.execute(text("SELECT value FROM replica_meta WHERE key = :k"), {"k": key}).scalar()
+
+
+def _set_meta(conn, key: str, value) -> None:
+    conn.execute(
+        text("INSERT OR REPLACE INTO replica_meta (key, value) VALUES (:k, :v)"),
+        {"k": key, "v": None if value is None else str(value)},
+    )
+
+
+def _to_sqlite(value):
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _reconcile_due(last) -> bool:
+    if not last:
+        return True
+    return datetime.now() - datetime.fromisoformat(last) >= RECONCILE_EVERY
+
+
+def _reconcile_deletes(source_engine, dst, batch_rows: int) -> int:
+    """Elimina de la réplica los clientes que ya no existen en la principal."""
+    with dst.begin() as d:
+        d.execute(text("CREATE TEMP TABLE IF NOT EXISTS source_ids (client_id TEXT PRIMARY KEY)"))
+        d.execute(text("DELETE FROM source_ids"))
+        with source_engine.connect() as src:
+            result = src.execution_options(stream_results=True).execute(
+                text("SELECT client_id FROM client"))
+            while True:
+                rows = result.fetchmany(batch_rows)
+                if not rows:
+                    break
+                d.execute(text("INSERT OR IGNORE INTO source_ids (client_id) VALUES (:id)"),
+                          [{"id": _to_sqlite(r[0])} for r in rows])
+        deleted = d.execute(text(
+            "DELETE FROM client_search WHERE client_id NOT IN (SELECT client_id FROM source_ids)"
+        )).rowcount
+        d.execute(text("DROP TABLE source_ids"))
+        _set_meta(d, "reconciled_at", datetime.now().isoformat(sep=" ", timespec="seconds"))
+    return max(deleted or 0, 0)
+
+
+def refresh(full: bool = False, batch_rows: int = 20000, source_engine=None,
+            reconcile: bool | None = None) -> dict:
+    """
+    Copia a la réplica las filas con created_at >= marca de agua - WATERMARK_OVERLAP.
+
+    reconcile: None = eliminar los borrados si pasó RECONCILE_EVERY desde la
+    última comparación; True/False para forzarlo u omitirlo.
+    Devuelve {rows, deleted, total, watermark, seconds}.
+    """
+    from YappySA.infra.db.queries import _BASE_SELECT  # evita import circular
+
+    if source_engine is None:
+        from YappySA.infra.db.session import get_engine
+        source_engine = get_engine()
+
+    t0 = time.perf_counter()
+    dst = replica_engine()
+    with dst.begin() as d:
+        client_search.create_table(d)
+        d.execute(text(_META_DDL))
+        if full:
+            d.execute(text("DELETE FROM client_search"))
+            _set_meta(d, "watermark", None)
+        watermark = _get_meta(d, "watermark")
+        reconciled_at = _get_meta(d, "reconciled_at")
+
+    sql = _BASE_SELECT
+    params = {}
+    if watermark:
+        sql += "\nWHERE c.created_at >= :wm"
+        params["wm"] = datetime.fromisoformat(watermark) - WATERMARK_OVERLAP
+    sql += "\nORDER BY c.created_at"
+
+    copied = 0
+    with source_engine.connect() as src:
+        result = src.execution_options(stream_results=True).execute(text(sql), params)
+        while True:
+            rows = result.fetchmany(batch_rows)
+            if not rows:
+                break
+            payload = [{c: _to_sqlite(v) for c, v in zip(_COLS, row)} for row in rows]
+            with dst.begin() as d:
+                d.execute(text(_INSERT_SQL), payload)
+                if payload[-1]["created_at"] is not None:
+                    watermark = payload[-1]["created_at"]
+                    _set_meta(d, "watermark", watermark)
+            copied += len(rows)
+
+    deleted = 0
+    if full:
+        with dst.begin() as d:
+            _set_meta(d, "reconciled_at", datetime.now().isoformat(sep=" ", timespec="seconds"))
+    elif reconcile or (reconcile is None and _reconcile_due(reconciled_at)):
+        deleted = _reconcile_deletes(source_engine, dst, batch_rows)
+
+    with dst.begin() as d:
+        _set_meta(d, "refreshed_at", datetime.now().isoformat(sep=" ", timespec="seconds"))
+        total = int(d.execute(text("SELECT COUNT(*) FROM client_search")).scalar_one())
+
+    return {
+        "rows": copied,
+        "deleted": deleted,
+        "total": total,
+        "watermark": watermark,
+        "seconds": round(time.perf_counter() - t0, 2),
+    }
+
+
+def status() -> dict:
+    """Estado de la réplica: ruta, filas, marca de agua y última actualización."""
+    info = {"path": str(replica_path()), "exists": replica_available()}
+    if not info["exists"]:
+        return info
+    with replica_engine().begin() as d:
+        d.execute(text(_META_DDL))
+        client_search.create_table(d)
+        info["rows"] = int(d.execute(text("SELECT COUNT(*) FROM client_search")).scalar_one())
+        info["watermark"] = _get_meta(d, "watermark")
+        info["refreshed_at"] = _get_meta(d, "refreshed_at")
+        info["reconciled_at"] = _get_meta(d, "reconciled_at")
+    return info
@@ -1,7 +1,9 @@
 # YappySA/infra/db/repository.py
 from sqlalchemy import text
 from sqlalchemy.exc import IntegrityError
-from YappySA.infra.db.session import SessionLocal  # ← de session.py
+from YappySA.infra.db import client_search, search_index
+from YappySA.infra.db.dialects import dialect_of
+from YappySA.core.settings import get_settings
 import math
 
 
@@ -29,13 +31,8 @@ def _clean_field(val):
 
 def upsert_client_and_contacts(session, dto, kind: str):
     try:
-        # Inserta en client y obtiene el UUID generado
-        res = session.execute(text("""
-            INSERT INTO client (client_id, client_type)
-            OUTPUT inserted.client_id
-            VALUES (NEWID(), :kind)
-        """), {"kind": kind})
-        client_id = res.scalar_one()
+        # Inserta en client y obtiene el UUID generado (NEWID() en SQL Server)
+        client_id = dialect_of(session).insert_client(session, kind)
 
         # Datos personales vs comerciales (sin cambios en la lógica original)
         if kind == "PERSONAL":
@@ -70,6 +67,19 @@ def upsert_client_and_contacts(session, dto, kind: str):
                 "alias": dto.alias or "",
             })
 
+        # Tabla desnormalizada para lecturas (opcional)
+        if get_settings().CLIENT_SEARCH_ENABLED:
+            client_search.sync_client(session, client_id)
+
+        # Índice de trigramas para búsqueda parcial (opcional)
+        if get_settings().SEARCH_INDEX_ENABLED:
+            search_index.index_client(session, client_id, {
+                "display_name": dto.name if kind == "PERSONAL" else dto.company_name,
+                "email": dto.email,
+                "alias": dto.alias,
+                "phone": dto.phone,
+            })
+
         return client_id
 
     except IntegrityError as e:
@@ -0,0 +1,257 @@
+# YappySA/infra/db/search_index.py
+"""
+Índice de trigramas para buscar clientes por texto parcial
+(display_name, email, alias, phone) sin hacer LIKE '%x%' sobre todo.
+
+Tabla client_token(token, client_id, field): un trigrama por fila, al estilo
+pg_trgm: cada palabra se rellena como "  palabra " para que los prefijos
+también tengan trigramas propios.
+
+- index_client():  lo llama el repositorio al insertar (misma transacción).
+- rebuild():       recalcula el índice completo.
+- is_empty():      para avisar si nunca se construyó.
+- candidate_ids(): client_id que contienen todos los trigramas de la consulta.
+
+La verificación final y el ranking los hace queries.search_clients.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import text
+
+# Campos indexados (código guardado en client_token.field)
+FIELDS = {"display_name": 1, "email": 2, "alias": 3, "phone": 4}
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_NON_DIGIT = re.compile(r"\D+")
+_INSERT_BATCH = 5000
+CANDIDATE_CAP = 5000  # candidatos que se verifican como máximo por búsqueda
+
+CREATE_TABLE_SQL = """
+IF OBJECT_ID('dbo.client_token', 'U') IS NULL
+BEGIN
+    CREATE TABLE dbo.client_token (
+        token      NVARCHAR(3)      NOT NULL,
+        client_id  UNIQUEIDENTIFIER NOT NULL,
+        field      TINYINT          NOT NULL,
+        CONSTRAINT pk_client_token PRIMARY KEY CLUSTERED (token, client_id, field)
+    );
+    CREATE INDEX ix_client_token_client ON dbo.client_token (client_id);
+END
+"""
+
+_CREATE_TABLE_SQLITE = [
+    """
+    CREATE TABLE IF NOT EXISTS client_token (
+        token      TEXT    NOT NULL,
+        client_id  TEXT    NOT NULL,
+        field      INTEGER NOT NULL,
+        PRIMARY KEY (token, client_id, field)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_client_token_client ON client_token (client_id)",
+]
+
+
+def create_table(conn) -> None:
+    """Crea client_token si no existe."""
+    if conn.dialect.name == "mssql":
+        conn.execute(text(CREATE_TABLE_SQL))
+        return
+    for stmt in _CREATE_TABLE_SQLITE:
+        conn.execute(text(stmt))
+
+
+# -------------------------------------------------
+# Normalización y trigramas
+# -------------------------------------------------
+def normalize(value, field: str | None = None) -> str:
+    """
+    Minúsculas, sin tildes, separadores colapsados a un espacio.
+    Los teléfonos se reducen a sus dígitos.
+    """
+    if value is None:
+        return ""
+    s = str(value).strip().lower()
+    if not s or s == "nan":
+        return ""
+    if field == "phone":
+        return _NON_DIGIT.sub("", s)
+    s = "".join(c for c in unicodedata.normalize("NFKD", s) if not unicodedata.combining(c))
+    return _NON_ALNUM.sub(" ", s).strip()
+
+
+def trigrams(value, field: str | None = None) -> Set[str]:
+    """Trigramas de un valor (con relleno de prefijo y fin de palabra)."""
+    out: Set[str] = set()
+    for word in normalize(value, field).split():
+        padded = f"  {word} "
+        out.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return out
+
+
+def query_trigrams(q: str) -> Tuple[Set[str], Set[str]]:
+    """
+    Trigramas de una búsqueda: (obligatorios, de prefijo).
+
+    - Palabras de 3+ letras: sus trigramas internos son obligatorios
+      (subcadena en cualquier posición); los de prefijo solo suben el ranking.
+    - Palabras de 1-2 letras: solo se buscan como prefijo de palabra.
+    """
+    required: Set[str] = set()
+    prefix: Set[str] = set()
+    for word in normalize(q).split():
+        starts = {f"  {word}"[:3]}
+        if len(word) >= 2:
+            starts.add(f" {word}"[:3])
+        if len(word) >= 3:
+            required.update(word[i:i + 3] for i in range(len(word) - 2))
+            prefix.update(starts)
+        else:
+            required.update(starts)
+    return required, prefix
+
+
+# -------------------------------------------------
+# Mantenimiento
+# -------------------------------------------------
+def _rows_for(client_id, values: Dict[str, Optional[str]]) -> List[dict]:
+    rows = []
+    for field, code in FIELDS.items():
+        for tok in trigrams(values.get(field), field):
+            rows.append({"tok": tok, "cid": client_id, "f": code})
+    return rows
+
+
+_INSERT_SQL = "INSERT INTO client_token (token, client_id, field) VALUES (:tok, :cid, :f)"
+
+
+def index_client(session, client_id, values: Dict[str, Optional[str]]) -> None:
+    """
+    (Re)indexa un cliente. values: display_name, email, alias, phone.
+    """
+    session.execute(text("DELETE FROM client_token WHERE client_id = :cid"), {"cid": client_id})
+    rows = _rows_for(client_id, values)
+    if rows:
+        session.execute(text(_INSERT_SQL), rows)
+
+
+def rebuild(conn, page_size: int = 10000) -> int:
+    """
+    Vacía y recalcula client_token desde la vista consolidada.
+    Lee por páginas (keyset sobre client_id) para no dejar un cursor abierto
+    mientras se insertan los trigramas en la misma conexión.
+    Devuelve el número de clientes indexados.
+    """
+    from YappySA.infra.db.queries import _BASE_SELECT, _first_rows  # evita import circular
+
+    conn.execute(text("DELETE FROM client_token"))
+    # Dos consultas: con "(:last IS NULL OR ...)" el motor no busca por la PK
+    # y ordena todo el join en cada página
+    tail = "ORDER BY c.client_id\n" + _first_rows(conn.dialect.name)
+    first_sql = text(_BASE_SELECT + "\n" + tail)
+    next_sql = text(_BASE_SELECT + "\nWHERE c.client_id > :last\n" + tail)
+    n = 0
+    last = None
+    while True:
+        if last is None:
+            rows = conn.execute(first_sql, {"n": page_size}).mappings().all()
+        else:
+            rows = conn.execute(next_sql, {"last": last, "n": page_size}).mappings().all()
+        if not rows:
+            break
+        pending: List[dict] = []
+        for row in rows:
+            pending.extend(_rows_for(row["client_id"], row))
+        for start in range(0, len(pending), _INSERT_BATCH):
+            conn.execute(text(_INSERT_SQL), pending[start:start + _INSERT_BATCH])
+        n += len(rows)
+        last = rows[-1]["client_id"]
+    return n
+
+
+def is_empty(conn) -> bool:
+    """True si client_token no tiene filas (índice nunca construido)."""
+    sql = "SELECT CASE WHEN EXISTS (SELECT 1 FROM client_token) THEN 0 ELSE 1 END"
+    return bool(conn.execute(text(sql)).scalar())
+
+
+# -------------------------------------------------
+# Búsqueda de candidatos
+# -------------------------------------------------
+def _in_clause(prefix: str, values: Sequence, params: dict) -> str:
+    holders = []
+    for i, v in enumerate(values):
+        key = f"{prefix}{i}"
+        holders.append(f":{key}")
+        params[key] = v
+    return ", ".join(holders)
+
+
+def candidate_ids(
+    conn,
+    q: str,
+    fields: Optional[Iterable[str]] = None,
+    cap: int = CANDIDATE_CAP,
+    max_tokens: int = 4,
+    kinds: Optional[Sequence[str]] = None,
+    since_date=None,
+) -> List[str]:
+    """
+    client_id que contienen los trigramas obligatorios de la búsqueda,
+    ordenados por cantidad de trigramas coincidentes (incluye prefijos).
+
+    Para no recorrer listas enormes ("com", "gma"...) solo se intersectan
+    los `max_tokens` trigramas obligatorios menos frecuentes; la
+    verificación exacta se hace después sobre los candidatos.
+    kinds / since_date se filtran aquí (join con client), antes del tope
+    `cap`: si no, el tope podría quedarse con clientes que después se
+    descartan. Devolver `cap` candidatos indica que pudo haber más.
+    """
+    from YappySA.infra.db.queries import _first_rows  # evita import circular
+
+    required, prefix = query_trigrams(q)
+    if not required:
+        return []
+
+    codes = [FIELDS[f] for f in (fields or FIELDS) if f in FIELDS]
+    params: dict = {}
+    field_sql = f" AND field IN ({_in_clause('f', codes, params)})" if len(codes) < len(FIELDS) else ""
+
+    # Frecuencia de cada trigrama obligatorio
+    freq_params = dict(params)
+    freq_sql = (
+        f"SELECT token, COUNT(*) FROM client_token "
+        f"WHERE token IN ({_in_clause('t', sorted(required), freq_params)}){field_sql} GROUP BY token"
+    )
+    freq = {tok: int(cnt) for tok, cnt in conn.execute(text(freq_sql), freq_params)}
+    if len(freq) < len(required):
+        return []  # algún trigrama no existe: no hay coincidencias
+
+    rarest = sorted(required, key=lambda t: freq[t])[:max_tokens]
+    rank_tokens = sorted(set(rarest) | prefix)
+
+    params["need"] = len(rarest)
+    rare_in = _in_clause("r", rarest, params)
+    all_in = _in_clause("a", rank_tokens, params)
+    params["n"] = int(cap)
+    client_sql = ""
+    if kinds:
+        client_sql += f" AND c.client_type IN ({_in_clause('k', list(kinds), params)})"
+    if since_date is not None:
+        client_sql += " AND c.created_at >= :since"
+        params["since"] = since_date
+    join_sql = "JOIN client c ON c.client_id = client_token.client_id" if client_sql else ""
+    sql = f"""
+        SELECT client_token.client_id
+        FROM client_token {join_sql}
+        WHERE token IN ({all_in}){field_sql}{client_sql}
+        GROUP BY client_token.client_id
+        HAVING COUNT(DISTINCT CASE WHEN token IN ({rare_in}) THEN token END) >= :need
+        ORDER BY COUNT(DISTINCT token) DESC
+        {_first_rows(conn.dialect.name)}
+    """
+    return [str(r[0]) for r in conn.execute(text(sql), params)]
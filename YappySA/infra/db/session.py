@@ -1,7 +1,200 @@
 # YappySA/infra/db/session.py
-from sqlalchemy import create_engine
+"""
+Engines y sesiones, creados la primera vez que se usan (no al importar).
+
+- get_engine() / get_sessionmaker(): base principal; todas las escrituras
+  (importación) van aquí.
+- read_engine(): réplica de lectura sana o la principal.
+- use_engine(): apunta todo a otra base (pruebas, herramientas).
+- warm_up(): abre la primera conexión en segundo plano.
+
+`engine` y `SessionLocal` siguen disponibles como atributos del módulo.
+"""
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker
-from YappySA.core.settings import settings
+from sqlalchemy.pool import QueuePool
+from YappySA.core.settings import get_settings
+
+log = logging.getLogger("yappysa.db")
+
+
+def make_engine(url: str, **kwargs):
+    """
+    create_engine con las opciones del proyecto.
+    fast_executemany solo existe en mssql+pyodbc (p. ej. SQLite lo rechaza).
+    El tamaño del pool sale de settings solo para el servidor; SQLite usa
+    el pool por defecto de SQLAlchemy.
+    Con SQL_TRACE_ENABLED se registran los hooks de instrumentation.py.
+    """
+    kwargs.setdefault("pool_pre_ping", True)  # descarta conexiones cortadas por el servidor o la red
+    if url.startswith("mssql"):
+        s = get_settings()
+        kwargs.setdefault("pool_size", s.DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", s.DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", s.DB_POOL_TIMEOUT)
+        kwargs.setdefault("pool_recycle", s.DB_POOL_RECYCLE)
+    if url.startswith("mssql+pyodbc"):
+        kwargs.setdefault("fast_executemany", True)
+    if not get_settings().SQL_TRACE_ENABLED:
+        return create_engine(url, future=True, **kwargs)
+
+    from YappySA.infra.db import instrumentation
+    parsed = make_url(url)
+    if parsed.get_dialect().get_pool_class(parsed) is QueuePool:
+        kwargs.setdefault("poolclass", instrumentation.TimedQueuePool)
+    engine = create_engine(parsed, future=True, **kwargs)
+    instrumentation.instrument(engine)
+    return engine
+
+
+_ENGINE = None
+_SESSIONMAKER = None
+_LOCK = threading.Lock()
+
+
+def get_engine():
+    """Engine de la base principal (settings.sqlalchemy_url), creado una sola vez."""
+    global _ENGINE
+    if _ENGINE is None:
+        with _LOCK:
+            if _ENGINE is None:
+                _ENGINE = make_engine(get_settings().sqlalchemy_url)
+    return _ENGINE
+
+
+def get_sessionmaker():
+    """sessionmaker ligado a la base principal."""
+    global _SESSIONMAKER
+    if _SESSIONMAKER is None:
+        eng = get_engine()
+        with _LOCK:
+            if _SESSIONMAKER is None:
+                _SESSIONMAKER = sessionmaker(bind=eng, autoflush=False, autocommit=False, future=True)
+    return _SESSIONMAKER
+
+
+def use_engine(engine_or_url=None, replica_urls=None) -> None:
+    """
+    Reemplaza la base principal (Engine o URL) y, opcionalmente, las réplicas
+    de lectura. Sin argumentos vuelve a la configuración de settings.
+    Pensado para pruebas, p. ej. dos archivos SQLite como principal y réplica.
+    """
+    global _ENGINE, _SESSIONMAKER, _REPLICAS
+    with _LOCK:
+        if _ENGINE is not None and _ENGINE is not engine_or_url:
+            _ENGINE.dispose()
+        if isinstance(engine_or_url, str):
+            engine_or_url = make_engine(engine_or_url)
+        _ENGINE = engine_or_url
+        _SESSIONMAKER = None
+        if engine_or_url is None and replica_urls is None:
+            _REPLICAS = None  # se vuelven a leer de settings
+        else:
+            _REPLICAS = [_Replica(u) for u in replica_urls or []]
+
+
+def warm_up() -> threading.Thread:
+    """
+    Abre en segundo plano la primera conexión (carga el driver, autentica y
+    revisa las réplicas) para que la primera consulta no pague ese costo.
+    """
+    def run():
+        try:
+            with get_engine().connect() as conn:
+                conn.execute(text("SELECT 1"))
+            read_engine()
+        except Exception as e:
+            log.warning("No se pudo precalentar la conexión: %s", e)
+
+    t = threading.Thread(target=run, name="db-warm-up", daemon=True)
+    t.start()
+    return t
+
+
+def __getattr__(name: str):
+    # Compatibilidad: `from YappySA.infra.db.session import engine, SessionLocal`
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# -------------------------------------------------
+# Réplicas de lectura (settings.READ_REPLICA_URLS)
+# -------------------------------------------------
+class _Replica:
+    def __init__(self, url: str):
+        self.engine = make_engine(url)
+        self.healthy = True
+        self.checked_at = float("-inf")  # fuerza la primera revisión
+
+
+_REPLICAS: list | None = None
+_REPLICAS_LOCK = threading.Lock()
+_NEXT = itertools.count()
+
+
+def _replicas() -> list:
+    global _REPLICAS
+    if _REPLICAS is None:
+        with _REPLICAS_LOCK:
+            if _REPLICAS is None:
+                _REPLICAS = [_Replica(u) for u in get_settings().read_replica_urls]
+    return _REPLICAS
+
+
+def _is_healthy(rep: _Replica) -> bool:
+    """SELECT 1 contra la réplica; el resultado se reutiliza READ_REPLICA_CHECK_SECONDS."""
+    now = time.monotonic()
+    if now - rep.checked_at < get_settings().READ_REPLICA_CHECK_SECONDS:
+        return rep.healthy
+    try:
+        with rep.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        rep.healthy = True
+    except DBAPIError:
+        rep.healthy = False
+    rep.checked_at = now
+    return rep.healthy
+
+
+def read_engine():
+    """
+    Engine para consultas de solo lectura: una réplica sana (en rueda)
+    o la base principal si no hay réplicas configuradas o ninguna responde.
+    """
+    reps = _replicas()
+    start = next(_NEXT)
+    for i in range(len(reps)):
+        rep = reps[(start + i) % len(reps)]
+        if _is_healthy(rep):
+            return rep.engine
+    return get_engine()
+
+
+def mark_unhealthy(eng) -> None:
+    """Saca de la rueda la réplica de `eng` hasta la próxima revisión."""
+    for rep in _replicas():
+        if rep.engine is eng:
+            rep.healthy = False
+            rep.checked_at = time.monotonic()
+
 
-engine = create_engine(settings.sqlalchemy_url, fast_executemany=True, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+def read_routing_status() -> list[dict]:
+    """Estado de cada réplica (URL sin contraseña, sana, segundos desde la revisión)."""
+    now = time.monotonic()
+    return [
+        {
+            "url": rep.engine.url.render_as_string(hide_password=True),
+            "healthy": rep.healthy,
+            "checked_ago": None if rep.checked_at == float("-inf") else round(now - rep.checked_at, 1),
+        }
+        for rep in _replicas()
+    ]
@@ -0,0 +1,142 @@
+# YappySA/infra/db/spill.py
+"""
+Resultados grandes a disco (Arrow IPC, mapeado en memoria).
+
+read_or_spill() lee el cursor por lotes (arrow_fetch.iter_batches). Si el
+resultado cabe en `spill_rows` filas devuelve un DataFrame como siempre;
+si no, escribe los lotes en un archivo .arrow temporal a medida que
+llegan y devuelve un SpilledResult. El archivo se abre con memory_map:
+las columnas no se copian a la RAM del proceso, el sistema carga las
+páginas que se leen (la vista solo pide las filas visibles).
+
+La vista (ui/desktop_pyside/arrow_model.py) y las exportaciones
+(exporter.export_frames: CSV, Excel, Parquet, Feather, JSON Lines) leen
+del mismo archivo, sin repetir la consulta.
+
+Requiere pyarrow.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+import pyarrow as pa
+
+from YappySA.infra.db.arrow_fetch import DEFAULT_BATCH_ROWS, empty_table, iter_batches, to_compact_pandas
+
+SPILL_PREFIX = "yappysa_"
+SPILL_SUFFIX = ".arrow"
+
+
+class SpilledResult:
+    """Resultado de una consulta guardado en un archivo Arrow IPC y mapeado en memoria."""
+
+    def __init__(self, path: str | Path, delete_on_close: bool = True):
+        self.path = Path(path)
+        self.delete_on_close = delete_on_close
+        self._lock = threading.Lock()
+        self._mmap = pa.memory_map(str(self.path), "r")
+        # read_all sobre un memory_map sin compresión no copia los buffers
+        self.table: pa.Table | None = pa.ipc.open_file(self._mmap).read_all()
+
+    @property
+    def num_rows(self) -> int:
+        return self.table.num_rows
+
+    def __len__(self) -> int:
+        return self.num_rows
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.table.column_names)
+
+    def frame(self, start: int, stop: int, indices=None) -> pd.DataFrame:
+        """
+        Filas [start, stop) como DataFrame. Con `indices` (permutación de filas,
+        p. ej. un orden) son las filas indices[start:stop].
+        """
+        if indices is None:
+            part = self.table.slice(start, max(0, stop - start))
+        else:
+            part = self.table.take(pa.array(indices[start:stop]))
+        return to_compact_pandas(part)
+
+    def iter_frames(self, batch_rows: int = DEFAULT_BATCH_ROWS) -> Iterator[pd.DataFrame]:
+        """Todo el resultado en DataFrames de a `batch_rows` filas (para exportar)."""
+        for batch in self.table.to_batches(max_chunksize=batch_rows):
+            yield to_compact_pandas(pa.Table.from_batches([batch]))
+
+    def close(self) -> None:
+        """
+        Libera el mapeo y borra el archivo. Se puede llamar más de una vez.
+        Los DataFrames ya entregados siguen siendo válidos (Arrow mantiene
+        el mapeo mientras haya buffers vivos), pero en Windows el archivo
+        no se puede borrar hasta que se suelten.
+        """
+        with self._lock:
+            if self._mmap is None:
+                return
+            self.table = None
+            self._mmap.close()
+            self._mmap = None
+        if self.delete_on_close:
+            try:
+                self.path.unlink()
+            except OSError:
+                pass
+
+    def __repr__(self) -> str:
+        rows = "cerrado" if self.table is None else f"{self.num_rows} filas"
+        return f"SpilledResult({str(self.path)!r}, {rows})"
+
+
+def read_or_spill(
+    conn,
+    statement,
+    params: Optional[dict] = None,
+    *,
+    spill_rows: int,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    cancel=None,
+    directory: str | Path | None = None,
+) -> pd.DataFrame | SpilledResult:
+    """
+    Ejecuta `statement`. Hasta `spill_rows` filas devuelve un DataFrame; con más,
+    un SpilledResult en un archivo temporal de `directory` (por defecto, el
+    temporal del sistema).
+    """
+    result = conn.execute(statement, params or {})
+    names = list(result.keys())
+    batches = iter_batches(result, batch_rows, dictionary=False)
+
+    head, rows = [], 0
+    for batch in batches:
+        head.append(batch)
+        rows += batch.num_rows
+        if cancel is not None:
+            cancel.raise_if_cancelled()
+        if rows > spill_rows:
+            break
+    else:
+        table = pa.Table.from_batches(head) if head else empty_table(names, dictionary=False)
+        return to_compact_pandas(table)
+
+    fd, path = tempfile.mkstemp(prefix=SPILL_PREFIX, suffix=SPILL_SUFFIX, dir=directory)
+    os.close(fd)
+    try:
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, head[0].schema) as writer:
+            for batch in head:
+                writer.write_batch(batch)
+            head.clear()
+            for batch in batches:
+                writer.write_batch(batch)
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+    except BaseException:
+        Path(path).unlink(missing_ok=True)
+        raise
+    return SpilledResult(path)
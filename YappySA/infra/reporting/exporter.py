@@ -2,15 +2,159 @@ from __future__ import annotations
 from pathlib import Path
 import pandas as pd
 from datetime import datetime
+from typing import Iterable, Iterator
 
+from YappySA.core.profiling import profiled
+from YappySA.infra.reporting.xlsx_writer import write_xlsx
+
+XLSX_SHEET = "Sheet1"  # nombre de la hoja (y de las que siguen: "Sheet1 (2)", ...)
+
+# formato -> (nombre en la interfaz, extensión)
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv"),
+    "xlsx": ("Excel", ".xlsx"),
+    "parquet": ("Parquet (zstd)", ".parquet"),
+    "feather": ("Feather (Arrow)", ".feather"),
+    "jsonl": ("JSON Lines", ".jsonl"),
+    "jsonl.gz": ("JSON Lines (gzip)", ".jsonl.gz"),
+    "jsonl.zst": ("JSON Lines (zstd)", ".jsonl.zst"),
+}
+
+PARQUET_COMPRESSION = "zstd"
+PARQUET_ROW_GROUP_ROWS = 128 * 1024  # filas por row group (lecturas por partes en Spark/DuckDB)
+FEATHER_COMPRESSION = "zstd"
+_JSONL_COMPRESSION = {"jsonl": None, "jsonl.gz": "gzip", "jsonl.zst": "zstd"}
+
+@profiled("export")
 def export_dataframe(df: pd.DataFrame, path: str, fmt: str = "csv"):
     Path(path).parent.mkdir(parents=True, exist_ok=True)
-    if fmt.lower() == "csv":
+    fmt = fmt.lower()
+    if fmt == "csv":
         df.to_csv(path, index=False, encoding="utf-8-sig")
+    elif fmt in ("xlsx", "excel"):
+        write_xlsx(path, {XLSX_SHEET: df})
+    elif fmt in ("parquet", "feather") or fmt in _JSONL_COMPRESSION:
+        _export_columnar([df], path, fmt)
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+@profiled("export")
+def export_frames(frames: Iterable[pd.DataFrame], path: str, fmt: str = "csv") -> int:
+    """
+    Exporta un resultado por partes (p. ej. SpilledResult.iter_frames()) sin
+    juntarlo en memoria. Mismo formato que export_dataframe. Devuelve las filas.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    rows = 0
+    if fmt.lower() == "csv":
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            for i, df in enumerate(frames):
+                df.to_csv(f, index=False, header=(i == 0))
+                rows += len(df)
     elif fmt.lower() in ("xlsx", "excel"):
-        df.to_excel(path, index=False)
+        rows = write_xlsx(path, {XLSX_SHEET: frames})  # pasado el límite de filas sigue en otra hoja
+    elif fmt.lower() in ("parquet", "feather") or fmt.lower() in _JSONL_COMPRESSION:
+        rows = _export_columnar(frames, path, fmt.lower())
     else:
         raise ValueError(f"Formato no soportado: {fmt}")
+    return rows
+
+# ---------- Parquet / Feather / JSON Lines ----------
+def _export_columnar(frames: Iterable[pd.DataFrame], path: str, fmt: str) -> int:
+    if fmt == "parquet":
+        return _write_parquet(frames, path)
+    if fmt == "feather":
+        return _write_feather(frames, path)
+    return _write_jsonl(frames, path, _JSONL_COMPRESSION[fmt])
+
+def _arrow_tables(frames: Iterable[pd.DataFrame]) -> Iterator["pa.Table"]:
+    """
+    Cada parte como tabla Arrow, todas con el esquema de la primera. Las
+    categorías van como sus valores: cada parte trae su propio diccionario
+    y un archivo Feather admite uno solo por columna. Una columna sin
+    valores en la primera parte (tipo null) queda como texto.
+    """
+    import pyarrow as pa
+
+    def plain(t: pa.DataType) -> pa.DataType:
+        if pa.types.is_dictionary(t):
+            return t.value_type
+        if pa.types.is_null(t):
+            return pa.large_string()
+        return t
+
+    schema = None
+    for df in frames:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if schema is None:
+            fields = [f.with_type(plain(f.type)) for f in table.schema]
+            schema = pa.schema(fields, metadata=table.schema.metadata)
+        yield table.cast(schema)
+
+def _write_parquet(frames: Iterable[pd.DataFrame], path: str) -> int:
+    """Row groups de PARQUET_ROW_GROUP_ROWS filas aunque las partes lleguen más chicas."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer, pending, buffered, rows = None, [], 0, 0
+    try:
+        for table in _arrow_tables(frames):
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema, compression=PARQUET_COMPRESSION)
+            pending.append(table)
+            buffered += table.num_rows
+            rows += table.num_rows
+            if buffered >= PARQUET_ROW_GROUP_ROWS:
+                merged = pa.concat_tables(pending)
+                full = buffered - buffered % PARQUET_ROW_GROUP_ROWS
+                writer.write_table(merged.slice(0, full), row_group_size=PARQUET_ROW_GROUP_ROWS)
+                pending, buffered = [merged.slice(full)], buffered - full
+        if writer is None:  # sin partes: archivo válido sin columnas
+            writer = pq.ParquetWriter(path, pa.schema([]), compression=PARQUET_COMPRESSION)
+        if buffered:
+            writer.write_table(pa.concat_tables(pending), row_group_size=PARQUET_ROW_GROUP_ROWS)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+def _write_feather(frames: Iterable[pd.DataFrame], path: str) -> int:
+    """Feather v2 (Arrow IPC en archivo), escrito parte por parte."""
+    import pyarrow as pa
+
+    options = pa.ipc.IpcWriteOptions(compression=FEATHER_COMPRESSION)
+    rows = 0
+    with pa.OSFile(path, "wb") as sink:
+        writer = None
+        try:
+            for table in _arrow_tables(frames):
+                if writer is None:
+                    writer = pa.ipc.new_file(sink, table.schema, options=options)
+                writer.write_table(table)
+                rows += table.num_rows
+            if writer is None:
+                writer = pa.ipc.new_file(sink, pa.schema([]), options=options)
+        finally:
+            if writer is not None:
+                writer.close()
+    return rows
+
+def _write_jsonl(frames: Iterable[pd.DataFrame], path: str, compression: str | None) -> int:
+    """Un objeto JSON por fila (fechas ISO 8601, nulos como null), comprimido al vuelo."""
+    import pyarrow as pa
+
+    rows = 0
+    sink = pa.CompressedOutputStream(path, compression) if compression else open(path, "wb")
+    with sink:
+        for df in frames:
+            if len(df):
+                text = df.to_json(
+                    orient="records", lines=True, date_format="iso", force_ascii=False,
+                    double_precision=15,
+                )
+                sink.write(text.encode("utf-8"))
+                rows += len(df)
+    return rows
 
 def export_failed_rows(rows: list[dict]) -> str | None:
     """
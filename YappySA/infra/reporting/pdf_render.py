@@ -0,0 +1,669 @@
+# YappySA/infra/reporting/pdf_render.py
+"""
+Dibujo de tablas en PDF (A4 apaisado) con QPainter, sin ventanas.
+
+Recibe encabezados y las filas en bloques por columnas (frame_blocks);
+no sabe de vistas ni modelos. Lo usan la exportación de la vista
+(ui/desktop_pyside/pdf_utils.py) y los reportes sin GUI (pdf_report.py). Fuera de la GUI hace falta una
+QGuiApplication: ensure_gui_app() la crea con la plataforma offscreen.
+
+Anchos de columna y métricas de fuente se calculan una vez por
+exportación, el texto se corta con reglas de corte suave (@ . _ - : / \\ +
+y cada 8 alfanuméricos) columna por columna, con numpy, y cada página se
+emite apenas se arma.
+"""
+from __future__ import annotations
+
+import ctypes
+import os
+import sys
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from PySide6.QtCore import QBuffer, QIODevice, QMarginsF, QPointF, QSizeF, QRectF, Qt
+from PySide6.QtGui import (
+    QColor,
+    QFont,
+    QFontMetricsF,
+    QGuiApplication,
+    QPageLayout,
+    QPageSize,
+    QPainter,
+    QPdfWriter,
+    QPen,
+    QStaticText,
+    QTransform,
+)
+
+# =========================
+# Parámetros ajustables
+# =========================
+MIN_FONT_SCALE = 0.8       # una página con filas muy altas se reduce, como mucho, a este factor
+FONT_PT       = 10         # tamaño base de tabla
+TITLE_PT      = 17         # título
+FOOTER_PT     = 9          # pie
+FONT_FAMILIES = ["Segoe UI", "Arial"]
+
+# A4 apaisado en puntos (1pt = 1/72")
+PAGE_W, PAGE_H = 842, 595
+
+# Márgenes pequeños
+MARGINS = QMarginsF(10, 12, 10, 12)  # left, top, right, bottom
+
+# “Guardas” de seguridad para que nada se corte
+SAFETY_SCALE_X = 0.985     # leve reducción horizontal
+SAFETY_SCALE_Y = 0.985     # leve reducción vertical
+RIGHT_GUTTER   = 6.0       # canal a la derecha (pt) para evitar mordida del borde
+
+# Geometría de la tabla (unidades lógicas; la página se escala al área útil)
+LOGICAL_WIDTH = 900.0      # ancho de la tabla antes de escalar
+LOGICAL_DPI   = 96         # las fuentes se miden como en pantalla (igual que el HTML anterior)
+CELL_PAD_X    = 6.0
+CELL_PAD_Y    = 4.0
+TITLE_GAP     = 6.0        # espacio bajo el título
+FOOTER_GAP    = 6.0        # espacio sobre el pie
+
+HEADER_BG = QColor("#00aaff")
+HEADER_FG = QColor("#ffffff")
+TEXT_FG   = QColor("#111111")
+FOOTER_FG = QColor("#666666")
+ZEBRA_BG  = QColor("#fafafa")
+GRID      = QColor("#dddddd")
+
+WRAP_CACHE_MAX = 50_000    # textos ya cortados en líneas, por columna (por exportación)
+ROW_CHUNK      = 2048      # filas que se leen y se miden juntas
+VECTOR_MAX_CHARS = 256     # textos más largos se cortan de a uno (la matriz sería enorme)
+
+DEFAULT_TITLE = "Últimos usuarios actualizados"
+
+# ---------- helpers visuales ----------
+def _col_widths(headers: List[str]) -> List[int]:
+    weights = []
+    for h in headers:
+        hl = h.lower().strip()
+        if "display" in hl or "nombre" in hl:
+            w = 24
+        elif "email" in hl:
+            w = 22
+        elif "client_id" in hl or "uuid" in hl:
+            w = 16
+        elif "national" in hl or "cédula" in hl or "cedula" in hl or hl == "ruc":
+            w = 14
+        elif "phone" in hl or "tel" in hl or "alias" in hl or "created" in hl or "fecha" in hl:
+            w = 12
+        elif "client_type" in hl or "tipo" in hl:
+            w = 10
+        else:
+            w = 12
+        weights.append(w)
+    total = sum(weights) or 1
+    return [max(6, round(w * 100 / total)) for w in weights]
+
+
+_BREAK_AFTER = frozenset("@._-:/\\+ ")
+_ALNUM = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+
+def _font(pt: float, weight=QFont.Normal) -> QFont:
+    f = QFont()
+    f.setFamilies(FONT_FAMILIES)
+    f.setPointSizeF(pt * LOGICAL_DPI / 72)  # el writer está a 72 dpi
+    f.setWeight(weight)
+    return f
+
+# ---------- QPainter en PySide6 6.12 + Python < 3.12 ----------
+# Ahí los métodos void de Qt (setPen, drawRects, setFont...) devuelven None
+# sin sumarle la referencia. Con miles de llamadas por exportación el
+# contador de None llega a cero y el intérprete aborta ("deallocating None").
+# Desde 3.12 None es inmortal y esto no hace falta.
+def _void_calls_leak_none() -> bool:
+    if sys.version_info >= (3, 12):
+        return False
+    f = QFont()
+    before = sys.getrefcount(None)
+    for _ in range(32):
+        f.setBold(False)
+    lost = before - sys.getrefcount(None)
+    for _ in range(max(0, lost)):
+        _incref(None)
+    return lost >= 16
+
+_incref = ctypes.pythonapi.Py_IncRef
+_incref.argtypes = [ctypes.py_object]
+_incref.restype = None
+_VOID_LEAKS_NONE: Optional[bool] = None  # se mide con la primera exportación (hace falta la app de Qt)
+
+class _NoneSafePainter:
+    """QPainter que repone la referencia a None de cada llamada que devuelve None."""
+
+    def __init__(self, painter: QPainter):
+        self._painter = painter
+
+    def __getattr__(self, name):
+        attr = getattr(self._painter, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args):
+            result = attr(*args)
+            if result is None:
+                _incref(None)  # de más no hace daño; de menos, sí
+            return result
+
+        setattr(self, name, call)
+        return call
+
+# ---------- renderer ----------
+_CELL_FLAGS = int(Qt.AlignLeft | Qt.AlignVCenter | Qt.TextDontClip)
+
+class _TableRenderer:
+    """
+    Dibuja páginas de la tabla con QPainter. Fuentes, métricas, anchos de
+    columna y encabezados (QStaticText) se preparan una vez; los textos
+    ya cortados en líneas quedan en caché para las páginas siguientes.
+    paginate() arma las páginas con el alto medido de cada fila.
+    """
+
+    def __init__(self, device, headers: List[str], title: str, content: QRectF):
+        self.headers = headers
+        self.content = content
+        self.body_font = _font(FONT_PT)
+        self.head_font = _font(FONT_PT, QFont.DemiBold)
+        self.title_font = _font(TITLE_PT, QFont.Bold)
+        self.footer_font = _font(FOOTER_PT)
+        self.body_fm = QFontMetricsF(self.body_font, device)  # 72 dpi, como el writer
+        self.head_fm = QFontMetricsF(self.head_font, device)
+        # Avance entre líneas tal como lo aplica drawText(rect, ...) al dibujar las celdas
+        probe = QRectF(0, 0, LOGICAL_WIDTH, LOGICAL_WIDTH)
+        self.line_h = (
+            self.body_fm.boundingRect(probe, _CELL_FLAGS, "x\nx").height()
+            - self.body_fm.boundingRect(probe, _CELL_FLAGS, "x").height()
+        )
+
+        widths = _col_widths(headers)
+        total = sum(widths) or 1
+        self.col_w = [LOGICAL_WIDTH * w / total for w in widths]
+        self.col_x = [sum(self.col_w[:c]) for c in range(len(widths))]
+        self.text_x = [x + CELL_PAD_X for x in self.col_x]
+        self.text_w = [max(1.0, w - 2 * CELL_PAD_X) for w in self.col_w]
+
+        self._advance: Dict[int, Dict[str, float]] = {}  # ancho por carácter, por fuente
+        self._wrapped: List[Dict[str, Tuple[str, int]]] = [{} for _ in headers]  # por columna
+
+        # Lo que se repite en todas las páginas
+        title_fm = QFontMetricsF(self.title_font, device)
+        self.title = title
+        self.title_x = (LOGICAL_WIDTH - title_fm.horizontalAdvance(title)) / 2
+        self.title_ascent = title_fm.ascent()
+        self.title_h = title_fm.lineSpacing() + TITLE_GAP
+        self.head_lines = [
+            [self._static(line) for line in self._wrap_with(h, self.text_w[c], self.head_fm)]
+            for c, h in enumerate(headers)
+        ]
+        self.head_h = self._row_height(len(lines) for lines in self.head_lines)
+        self.head_rects = [QRectF(x, self.title_h, w, self.head_h) for x, w in zip(self.col_x, self.col_w)]
+        self.grid_pen = QPen(GRID, 1)
+        self._footer_fm = QFontMetricsF(self.footer_font, device)
+        self.footer_h = FOOTER_GAP + self._footer_fm.lineSpacing()
+
+        # Escala normal: la tabla ocupa el ancho útil. Con ella se calcula
+        # cuánto alto queda para filas en cada página.
+        usable_width = max(1.0, content.width() - RIGHT_GUTTER)
+        self.scale = min(1.0, usable_width / LOGICAL_WIDTH * SAFETY_SCALE_X)
+        fixed = self.title_h + self.head_h + self.footer_h
+        self.body_budget = content.height() * SAFETY_SCALE_Y / self.scale - fixed
+        # Una celda no puede pasar del alto de una página a la escala mínima
+        max_body = content.height() * SAFETY_SCALE_Y / (self.scale * MIN_FONT_SCALE) - fixed
+        self.max_lines = max(1, int((max_body - 2 * CELL_PAD_Y) // self.line_h))
+
+    # ----- texto -----
+    @staticmethod
+    def _static(text: str) -> QStaticText:
+        st = QStaticText(text)
+        st.setTextFormat(Qt.PlainText)
+        return st
+
+    def _advances(self, fm: QFontMetricsF) -> Dict[str, float]:
+        adv = self._advance.get(id(fm))
+        if adv is None:
+            adv = self._advance[id(fm)] = {}
+        return adv
+
+    def _text_width(self, text: str, fm: QFontMetricsF) -> float:
+        """Suma de anchos por carácter (sin kerning; alcanza para decidir cortes)."""
+        adv = self._advances(fm)
+        try:
+            return sum(map(adv.__getitem__, text))
+        except KeyError:
+            for ch in set(text) - adv.keys():
+                adv[ch] = fm.horizontalAdvance(ch)
+            return sum(map(adv.__getitem__, text))
+
+    def _wrap_with(self, text: str, width: float, fm: QFontMetricsF) -> Tuple[str, ...]:
+        """
+        Corta en líneas de `width`. Cortes suaves: después de espacios, de
+        @ . _ - : / \\ + y cada 8 alfanuméricos seguidos; lo que no entra ni
+        así, por carácter.
+        """
+        self._text_width(text, fm)  # carga los anchos que falten
+        adv = self._advances(fm)
+        lines: List[str] = []
+        for para in text.split("\n"):
+            n = len(para)
+            start, w, brk, run = 0, 0.0, -1, 0
+            for i, ch in enumerate(para):
+                cw = adv[ch]
+                if w + cw > width and i > start and ch != " ":
+                    cut = brk if brk > start else i
+                    lines.append(para[start:cut].rstrip(" "))
+                    start, brk = cut, -1
+                    w = sum(map(adv.__getitem__, para[start:i]))
+                w += cw
+                if ch in _ALNUM:
+                    run += 1
+                    if run == 8 and i + 1 < n and para[i + 1] in _ALNUM:
+                        brk, run = i + 1, 0
+                else:
+                    run = 0
+                    if ch in _BREAK_AFTER:
+                        brk = i + 1
+            lines.append(para[start:].rstrip(" "))
+        return tuple(lines)
+
+    def _wrap_cell(self, text: str, col: int) -> Tuple[str, int]:
+        width = self.text_w[col]
+        if "\n" not in text and self._text_width(text, self.body_fm) <= width:
+            return text, 1  # entra entero: sin cortes suaves
+        return self._join(self._wrap_with(text, width, self.body_fm))
+
+    def _join(self, lines: Sequence[str]) -> Tuple[str, int]:
+        if len(lines) > self.max_lines:
+            lines = lines[:self.max_lines]
+            lines = (*lines[:-1], lines[-1][:-1] + "…")
+        return "\n".join(lines), len(lines)
+
+    def wrap(self, text: str, col: int) -> Tuple[str, int]:
+        """(texto con saltos de línea, cantidad de líneas) de una celda de la columna `col`."""
+        cache = self._wrapped[col]
+        cell = cache.get(text)
+        if cell is None:
+            if len(cache) >= WRAP_CACHE_MAX:
+                cache.clear()
+            cell = cache[text] = self._wrap_cell(text, col)
+        return cell
+
+    def wrap_column(self, values: Sequence[str], col: int) -> Tuple[list, np.ndarray]:
+        """
+        wrap() de toda una columna: (textos, cantidad de líneas de cada uno).
+        Cada valor distinto se corta una sola vez y los nuevos se miden
+        juntos (_wrap_many). En columnas con muchos repetidos (client_type,
+        nombres) lo cortado queda en caché para los bloques siguientes; en
+        las de valores casi únicos (client_id, email) no vale la pena.
+        """
+        values = np.asarray(values, dtype=object)
+        codes, uniques = pd.factorize(values)
+        if not (uniques[codes] == values).all():  # factorize agrupa textos cortándolos en NUL
+            codes, uniques = np.arange(len(values)), values
+        if len(uniques) * 2 > len(values):
+            texts, counts = self._wrap_many(uniques, col)
+            return texts[codes].tolist(), counts[codes]
+
+        cache = self._wrapped[col]
+        if len(cache) + len(uniques) > WRAP_CACHE_MAX:
+            cache.clear()
+        keys = uniques.tolist()
+        hits = [cache.get(v) for v in keys]
+        missing = [k for k, cell in enumerate(hits) if cell is None]
+        texts = np.empty(len(keys), dtype=object)
+        counts = np.empty(len(keys), dtype=np.int64)
+        if len(missing) < len(keys):
+            found = [k for k, cell in enumerate(hits) if cell is not None]
+            texts[found] = [hits[k][0] for k in found]
+            counts[found] = [hits[k][1] for k in found]
+        if missing:
+            new_texts, new_counts = self._wrap_many(uniques[missing], col)
+            texts[missing] = new_texts
+            counts[missing] = new_counts
+            cache.update(zip(uniques[missing].tolist(), zip(new_texts.tolist(), new_counts.tolist())))
+        return texts[codes].tolist(), counts[codes]
+
+    def _wrap_many(self, texts: np.ndarray, col: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Los mismos cortes que _wrap_with, calculados con numpy para muchos
+        textos a la vez: anchos acumulados por carácter, posiciones de corte
+        suave y, línea por línea, dónde se pasa cada texto del ancho. Los
+        textos cortados se arman también en bloque (matriz de caracteres).
+        Textos con saltos de línea, muy largos o que pasan de max_lines van
+        por _wrap_cell. Devuelve (textos, líneas) como arrays.
+        """
+        out_texts = np.array(texts, dtype=object)
+        out_counts = np.ones(len(texts), dtype=np.int64)
+
+        def one_by_one(ks) -> None:
+            for k in ks:
+                out_texts[k], out_counts[k] = self._wrap_cell(texts[k], col)
+
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        one_by_one(np.flatnonzero(lengths > VECTOR_MAX_CHARS).tolist())
+        batch = np.flatnonzero(lengths <= VECTOR_MAX_CHARS)
+        if not len(batch):
+            return out_texts, out_counts
+        lengths = lengths[batch]
+        n, width = len(batch), self.text_w[col]
+        span = max(1, int(lengths.max()))
+        cps = out_texts[batch].astype(f"<U{span}").view(np.uint32).reshape(n, span)  # relleno: 0
+        pos = np.arange(span)
+        valid = pos < lengths[:, None]
+
+        # Anchos por carácter con el mismo diccionario que _text_width
+        # (y qué caracteres son alfanuméricos o cortes suaves, por código)
+        adv = self._advances(self.body_fm)
+        present = np.flatnonzero(np.bincount(cps.ravel()))
+        char_w = np.zeros(int(present[-1]) + 1)
+        char_kind = np.zeros(len(char_w), dtype=np.uint8)  # 1: alfanumérico, 2: corte después
+        for cp in present.tolist():
+            ch = chr(cp)
+            if cp and ch not in adv:
+                adv[ch] = self.body_fm.horizontalAdvance(ch)
+            char_w[cp] = adv[ch] if cp else 0.0
+            char_kind[cp] = 1 if ch in _ALNUM else 2 if ch in _BREAK_AFTER else 0
+        cum = np.zeros((n, span + 1))
+        np.cumsum(char_w[cps], axis=1, out=cum[:, 1:])  # cum[:, i] = ancho de texto[:i]
+
+        # Saltos de línea (o NUL, que se confunde con el relleno): de a uno
+        odd = (((cps == 10) | (cps == 0)) & valid).any(axis=1)
+        one_by_one(batch[odd].tolist())
+        rows = np.flatnonzero(~odd & (cum[np.arange(n), lengths] > width))  # los que no entran
+        if not len(rows):
+            return out_texts, out_counts
+        batch, cps, cum, lengths, valid = batch[rows], cps[rows], cum[rows], lengths[rows], valid[rows]
+        m = len(rows)
+        is_space = cps == 32
+
+        # Cortes suaves: tras @ . _ - : / \ + y espacio, y cada 8 alfanuméricos
+        # seguidos (si sigue otro). brk[:, p] = último corte en una posición <= p.
+        kind = char_kind[cps]
+        is_alnum = kind == 1
+        run = pos - np.maximum.accumulate(np.where(is_alnum, -1, pos), axis=1)
+        next_alnum = np.zeros_like(is_alnum)
+        next_alnum[:, :-1] = is_alnum[:, 1:]
+        after = (kind == 2) | (is_alnum & (run % 8 == 0) & next_alnum)
+        brk = np.full((m, span + 1), -1, dtype=np.int64)
+        brk[:, 1:] = np.where(after, pos + 1, -1)
+        np.maximum.accumulate(brk, axis=1, out=brk)
+
+        # Línea por línea: el primer carácter (no espacio, aún no revisado)
+        # que se pasa del ancho corta en el último corte suave de la línea,
+        # o ahí mismo si no hay. Basta llegar a max_lines cortes.
+        can_cut = valid & ~is_space
+        start = np.zeros(m, dtype=np.int64)
+        seen = np.zeros(m, dtype=np.int64)  # caracteres ya revisados: 0..seen
+        cuts = np.full((m, self.max_lines), -1, dtype=np.int64)
+        live = np.arange(m)  # textos que todavía se pasan del ancho
+        for k in range(self.max_lines):
+            s = start[live]
+            over = (
+                can_cut[live]
+                & (pos > seen[live][:, None])
+                & (cum[live, 1:] - cum[live, s][:, None] > width)
+            )
+            has = over.any(axis=1)
+            live, over, s = live[has], over[has], s[has]
+            if not len(live):
+                break
+            at = over.argmax(axis=1)
+            soft = brk[live, at]
+            cut = np.where(soft > s, soft, at)
+            cuts[live, k] = cut
+            start[live] = cut
+            seen[live] = at
+        n_cuts = (cuts >= 0).sum(axis=1)
+
+        # Más de max_lines líneas (se truncan con "…"): de a uno
+        short = n_cuts < self.max_lines
+        one_by_one(batch[~short].tolist())
+        if not short.any():
+            return out_texts, out_counts
+        batch, cps, cuts, n_cuts = batch[short], cps[short], cuts[short], n_cuts[short]
+        lengths, valid, is_space = lengths[short], valid[short], is_space[short]
+        m = len(batch)
+        used = int(n_cuts.max())
+        cuts = cuts[:, :used]
+
+        # Armado en bloque: sin los espacios al final de cada línea y con un
+        # salto de línea en cada corte (como "\n".join(línea.rstrip(" "))).
+        seg = np.zeros((m, span), dtype=np.int64)        # línea de cada carácter
+        line_end = np.broadcast_to(lengths[:, None], (m, span))
+        for k in reversed(range(used)):
+            c = cuts[:, k][:, None]
+            seg += (c >= 0) & (pos >= c)
+            line_end = np.where((c >= 0) & (c > pos), c, line_end)
+        solid = np.where(valid & ~is_space, pos, span)
+        next_solid = np.minimum.accumulate(solid[:, ::-1], axis=1)[:, ::-1]
+        kept = valid & ~(is_space & (next_solid >= line_end))
+        kept_before = np.cumsum(kept, axis=1) - kept
+        # Cada carácter a su lugar; los que se quitan, a una columna de descarte
+        text = np.zeros((m, span + used + 1), dtype=np.uint32)
+        np.put_along_axis(text, np.where(kept, kept_before + seg, span + used), cps, axis=1)
+        r_idx, k_idx = np.nonzero(cuts >= 0)
+        c_idx = cuts[r_idx, k_idx]
+        text[r_idx, kept_before[r_idx, c_idx] + k_idx] = 10  # "\n"
+
+        out_texts[batch] = np.ascontiguousarray(text[:, :-1]).view(f"<U{span + used}").ravel().tolist()
+        out_counts[batch] = n_cuts + 1
+        return out_texts, out_counts
+
+    def _row_height(self, line_counts) -> float:
+        return max(1, max(line_counts, default=1)) * self.line_h + 2 * CELL_PAD_Y
+
+    def measure(self, block: Sequence[Sequence[str]]) -> Tuple[list, List[float]]:
+        """
+        (celdas, altos) de un bloque de filas dado por columnas: cada fila
+        queda como tupla de textos ya cortados.
+        """
+        if not block:
+            return [], []
+        texts, counts = zip(*(self.wrap_column(values, c) for c, values in enumerate(block)))
+        lines = np.maximum(np.maximum.reduce(counts), 1)
+        return list(zip(*texts)), (lines * self.line_h + 2 * CELL_PAD_Y).tolist()
+
+    def _measured(self, blocks: Iterable[Sequence[Sequence[str]]]) -> Iterator[Tuple[tuple, float]]:
+        for block in blocks:
+            yield from zip(*self.measure(block))
+
+    # ----- página -----
+    def page_height(self, heights: Sequence[float]) -> float:
+        return self.title_h + self.head_h + sum(heights) + self.footer_h
+
+    def paginate(self, blocks: Iterable[Sequence[Sequence[str]]]) -> Iterator[Tuple[list, List[float]]]:
+        """
+        Reparte las filas en páginas según su alto medido: cada página lleva
+        todas las filas que entran a la escala normal. Una fila que sola no
+        entra va en su propia página (draw_page la reduce hasta MIN_FONT_SCALE).
+        Devuelve (celdas, altos) por página; siempre al menos una.
+        """
+        cells: list = []
+        heights: List[float] = []
+        used = 0.0
+        budget = self.body_budget
+        for row, h in self._measured(blocks):
+            if cells and used + h > budget:
+                yield cells, heights
+                cells, heights, used = [], [], 0.0
+            cells.append(row)
+            heights.append(h)
+            used += h
+        yield cells, heights
+
+    def fixed_pages(self, blocks: Iterable[Sequence[Sequence[str]]], sizes: Sequence[int]) -> Iterator[Tuple[list, List[float]]]:
+        """Como paginate(), con las filas de cada página ya repartidas (p. ej. por page_sizes())."""
+        measured = self._measured(blocks)
+        for size in sizes:
+            page = list(islice(measured, size))
+            yield [row for row, _ in page], [h for _, h in page]
+
+    def draw_page(self, painter: QPainter, cells, heights: Sequence[float], page_num: int) -> None:
+        """
+        Una página. Fondos y grilla van en pocas llamadas (drawRects por
+        color) y todo el texto con drawText: el costo por página es casi
+        solo el de las celdas.
+        """
+        content = self.content
+        fit = content.height() / self.page_height(heights) * SAFETY_SCALE_Y
+        scale = max(self.scale * MIN_FONT_SCALE, min(self.scale, fit))
+        painter.setTransform(QTransform(scale, 0, 0, scale, content.left(), content.top()))
+
+        # Fondos + grilla: cada celda es un rect con borde GRID
+        head_top = self.title_h
+        row_tops, y = [], head_top + self.head_h
+        plain, zebra = [], []
+        for r, h in enumerate(heights):
+            row_tops.append(y)
+            target = zebra if r % 2 == 1 else plain  # tr:nth-child(even)
+            target.extend(QRectF(x, y, w, h) for x, w in zip(self.col_x, self.col_w))
+            y += h
+        painter.setPen(self.grid_pen)
+        painter.setBrush(HEADER_BG)
+        painter.drawRects(self.head_rects)
+        if zebra:
+            painter.setBrush(ZEBRA_BG)
+            painter.drawRects(zebra)
+        if plain:
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRects(plain)
+
+        # Título centrado
+        painter.setFont(self.title_font)
+        painter.setPen(TEXT_FG)
+        painter.drawText(QPointF(self.title_x, self.title_ascent), self.title)
+
+        # Encabezado
+        painter.setFont(self.head_font)
+        painter.setPen(HEADER_FG)
+        for c, lines in enumerate(self.head_lines):
+            top = head_top + (self.head_h - len(lines) * self.line_h) / 2
+            for i, st in enumerate(lines):
+                painter.drawStaticText(QPointF(self.col_x[c] + CELL_PAD_X, top + i * self.line_h), st)
+
+        # Celdas: un drawText por celda (las líneas ya vienen cortadas)
+        painter.setFont(self.body_font)
+        painter.setPen(TEXT_FG)
+        for row, top_y, h in zip(cells, row_tops, heights):
+            for text, x, w in zip(row, self.text_x, self.text_w):
+                if text:
+                    painter.drawText(QRectF(x, top_y, w, h), _CELL_FLAGS, text)
+
+        # Pie a la derecha, bajo la tabla
+        painter.setFont(self.footer_font)
+        painter.setPen(FOOTER_FG)
+        footer = f"Página {page_num}"
+        fw = self._footer_fm.horizontalAdvance(footer)
+        painter.drawText(QPointF(LOGICAL_WIDTH - fw, y + FOOTER_GAP + self._footer_fm.ascent()), footer)
+
+# ---------- filas ----------
+def column_strings(col: pd.Series) -> List[str]:
+    """Textos de una columna como en la vista (vacío para nulos), de una vez."""
+    out = col.astype(str).to_numpy(dtype=object)
+    out[col.isna().to_numpy()] = ""
+    return out.tolist()
+
+def frame_blocks(df: pd.DataFrame, chunk: int = ROW_CHUNK) -> Iterator[List[List[str]]]:
+    """
+    Un DataFrame en bloques de `chunk` filas: cada bloque es la lista de
+    columnas (textos), que es lo que reciben render_pdf() y page_sizes().
+    """
+    for start in range(0, len(df), chunk):
+        block = df.iloc[start:start + chunk]
+        yield [column_strings(block.iloc[:, c]) for c in range(block.shape[1])]
+
+def rows_to_blocks(rows: Iterable[Sequence[str]], chunk: int = ROW_CHUNK) -> Iterator[List[List[str]]]:
+    """Filas de textos (p. ej. leídas de un modelo) agrupadas en bloques por columnas."""
+    rows = iter(rows)
+    while True:
+        part = list(islice(rows, chunk))
+        if not part:
+            return
+        yield [list(col) for col in zip(*part)]
+
+# ---------- writer ----------
+_app = None  # QGuiApplication creada aquí (sin GUI); se mantiene viva
+
+def ensure_gui_app():
+    """
+    Medir y dibujar texto requiere una QGuiApplication. Dentro de la GUI ya
+    existe; en la CLI o en un proceso de trabajo se crea una offscreen.
+    """
+    global _app
+    app = QGuiApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = _app = QGuiApplication([])
+    return app
+
+def _pdf_writer(target) -> Tuple[QPdfWriter, QRectF]:
+    """QPdfWriter A4 apaisado a 72 dpi (1:1) y el área útil dentro de los márgenes."""
+    writer = QPdfWriter(target)
+    writer.setResolution(72)
+    writer.setPageSize(QPageSize(QSizeF(PAGE_W, PAGE_H), QPageSize.Point, "A4Landscape"))
+    writer.setPageMargins(MARGINS, QPageLayout.Point)
+    # El painter ya empieza dentro de los márgenes
+    content = QRectF(
+        0,
+        0,
+        PAGE_W - (MARGINS.left() + MARGINS.right()),
+        PAGE_H - (MARGINS.top() + MARGINS.bottom()),
+    )
+    return writer, content
+
+def _begin_painter(writer: QPdfWriter):
+    global _VOID_LEAKS_NONE
+    if _VOID_LEAKS_NONE is None:
+        _VOID_LEAKS_NONE = _void_calls_leak_none()
+    painter = QPainter(writer)
+    if _VOID_LEAKS_NONE:
+        painter = _NoneSafePainter(painter)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    return painter
+
+# ---------- API ----------
+def render_pdf(
+    path: str,
+    headers: List[str],
+    blocks: Iterable[Sequence[Sequence[str]]],
+    title: str = DEFAULT_TITLE,
+    *,
+    first_page: int = 1,
+    sizes: Optional[Sequence[int]] = None,
+) -> int:
+    """
+    Dibuja las filas de `blocks` (ver frame_blocks) en `path` y devuelve
+    la cantidad de páginas. Con `sizes` (filas por página, de page_sizes())
+    no pagina: dibuja esas páginas numeradas desde `first_page`.
+    """
+    ensure_gui_app()
+    writer, content = _pdf_writer(str(path))
+    renderer = _TableRenderer(writer, headers, title, content)
+    pages = renderer.paginate(blocks) if sizes is None else renderer.fixed_pages(blocks, sizes)
+    painter = _begin_painter(writer)
+    page_num = 0
+    try:
+        for page_num, (cells, heights) in enumerate(pages, start=1):
+            if page_num > 1:
+                writer.newPage()
+            renderer.draw_page(painter, cells, heights, first_page + page_num - 1)
+    finally:
+        painter.end()
+    return page_num
+
+def page_sizes(
+    headers: List[str], blocks: Iterable[Sequence[Sequence[str]]], title: str = DEFAULT_TITLE
+) -> Iterator[int]:
+    """Filas de cada página tal como las reparte render_pdf, sin dibujar nada."""
+    ensure_gui_app()
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    writer, content = _pdf_writer(buffer)
+    renderer = _TableRenderer(writer, headers, title, content)
+    for cells, _ in renderer.paginate(blocks):
+        yield len(cells)
@@ -0,0 +1,180 @@
+# YappySA/infra/reporting/pdf_report.py
+"""
+Reportes PDF sin GUI: desde un DataFrame, DataFrames por partes o un
+SpilledResult (resultado de consulta en disco). Qt corre con la
+plataforma offscreen (pdf_render.ensure_gui_app).
+
+Con workers > 1 el reporte se reparte en rangos de páginas: este proceso
+pagina (mide las filas, no dibuja) y va entregando cada rango a un
+proceso de trabajo que lo dibuja en un PDF aparte; al final las partes
+se unen en uno. Unir requiere pypdf (opcional): sin él, o si el
+resultado es chico, todo se dibuja en este proceso.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+from YappySA.core.profiling import profiled
+from YappySA.infra.reporting.pdf_render import DEFAULT_TITLE, ROW_CHUNK, frame_blocks, page_sizes, render_pdf
+
+MIN_ROWS_PER_PART = 2_000  # con menos filas por proceso no compensa arrancarlo
+
+log = logging.getLogger("yappysa.pdf")
+
+
+def _can_merge() -> bool:
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _merge(parts: List[Path], path: str) -> None:
+    from pypdf import PdfWriter
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(str(part))
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def _workers_for(rows: int, workers: int) -> int:
+    """Procesos a usar: los pedidos, sin bajar de MIN_ROWS_PER_PART filas cada uno."""
+    workers = min(workers, rows // MIN_ROWS_PER_PART)
+    if workers > 1 and not _can_merge():
+        log.info("pypdf no está instalado: el PDF se dibuja en un solo proceso")
+        return 1
+    return max(1, workers)
+
+
+def _spilled_blocks(result, start: int, stop: int) -> Iterator[List[List[str]]]:
+    for s in range(start, stop, ROW_CHUNK):
+        yield from frame_blocks(result.frame(s, min(s + ROW_CHUNK, stop)))
+
+
+def _render_part(source: tuple, headers: List[str], title: str, first_page: int,
+                 sizes: List[int], out_path: str) -> int:
+    """
+    Proceso de trabajo: dibuja sus páginas (ya repartidas) en out_path.
+    source: ("frame", DataFrame) o ("arrow", ruta, desde, hasta).
+    """
+    if source[0] == "arrow":
+        from YappySA.infra.db.spill import SpilledResult
+
+        _, arrow_path, start, stop = source
+        result = SpilledResult(arrow_path, delete_on_close=False)  # el archivo es del proceso principal
+        try:
+            blocks = _spilled_blocks(result, start, stop)
+            return render_pdf(out_path, headers, blocks, title, first_page=first_page, sizes=sizes)
+        finally:
+            result.close()
+    return render_pdf(out_path, headers, frame_blocks(source[1]), title, first_page=first_page, sizes=sizes)
+
+
+def _render_parallel(
+    path: str,
+    headers: List[str],
+    blocks: Iterable[List[List[str]]],
+    total_rows: int,
+    title: str,
+    workers: int,
+    part_source: Callable[[int, int], tuple],
+) -> int:
+    """
+    Pagina `blocks` aquí y, cada total_rows / workers filas (en un corte de
+    página), manda ese rango a un proceso. part_source(desde, hasta) arma
+    lo que recibe el proceso para leer esas filas por su cuenta.
+    """
+    per_part = -(-total_rows // workers)
+    futures, parts = [], []
+    ctx = multiprocessing.get_context("spawn")  # Qt no sobrevive a fork
+    with tempfile.TemporaryDirectory(prefix="yappysa_pdf_") as tmp, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+
+        def submit(start: int, stop: int, first_page: int, sizes: List[int]) -> None:
+            out = Path(tmp) / f"part_{len(parts):03d}.pdf"
+            parts.append(out)
+            futures.append(pool.submit(
+                _render_part, part_source(start, stop), headers, title, first_page, sizes, str(out)
+            ))
+
+        start = stop = 0
+        first_page = 1
+        sizes: List[int] = []
+        for n in page_sizes(headers, blocks, title):
+            sizes.append(n)
+            stop += n
+            if stop - start >= per_part:
+                submit(start, stop, first_page, sizes)
+                start, first_page, sizes = stop, first_page + len(sizes), []
+        if sizes:
+            submit(start, stop, first_page, sizes)
+
+        pages = sum(f.result() for f in futures)
+        _merge(parts, path)
+    return pages
+
+
+@profiled("pdf")
+def export_dataframe_pdf(df: pd.DataFrame, path: str, title: Optional[str] = None, workers: int = 1) -> int:
+    """DataFrame a PDF (mismo formato que la vista). Devuelve la cantidad de páginas."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    title = title or DEFAULT_TITLE
+    headers = [str(c) for c in df.columns]
+    workers = _workers_for(len(df), workers)
+    if workers <= 1:
+        return render_pdf(path, headers, frame_blocks(df), title)
+    return _render_parallel(
+        path, headers, frame_blocks(df), len(df), title, workers,
+        lambda start, stop: ("frame", df.iloc[start:stop]),
+    )
+
+
+@profiled("pdf")
+def export_frames_pdf(frames: Iterable[pd.DataFrame], path: str, title: Optional[str] = None) -> int:
+    """
+    Resultado por partes a PDF, sin juntarlo en memoria (un solo proceso:
+    las partes no se pueden volver a leer). Devuelve la cantidad de páginas.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    frames = iter(frames)
+    first = next(frames, None)
+    headers = [] if first is None else [str(c) for c in first.columns]
+
+    def blocks() -> Iterator[List[List[str]]]:
+        if first is None:
+            return
+        yield from frame_blocks(first)
+        for df in frames:
+            yield from frame_blocks(df)
+
+    return render_pdf(path, headers, blocks(), title or DEFAULT_TITLE)
+
+
+@profiled("pdf")
+def export_spilled_pdf(result, path: str, title: Optional[str] = None, workers: int = 1) -> int:
+    """
+    SpilledResult a PDF. Cada proceso de trabajo abre el mismo archivo
+    Arrow y lee solo sus filas. Devuelve la cantidad de páginas.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    title = title or DEFAULT_TITLE
+    headers = result.columns
+    blocks = _spilled_blocks(result, 0, result.num_rows)
+    workers = _workers_for(result.num_rows, workers)
+    if workers <= 1:
+        return render_pdf(path, headers, blocks, title)
+    arrow_path = str(result.path)
+    return _render_parallel(
+        path, headers, blocks, result.num_rows, title, workers,
+        lambda start, stop: ("arrow", arrow_path, start, stop),
+    )
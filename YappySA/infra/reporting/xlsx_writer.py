@@ -0,0 +1,388 @@
+# YappySA/infra/reporting/xlsx_writer.py
+"""
+Escritura de .xlsx por partes, en memoria constante.
+
+openpyxl (incluso en write_only) arma y serializa un objeto por celda:
+unas 10 s cada 100k filas. Aquí el XML de cada hoja se arma por columna,
+de a CHUNK_ROWS filas, y se escribe a un archivo temporal; al cerrar se
+empaqueta todo en el .xlsx. Los textos van en la celda (inlineStr), así
+no hay una tabla de textos compartidos que crezca con el resultado.
+
+- Más de XLSX_MAX_ROWS filas siguen en otra hoja con el mismo nombre
+  y un número ("Sheet1 (2)", "Sheet1 (3)", ...).
+- El ancho de cada columna sale de una muestra de WIDTH_SAMPLE_ROWS filas
+  de la primera parte, no de recorrer todo.
+- El estilo del encabezado (y el formato de fecha) se define una sola vez
+  en styles.xml; las celdas solo lo referencian.
+"""
+from __future__ import annotations
+
+import re
+import shutil
+import tempfile
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain, repeat
+from pathlib import Path
+from typing import Iterable, Iterator, List, Mapping, Optional, Union
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+import pandas as pd
+
+XLSX_MAX_ROWS = 1_048_575  # filas de datos por hoja (más el encabezado)
+CHUNK_ROWS = 50_000  # filas que se pasan a XML de una vez
+WIDTH_SAMPLE_ROWS = 1_000
+MIN_WIDTH, MAX_WIDTH = 8, 60
+MAX_CELL_CHARS = 32_767  # límite de Excel por celda
+SHEET_NAME_CHARS = 31
+
+# índices en <cellXfs> de styles.xml
+_STYLE_DATE = 1
+_STYLE_HEADER = 2
+
+_ILLEGAL_XML = r"[\x00-\x08\x0b\x0c\x0e-\x1f]"
+_ILLEGAL_XML_RE = re.compile(_ILLEGAL_XML)
+_BAD_SHEET_CHARS = re.compile(r"[\[\]:*?/\\]")
+_EXCEL_EPOCH = np.datetime64("1899-12-30", "us")
+_FIRST_SERIAL = 61  # antes del 1900-03-01 Excel cuenta mal (29/02/1900)
+
+_NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+_NS_R = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_CT = "application/vnd.openxmlformats-officedocument.spreadsheetml"
+
+_STYLES = _XML_DECL + (
+    f'<styleSheet {_NS}>'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="2">'
+    '<font><sz val="11"/><name val="Calibri"/><family val="2"/></font>'
+    '<font><b/><sz val="11"/><color rgb="FFFFFFFF"/><name val="Calibri"/><family val="2"/></font>'
+    '</fonts>'
+    '<fills count="3">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFFF8C00"/><bgColor indexed="64"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="0" xfId="0" applyFont="1" applyFill="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def _col_letter(i: int) -> str:
+    letters = ""
+    i += 1
+    while i:
+        i, r = divmod(i - 1, 26)
+        letters = chr(65 + r) + letters
+    return letters
+
+
+def _text_cells(texts: Iterable, letter: str, rows: List[str]) -> List[str]:
+    return [
+        "" if t is None else f'<c r="{letter}{r}" t="inlineStr"><is><t xml:space="preserve">{t}</t></is></c>'
+        for r, t in zip(rows, texts)
+    ]
+
+
+def _value_cells(values: Iterable, letter: str, rows: List[str], style: str = "", kind: str = "") -> List[str]:
+    return [
+        "" if v is None else f'<c r="{letter}{r}"{style}{kind}><v>{v}</v></c>'
+        for r, v in zip(rows, values)
+    ]
+
+
+def _escaped(s: pd.Series) -> List[Optional[str]]:
+    """Textos listos para el XML (sin caracteres inválidos, recortados a MAX_CELL_CHARS); None = vacío."""
+    s = s.astype("string")
+    s = (
+        s.str.slice(0, MAX_CELL_CHARS)
+        .str.replace(_ILLEGAL_XML, "", regex=True)
+        .str.replace("&", "&amp;", regex=False)
+        .str.replace("<", "&lt;", regex=False)
+        .str.replace(">", "&gt;", regex=False)
+    )
+    out = s.astype(object).to_numpy(copy=True)
+    out[s.isna().to_numpy()] = None
+    return out.tolist()
+
+
+def _number_strings(values: np.ndarray, mask: np.ndarray) -> List[Optional[str]]:
+    out = values.astype(str).astype(object)
+    out[mask] = None
+    return out.tolist()
+
+
+def _date_serials(s: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """Fechas como número de serie de Excel (días desde 1899-12-30) y máscara de vacíos."""
+    if s.dt.tz is not None:
+        s = s.dt.tz_localize(None)  # Excel no guarda zona horaria: queda la hora local
+    values = s.to_numpy(dtype="datetime64[us]")
+    mask = np.isnat(values)
+    serial = (values - _EXCEL_EPOCH) / np.timedelta64(1, "D")
+    return serial, mask
+
+
+def _python_cell(v, letter: str, r: str) -> str:
+    """Celda de una columna object con tipos mezclados (camino lento)."""
+    if v is None or v is pd.NA or v is pd.NaT or (isinstance(v, (float, np.floating)) and not np.isfinite(v)):
+        return ""
+    if isinstance(v, (bool, np.bool_)):
+        return f'<c r="{letter}{r}" t="b"><v>{int(v)}</v></c>'
+    if isinstance(v, (int, float, Decimal, np.integer, np.floating)):
+        return f'<c r="{letter}{r}"><v>{v}</v></c>'
+    if isinstance(v, (datetime, date)):
+        ts = pd.Timestamp(v)
+        if ts.tzinfo is not None:
+            ts = ts.tz_localize(None)
+        serial = (ts.to_datetime64().astype("datetime64[us]") - _EXCEL_EPOCH) / np.timedelta64(1, "D")
+        if serial >= _FIRST_SERIAL:
+            return f'<c r="{letter}{r}" s="{_STYLE_DATE}"><v>{serial}</v></c>'
+    text = escape(_ILLEGAL_XML_RE.sub("", str(v))[:MAX_CELL_CHARS])
+    return f'<c r="{letter}{r}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _column_cells(s: pd.Series, letter: str, rows: List[str]) -> List[str]:
+    """XML de las celdas de una columna (una cadena por fila; "" = celda vacía)."""
+    dtype = s.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        # cada categoría se pasa a XML una vez, con una referencia provisoria ("\0\0")
+        cats = _column_cells(pd.Series(dtype.categories), "\0", ["\0"] * len(dtype.categories))
+        codes = s.cat.codes.to_numpy()
+        return [
+            "" if c < 0 else cats[c].replace("\0\0", f"{letter}{r}", 1)
+            for r, c in zip(rows, codes)
+        ]
+    if pd.api.types.is_bool_dtype(dtype):
+        mask = s.isna().to_numpy()
+        values = s.to_numpy(dtype=object, na_value=None)
+        return _value_cells(
+            (None if m else int(bool(v)) for v, m in zip(values, mask)), letter, rows, kind=' t="b"'
+        )
+    if pd.api.types.is_numeric_dtype(dtype):
+        if pd.api.types.is_integer_dtype(dtype):
+            mask = s.isna().to_numpy()
+            values = s.to_numpy(na_value=0)
+        else:
+            values = s.to_numpy(dtype="float64", na_value=np.nan)
+            mask = ~np.isfinite(values)  # Excel no guarda NaN ni infinitos
+        return _value_cells(_number_strings(values, mask), letter, rows)
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        serial, mask = _date_serials(s)
+        early = ~mask
+        early[early] = serial[early] < _FIRST_SERIAL
+        cells = _value_cells(_number_strings(serial, mask | early), letter, rows, f' s="{_STYLE_DATE}"')
+        if early.any():  # fechas que Excel no representa: como texto ISO
+            texts = _escaped(s[early].astype(str))
+            for i, t in zip(np.flatnonzero(early), texts):
+                cells[i] = _text_cells([t], letter, [rows[i]])[0]
+        return cells
+    if pd.api.types.is_string_dtype(dtype) and (
+        dtype != object or pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty")
+    ):
+        return _text_cells(_escaped(s), letter, rows)
+    return [_python_cell(v, letter, r) for v, r in zip(s.tolist(), rows)]
+
+
+def _sample_widths(df: pd.DataFrame, headers: List[str]) -> List[float]:
+    """Ancho por columna según una muestra pareja de filas (no todo el resultado)."""
+    n = len(df)
+    sample = df.iloc[np.unique(np.linspace(0, n - 1, min(n, WIDTH_SAMPLE_ROWS)).astype(int))] if n else df
+    widths = []
+    for j, header in enumerate(headers):
+        col = sample.iloc[:, j]
+        if pd.api.types.is_datetime64_any_dtype(col.dtype):
+            longest = 19  # yyyy-mm-dd hh:mm:ss
+        else:
+            lengths = col.astype("string").str.len()
+            longest = int(lengths.max()) if lengths.notna().any() else 0
+        widths.append(float(min(MAX_WIDTH, max(MIN_WIDTH, len(header), longest) + 2)))
+    return widths
+
+
+def _chunks(frames: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    for df in frames:
+        if not len(df):
+            yield df  # sin filas, pero con las columnas (encabezado)
+        for start in range(0, len(df), CHUNK_ROWS):
+            yield df.iloc[start:start + CHUNK_ROWS]
+
+
+class XlsxStreamWriter:
+    """
+    Libro .xlsx que se escribe hoja por hoja sin guardar las filas en memoria:
+
+        with XlsxStreamWriter("salida.xlsx") as xw:
+            xw.write_frames("personal", frames)
+
+    El archivo se arma al cerrar; si algo falla antes, no se crea.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._tmp = Path(tempfile.mkdtemp(prefix="yappysa_xlsx_"))
+        self._sheets: List[tuple[str, Path]] = []  # (nombre, XML temporal)
+
+    def _sheet_name(self, base: str, part: int) -> str:
+        base = _BAD_SHEET_CHARS.sub("_", str(base)).strip("'") or "Hoja"
+        used = {name.lower() for name, _ in self._sheets}
+        n = part
+        while True:
+            suffix = "" if n == 1 else f" ({n})"
+            name = base[:SHEET_NAME_CHARS - len(suffix)] + suffix
+            if name.lower() not in used:
+                return name
+            n += 1
+
+    def _open_sheet(self, name: str, headers: List[str], widths: List[float]):
+        xml_path = self._tmp / f"sheet{len(self._sheets) + 1}.xml"
+        self._sheets.append((name, xml_path))
+        f = open(xml_path, "w", encoding="utf-8", newline="")
+        selected = ' tabSelected="1"' if len(self._sheets) == 1 else ""
+        cols = "".join(
+            f'<col min="{j}" max="{j}" width="{w:g}" customWidth="1"/>' for j, w in enumerate(widths, 1)
+        )
+        f.write(
+            f'{_XML_DECL}<worksheet {_NS} {_NS_R}>'
+            f'<sheetViews><sheetView{selected} workbookViewId="0">'
+            '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+            '</sheetView></sheetViews>'
+            '<sheetFormatPr defaultRowHeight="15"/>'
+            + (f"<cols>{cols}</cols>" if cols else "")
+            + '<sheetData>'
+        )
+        if headers:
+            header = "".join(
+                f'<c r="{_col_letter(j)}1" t="inlineStr" s="{_STYLE_HEADER}"><is><t xml:space="preserve">'
+                f'{escape(_ILLEGAL_XML_RE.sub("", h))}</t></is></c>'
+                for j, h in enumerate(headers)
+            )
+            f.write(f'<row r="1">{header}</row>')
+        return f
+
+    @staticmethod
+    def _close_sheet(f) -> None:
+        f.write('</sheetData>'
+                '<pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" header="0.3" footer="0.3"/>'
+                '</worksheet>')
+        f.close()
+
+    def write_frames(self, name: str, frames: Union[pd.DataFrame, Iterable[pd.DataFrame]]) -> int:
+        """
+        Agrega la hoja `name` con las filas de `frames` (un DataFrame o varios
+        con las mismas columnas). Pasado XLSX_MAX_ROWS sigue en "name (2)", etc.
+        Devuelve las filas escritas.
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+        chunks = _chunks(frames)
+        first = next(chunks, None)
+        if first is None:
+            self._close_sheet(self._open_sheet(self._sheet_name(name, 1), [], []))
+            return 0
+        headers = [str(c) for c in first.columns]
+        widths = _sample_widths(first, headers)
+        letters = [_col_letter(j) for j in range(len(headers))]
+
+        part, total, in_sheet = 1, 0, 0
+        f = self._open_sheet(self._sheet_name(name, part), headers, widths)
+        try:
+            for chunk in chain([first], chunks):
+                while len(chunk):
+                    if in_sheet == XLSX_MAX_ROWS:
+                        self._close_sheet(f)
+                        part, in_sheet = part + 1, 0
+                        f = self._open_sheet(self._sheet_name(name, part), headers, widths)
+                    take = chunk.iloc[:XLSX_MAX_ROWS - in_sheet]
+                    chunk = chunk.iloc[len(take):]
+                    rows = [str(r) for r in range(in_sheet + 2, in_sheet + 2 + len(take))]
+                    cols = [_column_cells(take.iloc[:, j], letters[j], rows) for j in range(take.shape[1])]
+                    starts = [f'<row r="{r}">' for r in rows]
+                    f.write("".join(chain.from_iterable(zip(starts, *cols, repeat("</row>")))))
+                    in_sheet += len(take)
+                    total += len(take)
+        finally:
+            self._close_sheet(f)
+        return total
+
+    def close(self) -> None:
+        """Arma el .xlsx con las hojas escritas y borra los temporales."""
+        if self._tmp is None:
+            return
+        try:
+            if not self._sheets:
+                self.write_frames("Sheet1", [])
+            self._package()
+        finally:
+            self._discard()
+
+    def _discard(self) -> None:
+        if self._tmp is not None:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+            self._tmp = None
+
+    def _package(self) -> None:
+        n = len(self._sheets)
+        sheets = "".join(
+            f'<sheet name={quoteattr(name)} sheetId="{i}" r:id="rId{i}"/>'
+            for i, (name, _) in enumerate(self._sheets, 1)
+        )
+        rels = "".join(
+            f'<Relationship Id="rId{i}" Type="{_REL}/worksheet" Target="worksheets/sheet{i}.xml"/>'
+            for i in range(1, n + 1)
+        )
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" ContentType="{_CT}.worksheet+xml"/>'
+            for i in range(1, n + 1)
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(self.path, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("[Content_Types].xml", _XML_DECL + (
+                '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                '<Default Extension="xml" ContentType="application/xml"/>'
+                f'<Override PartName="/xl/workbook.xml" ContentType="{_CT}.sheet.main+xml"/>'
+                f'<Override PartName="/xl/styles.xml" ContentType="{_CT}.styles+xml"/>'
+                f'{overrides}</Types>'
+            ))
+            zf.writestr("_rels/.rels", _XML_DECL + (
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                f'<Relationship Id="rId1" Type="{_REL}/officeDocument" Target="xl/workbook.xml"/>'
+                '</Relationships>'
+            ))
+            zf.writestr("xl/workbook.xml", _XML_DECL + (
+                f'<workbook {_NS} {_NS_R}><bookViews><workbookView/></bookViews>'
+                f'<sheets>{sheets}</sheets></workbook>'
+            ))
+            zf.writestr("xl/_rels/workbook.xml.rels", _XML_DECL + (
+                '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+                f'{rels}<Relationship Id="rId{n + 1}" Type="{_REL}/styles" Target="styles.xml"/>'
+                '</Relationships>'
+            ))
+            zf.writestr("xl/styles.xml", _STYLES)
+            for i, (_, xml_path) in enumerate(self._sheets, 1):
+                zf.write(xml_path, f"xl/worksheets/sheet{i}.xml")
+
+    def __enter__(self) -> "XlsxStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+
+def write_xlsx(path: str | Path, sheets: Mapping[str, Union[pd.DataFrame, Iterable[pd.DataFrame]]]) -> int:
+    """Escribe un .xlsx con una hoja (o más, si no entra) por entrada de `sheets`. Devuelve las filas."""
+    with XlsxStreamWriter(path) as xw:
+        return sum(xw.write_frames(name, frames) for name, frames in sheets.items())
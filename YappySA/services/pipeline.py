@@ -1,21 +1,40 @@
 # YappySA/services/pipeline.py
 from __future__ import annotations
+import json
+import logging
 import pandas as pd
 from sqlalchemy.exc import IntegrityError
-from YappySA.utils.data_utils import load_excel_normalized, validate_df, classify_row
-from YappySA.infra.db.session import SessionLocal
+from YappySA.core.metrics import StageTimer, peak_rss_mb
+from YappySA.core.profiling import profiled
+from YappySA.utils.data_utils import load_excel, normalize_headers, validate_df, classify_row
+from YappySA.infra.db.instrumentation import count_round_trips
+from YappySA.infra.db.session import get_engine, get_sessionmaker
 from YappySA.infra.db.repository import upsert_client_and_contacts
 from YappySA.infra.reporting.exporter import export_failed_rows
 
+log = logging.getLogger("yappysa.import")
+
+# Etapas medidas (claves de result["timings"], en orden)
+STAGES = ("load", "normalize", "validate", "classify", "dedup", "db_write", "failed_export")
+
+
+@profiled("import")
 def run_import_pipeline(path: str) -> dict:
-    df = load_excel_normalized(path)
+    timer = StageTimer()
+    with timer.stage("load"):
+        df = load_excel(path)
+    with timer.stage("normalize"):
+        df = normalize_headers(df)
 
-    errors = validate_df(df)
+    with timer.stage("validate"):
+        errors = validate_df(df)
     if errors:
         raise ValueError("Errores de validación:\n" + "\n".join(errors))
 
-    df["__class"] = df.apply(classify_row, axis=1)
+    with timer.stage("classify"):
+        df["__class"] = df.apply(classify_row, axis=1)
 
+    timer.start("dedup")
     failed: list[dict] = []
 
     p_mask = df["__class"].eq("PERSONAL")
@@ -75,14 +94,17 @@ def run_import_pipeline(path: str) -> dict:
     # Índices a omitir por validaciones "suaves"
     to_skip = set(nid[p_valid][p_dup_mask].index) | set(ruc[c_no_ruc].index) | set(ruc[c_with_ruc][c_dup_mask].index)
     df = df.drop(index=list(to_skip))
+    timer.stop("dedup")
 
     # 4) importar lo restante (aún pueden fallar por duplicados en BD)
     total = len(df) + len(to_skip)
     personal = int((df["__class"] == "PERSONAL").sum())
     commercial = int((df["__class"] == "COMMERCIAL").sum())
     inserted = 0
+    inserted_ids: list[str] = []
+    rollbacks = 0
 
-    with SessionLocal() as session:
+    with timer.stage("db_write"), count_round_trips(get_engine()) as trips, get_sessionmaker()() as session:
         for i, row in df.iterrows():
             kind = row["__class"]
 
@@ -99,8 +121,9 @@ def run_import_pipeline(path: str) -> dict:
 
             try:
                 with session.begin():
-                    upsert_client_and_contacts(session, dto, kind)
+                    client_id = upsert_client_and_contacts(session, dto, kind)
                 inserted += 1
+                inserted_ids.append(str(client_id))
             except Exception as e:
                 failed.append({
                     "row_number_excel": int(i) + 2,
@@ -115,8 +138,23 @@ def run_import_pipeline(path: str) -> dict:
                     "alias": dto.alias,
                 })
                 session.rollback()
+                rollbacks += 1
 
-    failed_path = export_failed_rows(failed)
+    with timer.stage("failed_export"):
+        failed_path = export_failed_rows(failed)
+
+    wall = timer.elapsed
+    stats = {
+        "timings": timer.as_dict(),              # {etapa: {wall_s, cpu_s}}
+        "wall_s": round(wall, 3),
+        "rows_per_s": round(total / wall, 1) if wall > 0 else None,
+        "db_round_trips": trips["statements"],
+        "rollbacks": rollbacks,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    log.info("import %s", json.dumps({
+        "file": str(path), "total": total, "inserted": inserted, "skipped": len(failed), **stats,
+    }, ensure_ascii=False))
 
     return {
         "total": total,
@@ -124,5 +162,7 @@ def run_import_pipeline(path: str) -> dict:
         "commercial": commercial,
         "inserted": inserted,
         "skipped": len(failed),
-        "failed_csv": failed_path
+        "failed_csv": failed_path,
+        "inserted_ids": inserted_ids,  # en orden de inserción (para refrescar la vista)
+        **stats,
     }
@@ -0,0 +1,337 @@
+"""
+Benchmark de punta a punta: importación, consulta, exportación y PDF.
+
+Uso:
+  python -m YappySA.tools.bench run                              # 1k, 100k y 1m filas
+  python -m YappySA.tools.bench run --sizes 1k,100k --repeat 5
+  python -m YappySA.tools.bench run --baseline outputs/bench/base.json
+  python -m YappySA.tools.bench compare outputs/bench/nuevo.json outputs/bench/base.json
+
+Corre en local sin SQL Server: cada tamaño usa un archivo SQLite nuevo
+(ver dialects.py) con datos de YappySA.utils.synthetic, y el PDF se
+genera con Qt en modo offscreen. Cada etapa corre en su propio proceso
+para que el pico de memoria (RSS) sea el de esa etapa.
+
+Etapas:
+  import       run_import_pipeline sobre un .xlsx generado (BD vacía en cada corrida)
+  query        query_clients_filtered de todos los clientes (sin límite)
+  export_csv   export_dataframe(..., "csv") del resultado
+  export_xlsx  export_dataframe(..., "xlsx") del resultado
+  export_parquet  export_dataframe(..., "parquet") del resultado (zstd)
+  pdf          export_table_to_pdf de las primeras --pdf-rows filas
+
+Resultados en outputs/bench/bench_YYYYmmdd_HHMMSS.json: por etapa y
+tamaño del conjunto (size; rows = filas que procesó la etapa), los tiempos
+de cada corrida, p50, p95, filas/s y pico de RSS.
+Con --baseline (o `compare`) se marca como regresión todo p50 que
+empeore más de --threshold; en ese caso devuelve 1.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from YappySA.core.metrics import peak_rss_mb
+
+ROOT = Path(__file__).resolve().parents[2]
+OUT_DIR = ROOT / "outputs" / "bench"
+STAGES = ("import", "query", "export_csv", "export_xlsx", "export_parquet", "pdf")
+_SEED = 20240601
+
+
+# -------------------------------------------------
+# Utilidades
+# -------------------------------------------------
+def parse_size(text: str) -> int:
+    """'1k' → 1000, '100k' → 100000, '1m' → 1000000."""
+    t = text.strip().lower()
+    mult = {"k": 1_000, "m": 1_000_000}.get(t[-1:], 1)
+    return int(float(t[:-1] if mult > 1 else t) * mult)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Percentil pct (0..100) con interpolación lineal."""
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def _summary(stage: str, rows: int, runs: list[float]) -> dict:
+    p50 = percentile(runs, 50)
+    return {
+        "stage": stage,
+        "rows": rows,
+        "runs": [round(r, 4) for r in runs],
+        "p50": round(p50, 4),
+        "p95": round(percentile(runs, 95), 4),
+        "rows_per_s": round(rows / p50, 1) if p50 > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _use_sqlite(db: Path, fresh: bool = False):
+    from YappySA.core.settings import Settings, override_settings
+    from YappySA.infra.db import migrations, session
+
+    override_settings(Settings.model_construct())
+    if fresh and db.exists():
+        db.unlink()
+    session.use_engine(f"sqlite:///{db}")
+    if fresh:
+        migrations.create_schema(session.get_engine())
+        migrations.ensure_indexes(session.get_engine())
+
+
+def _load_all():
+    from YappySA.infra.db.queries import query_clients_filtered
+    return query_clients_filtered(kinds=["PERSONAL", "COMMERCIAL"], limit=None, source="primary")
+
+
+# -------------------------------------------------
+# Etapas (cada una corre en un proceso hijo: `bench stage ...`)
+# -------------------------------------------------
+def stage_import(args) -> dict:
+    from YappySA.services.pipeline import run_import_pipeline
+
+    runs = []
+    for _ in range(args.repeat):
+        _use_sqlite(args.db, fresh=True)
+        t0 = time.perf_counter()
+        res = run_import_pipeline(str(args.input))
+        runs.append(time.perf_counter() - t0)
+    out = _summary("import", args.rows, runs)
+    out["inserted"] = res["inserted"]
+    return out
+
+
+def stage_query(args) -> dict:
+    _use_sqlite(args.db)
+    runs, rows = [], 0
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        rows = len(_load_all())
+        runs.append(time.perf_counter() - t0)
+    return _summary("query", rows, runs)
+
+
+def _stage_export(args, fmt: str) -> dict:
+    from YappySA.infra.reporting.exporter import export_dataframe
+
+    _use_sqlite(args.db)
+    df = _load_all()
+    target = args.db.with_name(f"export_{args.rows}.{fmt}")
+    runs = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        export_dataframe(df, str(target), fmt)
+        runs.append(time.perf_counter() - t0)
+    out = _summary(f"export_{fmt}", len(df), runs)
+    out["bytes"] = target.stat().st_size
+    return out
+
+
+def stage_pdf(args) -> dict:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication, QTableView
+
+    from YappySA.ui.desktop_pyside.pdf_utils import export_table_to_pdf
+    from YappySA.ui.desktop_pyside.table_model import PandasModel
+
+    _use_sqlite(args.db)
+    df = _load_all().head(args.pdf_rows)
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    table = QTableView()
+    table.setModel(PandasModel(df))
+    target = args.db.with_name(f"view_{args.rows}.pdf")
+    runs = []
+    for _ in range(args.repeat):
+        t0 = time.perf_counter()
+        pages = export_table_to_pdf(table, str(target), "Benchmark")
+        runs.append(time.perf_counter() - t0)
+    out = _summary("pdf", len(df), runs)
+    out["bytes"] = target.stat().st_size
+    out["pages"] = pages
+    return out
+
+
+_STAGE_FNS = {
+    "import": stage_import,
+    "query": stage_query,
+    "export_csv": lambda a: _stage_export(a, "csv"),
+    "export_xlsx": lambda a: _stage_export(a, "xlsx"),
+    "export_parquet": lambda a: _stage_export(a, "parquet"),
+    "pdf": stage_pdf,
+}
+
+
+def cmd_stage(args) -> int:
+    args.db = Path(args.db)
+    args.input = Path(args.input) if args.input else None
+    print(json.dumps(_STAGE_FNS[args.name](args)))
+    return 0
+
+
+def _run_child(name: str, rows: int, db: Path, input_path: Path, repeat: int, pdf_rows: int) -> dict:
+    cmd = [
+        sys.executable, "-m", "YappySA.tools.bench", "stage", name,
+        "--db", str(db), "--input", str(input_path), "--rows", str(rows),
+        "--repeat", str(repeat), "--pdf-rows", str(pdf_rows),
+    ]
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(ROOT), env.get("PYTHONPATH")) if p)
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"La etapa {name} ({rows} filas) falló:\n{proc.stderr[-3000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+# -------------------------------------------------
+# Comparación con una línea base
+# -------------------------------------------------
+def compare(current: dict, baseline: dict, threshold: float) -> list[dict]:
+    """Filas {stage, size, base, now, change, regression} por cada etapa en ambos archivos."""
+    base = {(r["stage"], r["size"]): r for r in baseline.get("results", [])}
+    out = []
+    for r in current.get("results", []):
+        b = base.get((r["stage"], r["size"]))
+        if b is None or not b.get("p50"):
+            continue
+        change = r["p50"] / b["p50"] - 1
+        out.append({
+            "stage": r["stage"], "size": r["size"], "base": b["p50"], "now": r["p50"],
+            "change": round(change, 3), "regression": change > threshold,
+        })
+    return out
+
+
+def _print_comparison(rows: list[dict], threshold: float) -> int:
+    print(f"\n== Contra la línea base (umbral +{threshold:.0%}) ==")
+    for c in rows:
+        flag = "!! REGRESIÓN" if c["regression"] else ""
+        print(f"  {c['stage']:<15}{c['size']:>9}  {c['base']:>9.3f}s → {c['now']:>9.3f}s  {c['change']:+7.1%}  {flag}")
+    regressions = sum(c["regression"] for c in rows)
+    print(f"Regresiones: {regressions}")
+    return 1 if regressions else 0
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+# -------------------------------------------------
+# Comandos
+# -------------------------------------------------
+def cmd_run(args) -> int:
+    from YappySA.utils.synthetic import generate_clients, write_clients
+
+    sizes = [parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    stages = [s.strip() for s in args.stages.split(",") if s.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        print(f"Etapas desconocidas: {', '.join(sorted(unknown))} (válidas: {', '.join(STAGES)})")
+        return 2
+
+    work = Path(tempfile.mkdtemp(prefix="yappysa_bench_"))
+    report = {
+        "meta": {
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "pdf_rows": args.pdf_rows,
+        },
+        "results": [],
+    }
+    try:
+        for n in sizes:
+            input_path = work / f"clients_{n}.xlsx"
+            db = work / f"bench_{n}.db"
+            print(f"\n== {n} filas ==")
+            write_clients(generate_clients(n, seed=_SEED), input_path)
+            if "import" not in stages:
+                # Las otras etapas necesitan la BD cargada: se importa sin medir
+                _run_child("import", n, db, input_path, 1, args.pdf_rows)
+            for name in stages:
+                repeat = args.import_repeat if name == "import" else args.repeat
+                res = _run_child(name, n, db, input_path, repeat, args.pdf_rows)
+                res["size"] = n  # filas del conjunto (rows = filas procesadas en la etapa)
+                report["results"].append(res)
+                print(f"  {name:<15} p50 {res['p50']:>9.3f}s  p95 {res['p95']:>9.3f}s  "
+                      f"{res['rows_per_s'] or 0:>11,.0f} filas/s  RSS {res['peak_rss_mb']} MB")
+    finally:
+        if args.keep:
+            print(f"\nArchivos de trabajo: {work}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+
+    out = Path(args.out) if args.out else OUT_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResultados: {out}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        return _print_comparison(compare(report, baseline, args.threshold), args.threshold)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    current = json.loads(Path(args.current).read_text(encoding="utf-8"))
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+    return _print_comparison(compare(current, baseline, args.threshold), args.threshold)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de importación, consulta, exportación y PDF")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("run", help="corre el benchmark y guarda el JSON")
+    r.add_argument("--sizes", default="1k,100k,1m", help="tamaños separados por coma (1k, 100k, 1m...)")
+    r.add_argument("--stages", default=",".join(STAGES), help="etapas separadas por coma")
+    r.add_argument("--repeat", type=int, default=3, help="corridas por etapa (query/export/pdf)")
+    r.add_argument("--import-repeat", type=int, default=1, help="corridas de la importación")
+    r.add_argument("--pdf-rows", type=int, default=2000, help="filas máximas en el PDF")
+    r.add_argument("--out", help="archivo JSON de salida")
+    r.add_argument("--baseline", help="JSON anterior para comparar")
+    r.add_argument("--threshold", type=float, default=0.15, help="empeoramiento tolerado del p50 (0.15 = 15%%)")
+    r.add_argument("--keep", action="store_true", help="no borrar los archivos de trabajo")
+    r.set_defaults(fn=cmd_run)
+
+    c = sub.add_parser("compare", help="compara dos JSON de resultados")
+    c.add_argument("current")
+    c.add_argument("baseline")
+    c.add_argument("--threshold", type=float, default=0.15)
+    c.set_defaults(fn=cmd_compare)
+
+    s = sub.add_parser("stage", help=argparse.SUPPRESS)  # uso interno: una etapa en un proceso hijo
+    s.add_argument("name", choices=STAGES)
+    s.add_argument("--db", required=True)
+    s.add_argument("--input")
+    s.add_argument("--rows", type=int, required=True)
+    s.add_argument("--repeat", type=int, default=1)
+    s.add_argument("--pdf-rows", type=int, default=2000)
+    s.set_defaults(fn=cmd_stage)
+
+    args = parser.parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
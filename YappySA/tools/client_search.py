@@ -0,0 +1,224 @@
+"""
+Mantenimiento de la tabla desnormalizada client_search.
+
+Uso:
+  python -m YappySA.tools.client_search create
+  python -m YappySA.tools.client_search rebuild
+  python -m YappySA.tools.client_search check
+  python -m YappySA.tools.client_search bench [--seed 1000000] [--repeat 5] [--cleanup] [--url URL]
+  python -m YappySA.tools.client_search tokens              # reconstruye client_token
+  python -m YappySA.tools.client_search search "texto"      # búsqueda parcial (con tiempo)
+
+`bench --seed N` inserta N clientes sintéticos (YappySA.utils.synthetic, con
+national_id / RUC con prefijo SYN-) en la base configurada o en --url (SQL
+Server o SQLite, ver dialects.py); `--cleanup` los borra al terminar.
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import text
+
+from YappySA.core.settings import Settings, get_settings, override_settings
+from YappySA.infra.db import client_search, migrations, search_index, session
+from YappySA.infra.db.dialects import dialect_of
+from YappySA.infra.db.queries import fetch_recent_clients, query_clients_filtered, search_clients
+from YappySA.infra.db.session import get_engine
+
+SYN_PREFIX = "SYN-"
+_SEED = 20240601
+_SEED_BATCH = 10_000   # filas por executemany al sembrar
+_DELETE_BATCH = 1_000  # client_id por DELETE ... IN (SQL Server admite ~2100 parámetros)
+
+# INSERT sin funciones propias de un motor: los client_id se generan aquí
+_SEED_SQL = {
+    "client": "INSERT INTO client (client_id, client_type) VALUES (:cid, :kind)",
+    "personal_client": (
+        "INSERT INTO personal_client (client_id, full_name, national_id) VALUES (:cid, :name, :nid)"
+    ),
+    "commercial_client": (
+        "INSERT INTO commercial_client (client_id, company_name, representative, ruc) "
+        "VALUES (:cid, :company, :name, :ruc)"
+    ),
+    "contact_info": (
+        "INSERT INTO contact_info (client_id, email, phone, alias) VALUES (:cid, :email, :phone, :alias)"
+    ),
+}
+_CLEANUP_TABLES = ("client_search", "contact_info", "personal_client", "commercial_client", "client")
+
+
+def _seed(engine, n: int, tag: str) -> list[str]:
+    """Inserta n clientes sintéticos; devuelve sus client_id."""
+    from YappySA.utils.synthetic import generate_clients
+
+    df = generate_clients(n, seed=_SEED)
+    df = df.astype(object).where(df.notna(), None)
+    df["national_id"] = df["national_id"].map(lambda v: v and tag + v)
+    df["ruc"] = df["ruc"].map(lambda v: v and tag + v)
+    ids = [str(uuid.uuid4()).upper() for _ in range(n)]  # mismo formato que NEWID()
+
+    rows = {table: [] for table in _SEED_SQL}
+    for cid, r in zip(ids, df.itertuples(index=False)):
+        rows["client"].append({"cid": cid, "kind": r.client_type})
+        if r.client_type == "COMMERCIAL":
+            rows["commercial_client"].append({"cid": cid, "company": r.company_name, "name": r.name, "ruc": r.ruc})
+        else:
+            rows["personal_client"].append({"cid": cid, "name": r.name, "nid": r.national_id})
+        rows["contact_info"].append({"cid": cid, "email": r.email, "phone": r.phone, "alias": r.alias})
+
+    with engine.begin() as conn:
+        for table, sql in _SEED_SQL.items():
+            batch = rows[table]
+            for start in range(0, len(batch), _SEED_BATCH):
+                conn.execute(text(sql), batch[start:start + _SEED_BATCH])
+    return ids
+
+
+def _cleanup(engine, ids: list[str]) -> None:
+    with engine.begin() as conn:
+        for start in range(0, len(ids), _DELETE_BATCH):
+            params = {f"id_{i}": cid for i, cid in enumerate(ids[start:start + _DELETE_BATCH])}
+            holders = ", ".join(f":{k}" for k in params)
+            for table in _CLEANUP_TABLES:
+                conn.execute(text(f"DELETE FROM {table} WHERE client_id IN ({holders})"), params)
+
+
+def cmd_create(_args) -> int:
+    with get_engine().begin() as conn:
+        client_search.create_table(conn)
+    print("client_search lista.")
+    return 0
+
+
+def cmd_rebuild(_args) -> int:
+    t0 = time.perf_counter()
+    with get_engine().begin() as conn:
+        client_search.create_table(conn)
+        n = client_search.rebuild(conn)
+    print(f"client_search reconstruida: {n} filas en {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+def cmd_check(_args) -> int:
+    with get_engine().connect() as conn:
+        res = client_search.check_consistency(conn)
+    print(f"Faltantes: {res['missing']}  Huérfanas: {res['orphans']}  Distintas: {res['mismatch']}")
+    print("OK" if res["ok"] else "INCONSISTENTE (ejecuta 'rebuild')")
+    return 0 if res["ok"] else 1
+
+
+def _time(fn, repeat: int) -> tuple[float, float]:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(samples), max(samples)
+
+
+def cmd_bench(args) -> int:
+    if args.url:
+        # Otra base (p. ej. SQLite local): settings por defecto y esquema si falta
+        override_settings(Settings.model_construct())
+        session.use_engine(args.url)
+        migrations.create_schema(get_engine())
+        migrations.ensure_indexes(get_engine())
+    engine = get_engine()
+
+    ids = []
+    if args.seed:
+        t0 = time.perf_counter()
+        ids = _seed(engine, args.seed, f"{SYN_PREFIX}{int(time.time())}-")
+        print(f"{args.seed} clientes sintéticos insertados en {time.perf_counter() - t0:.1f}s")
+
+    with engine.begin() as conn:
+        client_search.create_table(conn)
+        client_search.rebuild(conn)
+
+    with engine.connect() as conn:
+        sample = conn.execute(
+            text(
+                "SELECT national_id FROM personal_client WHERE national_id IS NOT NULL\n"
+                "ORDER BY national_id " + dialect_of(conn).first_rows
+            ),
+            {"n": 1},
+        ).scalar()
+
+    shapes = {
+        "recientes (100)": lambda: fetch_recent_clients(limit=100),
+        "filtro tipos (200)": lambda: query_clients_filtered(kinds=["PERSONAL", "COMMERCIAL"], limit=200),
+        "filtro cédula": lambda: query_clients_filtered(kinds=["PERSONAL"], national_id=sample, limit=200),
+        "export COMMERCIAL": lambda: query_clients_filtered(kinds=["COMMERCIAL"], limit=None),
+    }
+
+    # Cada ruta con sus propios settings; al final se restauran los originales
+    original = get_settings()
+    paths = {
+        flag: original.model_copy(update={"CLIENT_SEARCH_ENABLED": flag}) for flag in (False, True)
+    }
+    try:
+        print(f"{'consulta':<22}{'joins p50/max (ms)':>22}{'client_search p50/max (ms)':>30}")
+        for name, fn in shapes.items():
+            override_settings(paths[False])
+            j50, jmax = _time(fn, args.repeat)
+            override_settings(paths[True])
+            s50, smax = _time(fn, args.repeat)
+            print(f"{name:<22}{j50:>13.1f} / {jmax:<8.1f}{s50:>19.1f} / {smax:<8.1f}")
+    finally:
+        override_settings(original)
+
+    if ids and args.cleanup:
+        _cleanup(engine, ids)
+        print("Clientes sintéticos eliminados.")
+    return 0
+
+
+def cmd_tokens(_args) -> int:
+    t0 = time.perf_counter()
+    with get_engine().begin() as conn:
+        search_index.create_table(conn)
+        n = search_index.rebuild(conn)
+    print(f"client_token reconstruida: {n} clientes indexados en {time.perf_counter() - t0:.1f}s")
+    return 0
+
+
+def cmd_search(args) -> int:
+    t0 = time.perf_counter()
+    df = search_clients(args.text, limit=args.limit)
+    ms = (time.perf_counter() - t0) * 1000
+    if not df.empty:
+        print(df[["score", "display_name", "email", "alias", "phone"]].to_string(index=False))
+    print(f"{len(df)} resultado(s) en {ms:.1f} ms")
+    if df.attrs.get("truncated"):
+        print("Búsqueda muy amplia: solo se revisaron los mejores candidatos.")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Mantenimiento de client_search")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("create", help="crea la tabla si no existe").set_defaults(fn=cmd_create)
+    sub.add_parser("rebuild", help="reconstruye la tabla completa").set_defaults(fn=cmd_rebuild)
+    sub.add_parser("check", help="verifica la consistencia").set_defaults(fn=cmd_check)
+    b = sub.add_parser("bench", help="compara joins vs client_search")
+    b.add_argument("--seed", type=int, default=0, help="clientes sintéticos a insertar antes de medir")
+    b.add_argument("--repeat", type=int, default=5)
+    b.add_argument("--cleanup", action="store_true", help="borrar los sintéticos al terminar")
+    b.add_argument("--url", help="URL SQLAlchemy de otra base (p. ej. sqlite:///outputs/bench.db)")
+    b.set_defaults(fn=cmd_bench)
+    sub.add_parser("tokens", help="reconstruye el índice de trigramas").set_defaults(fn=cmd_tokens)
+    q = sub.add_parser("search", help="búsqueda parcial por nombre/email/alias/teléfono")
+    q.add_argument("text")
+    q.add_argument("--limit", type=int, default=20)
+    q.set_defaults(fn=cmd_search)
+
+    args = parser.parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Diagnóstico de índices y planes de ejecución de las consultas de clientes.
+
+Uso:
+  python -m YappySA.tools.db_diagnostics                        # base configurada (.env)
+  python -m YappySA.tools.db_diagnostics --url sqlite:///local.db --create-schema
+  python -m YappySA.tools.db_diagnostics --ensure-indexes
+
+Para cada forma de consulta de queries.py captura el plan
+(SHOWPLAN_XML en SQL Server, EXPLAIN QUERY PLAN en SQLite) y marca los
+recorridos completos de tabla y los planes que no usan el índice esperado
+para esa forma. Devuelve 1 si alguno queda marcado.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from YappySA.infra.db import migrations
+from YappySA.infra.db.queries import build_filtered_query, build_recent_query
+
+_BOTH = ["PERSONAL", "COMMERCIAL"]
+_SHOWPLAN_NS = "{http://schemas.microsoft.com/sqlserver/2004/07/showplan}"
+
+# Formas de consulta que genera la aplicación (valores de ejemplo: el plan no depende de que existan)
+SHAPES = {
+    "últimas 100": lambda d: build_recent_query(100, d),
+    "tipos": lambda d: build_filtered_query(kinds=_BOTH, limit=200, dialect_name=d),
+    "tipo + fecha desde": lambda d: build_filtered_query(
+        kinds=["PERSONAL"], since_date=datetime.now() - timedelta(days=30), limit=200, dialect_name=d),
+    "uuid": lambda d: build_filtered_query(
+        kinds=_BOTH, uuid="00000000-0000-0000-0000-000000000000", limit=200, dialect_name=d),
+    "cédula": lambda d: build_filtered_query(
+        kinds=_BOTH, national_id=["8-000-0000", "8-000-0001"], limit=200, dialect_name=d),
+    "ruc": lambda d: build_filtered_query(kinds=["COMMERCIAL"], ruc="000000-0-000000", limit=200, dialect_name=d),
+    "exportar (sin límite)": lambda d: build_filtered_query(kinds=_BOTH, limit=None, dialect_name=d),
+}
+# Exportar todo recorre la tabla por definición; se informa pero no se cuenta
+_SCAN_EXPECTED = {"exportar (sin límite)"}
+
+# Índice(s) que el plan de cada forma debe usar: sobre las tablas o sobre
+# client_search (CLIENT_SEARCH_ENABLED). En SQL Server la PK de client_search
+# no tiene nombre fijo ("PK__client_s__...").
+EXPECTED_INDEXES = {
+    "últimas 100": ("ix_client_created_at", "cx_client_search_created"),
+    "tipos": ("ix_client_type_created_at", "ix_client_created_at", "cx_client_search_created"),
+    "tipo + fecha desde": ("ix_client_type_created_at", "cx_client_search_created"),
+    "uuid": ("pk_client", "sqlite_autoindex_client_1", "pk__client_s", "sqlite_autoindex_client_search_1"),
+    "cédula": ("ux_personal_client_national_id", "ix_client_search_nid"),
+    "ruc": ("ux_commercial_client_ruc", "ix_client_search_ruc"),
+}
+
+
+# Índices de rango sobre client: en las formas por clave no deben guiar el plan
+# (recorrerían todos los clientes del tipo y filtrarían después)
+_RANGE_INDEXES = ("ix_client_type_created_at", "ix_client_created_at")
+_KEY_SHAPES = {"uuid", "cédula", "ruc"}
+
+
+def index_flags(name: str, lines: list[str]) -> list[str]:
+    """Advertencias si el plan de la forma `name` no va por su índice esperado."""
+    expected = EXPECTED_INDEXES.get(name)
+    if not expected:
+        return []
+    flags = []
+    plain = [line.lower().replace("[", "").replace("]", "") for line in lines]
+    if not any(ix in line for line in plain for ix in expected):
+        flags.append(f"SIN ÍNDICE ESPERADO: no usa {' / '.join(expected)}")
+    if name in _KEY_SHAPES:
+        for line, original in zip(plain, lines):
+            if any(ix in line for ix in _RANGE_INDEXES) and "lookup" not in line:
+                flags.append(f"SIN ÍNDICE ESPERADO: recorre client por tipo/fecha: {original}")
+    return flags
+
+
+def _plan_sqlite(conn, sql: str, params: dict) -> tuple[list[str], list[str]]:
+    rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql.strip().rstrip(";")), params).fetchall()
+    lines, flags = [], []
+    for row in rows:
+        detail = str(row[-1])
+        lines.append(detail)
+        if detail.startswith("SCAN ") and "USING" not in detail:
+            flags.append(f"SCAN: {detail}")
+        elif "TEMP B-TREE" in detail:
+            flags.append(f"ORDENAMIENTO: {detail}")
+    return lines, flags
+
+
+def _plan_mssql(conn, sql: str, params: dict) -> tuple[list[str], list[str]]:
+    conn.exec_driver_sql("SET SHOWPLAN_XML ON")
+    try:
+        plan_xml = conn.execute(text(sql), params).scalar()
+    finally:
+        conn.exec_driver_sql("SET SHOWPLAN_XML OFF")
+
+    lines, flags = [], []
+    root = ET.fromstring(plan_xml)
+    for op in root.iter(f"{_SHOWPLAN_NS}RelOp"):
+        phys = op.get("PhysicalOp", "")
+        obj = op.find(f"./*/{_SHOWPLAN_NS}Object")
+        target = ""
+        if obj is not None:
+            target = f" {obj.get('Table', '')}{'.' + obj.get('Index') if obj.get('Index') else ''}"
+        detail = f"{phys}{target} (~{float(op.get('EstimateRows', 0)):.0f} filas)"
+        lines.append(detail)
+        if phys in ("Table Scan", "Clustered Index Scan"):
+            flags.append(f"SCAN: {detail}")
+        elif phys == "Sort":
+            flags.append(f"ORDENAMIENTO: {detail}")
+    return lines, flags
+
+
+def capture_plan(conn, sql: str, params: dict) -> tuple[list[str], list[str]]:
+    """Devuelve (líneas del plan, advertencias) para el motor de la conexión."""
+    if conn.dialect.name == "mssql":
+        return _plan_mssql(conn, sql, params)
+    return _plan_sqlite(conn, sql, params)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Índices y planes de las consultas de clientes")
+    parser.add_argument("--url", help="URL SQLAlchemy (por defecto, la de settings)")
+    parser.add_argument("--create-schema", action="store_true", help="crear las tablas si no existen")
+    parser.add_argument("--ensure-indexes", action="store_true", help="crear los índices faltantes")
+    args = parser.parse_args(argv)
+
+    if args.url:
+        from YappySA.infra.db.session import make_engine
+        engine = make_engine(args.url)
+    else:
+        from YappySA.infra.db.session import engine
+
+    if args.create_schema:
+        migrations.create_schema(engine)
+    if args.ensure_indexes:
+        created = migrations.ensure_indexes(engine)
+        print(f"Índices creados: {', '.join(created) if created else '(ninguno)'}")
+
+    print(f"== Índices ({engine.dialect.name}) ==")
+    for r in migrations.validate_indexes(engine):
+        extra = f" (como {r['matched_by']})" if r["matched_by"] and r["matched_by"] != r["name"] else ""
+        print(f"  [{r['status']:>8}] {r['table']}.{r['name']}{extra} – {r['reason']}")
+
+    flagged = 0
+    with engine.connect() as conn:
+        for name, build in SHAPES.items():
+            sql, params = build(engine.dialect.name)
+            lines, flags = capture_plan(conn, sql, params)
+            flags.extend(index_flags(name, lines))
+            print(f"\n== {name} ==")
+            for line in lines:
+                print(f"  {line}")
+            for flag in flags:
+                print(f"  !! {flag}")
+            if name not in _SCAN_EXPECTED:
+                flagged += any(f.startswith(("SCAN", "SIN ÍNDICE")) for f in flags)
+
+    print(f"\nConsultas con recorridos completos o sin su índice: "
+          f"{flagged} de {len(SHAPES) - len(_SCAN_EXPECTED)}")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
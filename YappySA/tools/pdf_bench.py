@@ -0,0 +1,114 @@
+"""
+Mide la preparación de datos del PDF, sin dibujar: textos de las celdas,
+cortes de línea y paginado.
+
+Uso:
+  python -m YappySA.tools.pdf_bench                     # 50k filas
+  python -m YappySA.tools.pdf_bench --rows 200k --repeat 5
+  python -m YappySA.tools.pdf_bench --legacy            # celda a celda (antes)
+  python -m YappySA.tools.pdf_bench --draw              # además, el PDF completo
+
+Arma el mismo DataFrame que table_bench (forma de query_clients_filtered)
+y mide por separado:
+  textos    frame_blocks: columnas a texto de a ROW_CHUNK filas
+  cortes    page_sizes: cortes de línea por columna (numpy, caché por
+            valor) y reparto en páginas por alto de fila
+--legacy hace lo mismo fila por fila y celda por celda (tolist + str y
+wrap() de cada celda), como antes, para comparar.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from YappySA.tools.bench import parse_size
+from YappySA.tools.table_bench import build_frame
+
+
+def _renderer(headers):
+    from PySide6.QtCore import QBuffer, QIODevice
+
+    from YappySA.infra.reporting.pdf_render import DEFAULT_TITLE, _pdf_writer, _TableRenderer
+
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    writer, content = _pdf_writer(buffer)
+    return _TableRenderer(writer, headers, DEFAULT_TITLE, content), (buffer, writer)
+
+
+def legacy_pages(df, headers) -> int:
+    """Textos y cortes celda a celda; paginado como paginate()."""
+    from YappySA.infra.reporting.pdf_render import ROW_CHUNK
+
+    renderer, _keep = _renderer(headers)
+    pages, used = 1, 0.0
+    for start in range(0, len(df), ROW_CHUNK):
+        block = df.iloc[start:start + ROW_CHUNK]
+        cols = [block.iloc[:, c].tolist() for c in range(block.shape[1])]
+        for row in zip(*cols):
+            cells = [renderer.wrap("" if v is None else str(v), c) for c, v in enumerate(row)]
+            h = renderer._row_height(n for _, n in cells)
+            if used and used + h > renderer.body_budget:
+                pages, used = pages + 1, 0.0
+            used += h
+    return pages
+
+
+def measure(df, headers, legacy: bool) -> dict:
+    from YappySA.infra.reporting.pdf_render import frame_blocks, page_sizes
+
+    if legacy:
+        t0 = time.perf_counter()
+        pages = legacy_pages(df, headers)
+        return {"textos": None, "cortes": None, "total": time.perf_counter() - t0, "pages": pages}
+    t0 = time.perf_counter()
+    blocks = list(frame_blocks(df))
+    t1 = time.perf_counter()
+    pages = sum(1 for _ in page_sizes(headers, blocks))
+    t2 = time.perf_counter()
+    return {"textos": t1 - t0, "cortes": t2 - t1, "total": t2 - t0, "pages": pages}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Preparación de datos del PDF (textos, cortes, paginado)")
+    parser.add_argument("--rows", type=parse_size, default=50_000, help="filas (admite 50k, 1m)")
+    parser.add_argument("--repeat", type=int, default=3, help="repeticiones (se informa la mejor)")
+    parser.add_argument("--legacy", action="store_true", help="celda a celda (para comparar)")
+    parser.add_argument("--draw", action="store_true", help="además, el PDF completo (render_pdf)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from YappySA.infra.reporting.pdf_render import ensure_gui_app, frame_blocks, render_pdf
+
+    ensure_gui_app()
+    t0 = time.perf_counter()
+    df = build_frame(args.rows)
+    headers = [str(c) for c in df.columns]
+    print(f"{len(df):,} filas generadas en {time.perf_counter() - t0:.2f}s")
+
+    label = "legacy" if args.legacy else "columnas"
+    best = min((measure(df, headers, args.legacy) for _ in range(args.repeat)), key=lambda r: r["total"])
+    parts = "" if best["textos"] is None else (
+        f"textos {best['textos'] * 1000:7.1f} ms  cortes {best['cortes'] * 1000:7.1f} ms  "
+    )
+    print(
+        f"preparación ({label}): {parts}total {best['total'] * 1000:7.1f} ms  ·  "
+        f"{len(df) / best['total']:,.0f} filas/s  ·  {best['pages']:,} páginas"
+    )
+
+    if args.draw:
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "bench.pdf"
+            t0 = time.perf_counter()
+            pages = render_pdf(str(target), headers, frame_blocks(df), "Benchmark")
+            print(f"PDF completo: {time.perf_counter() - t0:.2f}s  ·  {pages:,} páginas  ·  "
+                  f"{target.stat().st_size / 2**20:.1f} MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
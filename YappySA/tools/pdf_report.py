@@ -0,0 +1,77 @@
+"""
+Reporte PDF de clientes sin abrir la GUI (para tareas programadas).
+
+Uso:
+  python -m YappySA.tools.pdf_report --out reporte.pdf
+  python -m YappySA.tools.pdf_report --out semana.pdf --since 2024-06-01 --kinds PERSONAL
+  python -m YappySA.tools.pdf_report --out todo.pdf --workers 4
+  python -m YappySA.tools.pdf_report --out archivo.pdf --input clientes.xlsx
+
+Sin --input corre la consulta de 'Consultar / Exportar' (query_clients_filtered,
+sin límite). Un resultado de más de SPILL_ROWS filas va a un archivo Arrow
+temporal y el PDF se dibuja leyendo de ahí. --workers reparte las páginas
+entre procesos (requiere pypdf para unirlas; sin él usa uno solo).
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+
+def _load_input(path: str):
+    import pandas as pd
+
+    if path.lower().endswith((".xlsx", ".xls")):
+        return pd.read_excel(path, dtype=str)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Reporte PDF de clientes (sin GUI)")
+    parser.add_argument("--out", required=True, help="archivo PDF de salida")
+    parser.add_argument("--title", help="título del reporte")
+    parser.add_argument("--kinds", nargs="+", default=["PERSONAL", "COMMERCIAL"],
+                        choices=["PERSONAL", "COMMERCIAL"], help="tipos de cliente")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="fecha desde (AAAA-MM-DD)")
+    parser.add_argument("--source", default="auto", choices=["auto", "primary", "local"],
+                        help="de dónde leer (ver query_clients_filtered)")
+    parser.add_argument("--input", help="CSV/XLSX a imprimir en lugar de la consulta")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="procesos que dibujan páginas (por defecto, uno por núcleo)")
+    args = parser.parse_args(argv)
+
+    from YappySA.infra.db.spill import SpilledResult
+    from YappySA.infra.reporting.pdf_report import export_dataframe_pdf, export_spilled_pdf
+
+    t0 = time.perf_counter()
+    if args.input:
+        result = _load_input(args.input)
+    else:
+        from YappySA.core.settings import get_settings
+        from YappySA.infra.db.queries import query_clients_filtered
+
+        result = query_clients_filtered(
+            kinds=args.kinds, since_date=args.since, limit=None, source=args.source,
+            spill_rows=get_settings().SPILL_ROWS,
+        )
+    rows = len(result)
+    print(f"{rows:,} filas leídas en {time.perf_counter() - t0:.2f}s")
+
+    t0 = time.perf_counter()
+    try:
+        if isinstance(result, SpilledResult):
+            pages = export_spilled_pdf(result, args.out, args.title, workers=args.workers)
+        else:
+            pages = export_dataframe_pdf(result, args.out, args.title, workers=args.workers)
+    finally:
+        if isinstance(result, SpilledResult):
+            result.close()
+    print(f"{args.out}: {pages} páginas en {time.perf_counter() - t0:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Réplica local (SQLite) de la vista de clientes.
+
+Uso:
+  python -m YappySA.tools.replica refresh          # incremental (marca de agua created_at)
+  python -m YappySA.tools.replica refresh --full   # reconstruye desde cero
+  python -m YappySA.tools.replica refresh --reconcile  # además elimina los borrados en la principal
+  python -m YappySA.tools.replica status
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+from YappySA.infra.db import replica
+
+
+def cmd_refresh(args) -> int:
+    res = replica.refresh(full=args.full, reconcile=True if args.reconcile else None)
+    print(f"Copiadas: {res['rows']}  Eliminadas: {res['deleted']}  Total en réplica: {res['total']}  "
+          f"Marca de agua: {res['watermark']}  ({res['seconds']}s)")
+    return 0
+
+
+def cmd_status(_args) -> int:
+    info = replica.status()
+    if not info["exists"]:
+        print(f"No hay réplica en {info['path']} (ejecuta 'refresh').")
+        return 1
+    print(f"Archivo: {info['path']}")
+    print(f"Filas: {info['rows']}  Marca de agua: {info['watermark']}  "
+          f"Actualizada: {info['refreshed_at']}  Reconciliada: {info['reconciled_at']}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Réplica local de clientes")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    r = sub.add_parser("refresh", help="trae los clientes nuevos desde la base principal")
+    r.add_argument("--full", action="store_true", help="vaciar y copiar todo")
+    r.add_argument("--reconcile", action="store_true",
+                   help="eliminar de la réplica los clientes borrados en la principal")
+    r.set_defaults(fn=cmd_refresh)
+    sub.add_parser("status", help="muestra el estado de la réplica").set_defaults(fn=cmd_status)
+    args = parser.parse_args(argv)
+    return args.fn(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
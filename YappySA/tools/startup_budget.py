@@ -0,0 +1,113 @@
+"""
+Presupuesto de arranque de la app de escritorio.
+
+Uso:
+  python -m YappySA.tools.startup_budget                    # presupuesto por defecto
+  python -m YappySA.tools.startup_budget --budget-ms 1200 --repeat 5 --top 20
+
+Lanza un intérprete nuevo con `-X importtime` (Qt en modo offscreen), crea la
+ventana principal y mide el tiempo hasta que se muestra. Informa los módulos
+con mayor tiempo acumulado de import y devuelve 1 si:
+  - el mejor de --repeat arranques supera --budget-ms, o
+  - algún módulo pesado (pandas, SQLAlchemy, pipeline, pdf_utils...) se
+    importó antes de mostrar la ventana.
+
+La misma verificación corre con pytest en tests/test_startup.py.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+BUDGET_MS = 1500.0  # tiempo máximo hasta mostrar la ventana (también lo usa tests/test_startup.py)
+
+# Deben cargarse después del primer pintado, nunca antes de mostrar la ventana
+HEAVY_MODULES = (
+    "pandas",
+    "sqlalchemy",
+    "pyarrow",
+    "openpyxl",
+    "YappySA.services.pipeline",
+    "YappySA.infra.db.queries",
+    "YappySA.ui.desktop_pyside.pdf_utils",
+)
+
+_PROBE = f"""
+import sys, time
+t0 = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+from YappySA.ui.desktop_pyside.main import MainWindow
+app = QApplication([])
+w = MainWindow()
+w.show()
+app.processEvents()
+print("WINDOW_MS", round((time.perf_counter() - t0) * 1000, 1))
+print("HEAVY", ",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))
+"""
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\| (\s*)(\S.*)$")
+
+
+def run_probe() -> dict:
+    """Un arranque en un proceso nuevo: {window_ms, heavy, imports}."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (str(ROOT), env.get("PYTHONPATH")) if p)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    window_ms, heavy = None, []
+    for line in proc.stdout.splitlines():
+        if line.startswith("WINDOW_MS"):
+            window_ms = float(line.split()[1])
+        elif line.startswith("HEAVY"):
+            heavy = [m for m in line[len("HEAVY"):].strip().split(",") if m]
+    if window_ms is None:
+        raise RuntimeError(f"El arranque de prueba falló:\n{proc.stderr[-2000:]}")
+
+    imports = []
+    for line in proc.stderr.splitlines():
+        m = _IMPORTTIME.match(line)
+        if m:
+            depth = len(m.group(3)) // 2
+            imports.append((int(m.group(2)), int(m.group(1)), m.group(4), depth))
+    return {"window_ms": window_ms, "heavy": heavy, "imports": imports}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Presupuesto de tiempo hasta mostrar la ventana")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="máximo tolerado (mejor de --repeat)")
+    parser.add_argument("--repeat", type=int, default=3, help="arranques a medir")
+    parser.add_argument("--top", type=int, default=15, help="módulos a listar")
+    args = parser.parse_args(argv)
+
+    runs = [run_probe() for _ in range(max(1, args.repeat))]
+    best = min(runs, key=lambda r: r["window_ms"])
+
+    print(f"Tiempo hasta la ventana: {', '.join(str(r['window_ms']) for r in runs)} ms "
+          f"(mejor {best['window_ms']} ms, presupuesto {args.budget_ms:g} ms)")
+
+    print("\n== Imports de primer nivel más costosos (acumulado, self) ==")
+    top_level = sorted((i for i in best["imports"] if i[3] == 0), reverse=True)[: args.top]
+    for cumulative_us, self_us, name, _depth in top_level:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {self_us / 1000:7.1f} ms  {name}")
+
+    failed = False
+    if best["heavy"]:
+        failed = True
+        print(f"\n!! Módulos pesados importados antes de mostrar la ventana: {', '.join(best['heavy'])}")
+    if best["window_ms"] > args.budget_ms:
+        failed = True
+        print(f"\n!! Se superó el presupuesto: {best['window_ms']} ms > {args.budget_ms:g} ms")
+    if not failed:
+        print("\nOK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
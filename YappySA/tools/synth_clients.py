@@ -0,0 +1,57 @@
+"""
+Genera archivos de clientes sintéticos para pruebas de carga del import.
+
+Uso:
+  python -m YappySA.tools.synth_clients 1000000 outputs/synth_1m.parquet
+  python -m YappySA.tools.synth_clients 50000 outputs/synth.xlsx --layout alias \\
+      --duplicates 0.02 --missing-ruc 0.05 --bad-emails 0.03 --float-ids 0.1 --seed 7
+
+Misma semilla y parámetros → mismo archivo. Ver YappySA/utils/synthetic.py.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+
+from YappySA.utils.synthetic import FORMATS, LAYOUTS, generate_clients, write_clients
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Clientes sintéticos (xlsx, csv o parquet)")
+    parser.add_argument("rows", type=int, help="cantidad de filas")
+    parser.add_argument("path", help="archivo de salida (.xlsx, .csv o .parquet)")
+    parser.add_argument("--format", choices=FORMATS, help="por defecto, según la extensión")
+    parser.add_argument("--layout", choices=LAYOUTS, default="canonical", help="encabezados")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--commercial", type=float, default=0.3, help="proporción de comerciales")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="cédulas/RUC repetidos")
+    parser.add_argument("--missing-ruc", type=float, default=0.0, help="comerciales sin RUC")
+    parser.add_argument("--bad-emails", type=float, default=0.0, help="correos sin dominio")
+    parser.add_argument("--float-ids", type=float, default=0.0, help="teléfono/RUC como float")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    df = generate_clients(
+        args.rows,
+        seed=args.seed,
+        commercial_ratio=args.commercial,
+        duplicate_rate=args.duplicates,
+        missing_ruc_rate=args.missing_ruc,
+        bad_email_rate=args.bad_emails,
+        float_id_rate=args.float_ids,
+        layout=args.layout,
+    )
+    t1 = time.perf_counter()
+    try:
+        path = write_clients(df, args.path, args.format)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    t2 = time.perf_counter()
+    print(f"{len(df)} filas generadas en {t1 - t0:.2f}s, escritas en {t2 - t1:.2f}s → {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""
+Mide la vista de tabla (PandasModel + QTableView) con resultados grandes.
+
+Uso:
+  python -m YappySA.tools.table_bench                    # 100k filas
+  python -m YappySA.tools.table_bench --rows 500k --frames 300
+  python -m YappySA.tools.table_bench --legacy           # data() celda a celda (antes)
+
+Arma un DataFrame con la forma de query_clients_filtered (datos de
+YappySA.utils.synthetic), lo muestra en un QTableView offscreen de
+1250x750 y pinta el viewport cuadro a cuadro, bajando de a 3 filas
+(scroll) y saltando a posiciones al azar (jump). Reporta ms por cuadro
+(p50, p95, máx.) y cuánto de eso fue data(), con cuántas llamadas.
+Después mide sort() por columna y set_filter().
+
+--legacy usa el data() anterior (iat + isna + str en cada llamada) para
+comparar con la caché de textos de PandasModel.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+import uuid
+
+from YappySA.tools.bench import parse_size, percentile
+
+
+def build_frame(rows: int, seed: int = 0):
+    """Columnas y tipos como los devuelve query_clients_filtered."""
+    import numpy as np
+    import pandas as pd
+
+    from YappySA.utils.synthetic import generate_clients
+
+    src = generate_clients(rows, seed=seed)
+    rng = np.random.default_rng(seed)
+    ids = pd.array([str(uuid.UUID(int=int(x))).upper() for x in rng.integers(0, 2**63, rows)], dtype="string")
+    created = pd.Timestamp("2024-01-01") + pd.to_timedelta(np.sort(rng.integers(0, 86_400 * 365, rows))[::-1], unit="s")
+    return pd.DataFrame({
+        "client_id": ids,
+        "client_type": src["client_type"],
+        "created_at": created,
+        "display_name": src["company_name"].fillna(src["name"]),
+        "national_id": src["national_id"],
+        "ruc": src["ruc"],
+        "email": src["email"],
+        "phone": src["phone"],
+        "alias": src["alias"],
+    })
+
+
+def _legacy_model_class():
+    import pandas as pd
+    from PySide6.QtCore import Qt
+
+    from YappySA.ui.desktop_pyside.table_model import PandasModel
+
+    class LegacyModel(PandasModel):
+        """data() como estaba antes de la caché de textos."""
+
+        def data(self, index, role=Qt.DisplayRole):
+            if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+                return None
+            val = self._df.iat[index.row(), index.column()]
+            return "" if pd.isna(val) else str(val)
+
+    return LegacyModel
+
+
+def measure_paint(view, frames: int, mode: str = "scroll", seed: int = 0) -> list[float]:
+    """
+    ms por cuadro pintando el viewport.
+    scroll: baja de a 3 filas (rueda del mouse); jump: posiciones al azar (arrastrar la barra).
+    """
+    import numpy as np
+
+    bar = view.verticalScrollBar()
+    if mode == "scroll":
+        positions = np.minimum(np.arange(frames) * 3, bar.maximum())
+    else:
+        positions = np.random.default_rng(seed).integers(0, max(bar.maximum(), 1), frames)
+    times = []
+    for pos in positions:
+        bar.setValue(int(pos))
+        t0 = time.perf_counter()
+        view.viewport().grab()
+        times.append((time.perf_counter() - t0) * 1000)
+    return times
+
+
+def measure_sort_filter(model, needle: str = "maría") -> None:
+    """ms de sort() por columna (asc/desc) y de set_filter() (primera vez y siguiente)."""
+    from PySide6.QtCore import Qt
+
+    for c in range(model.columnCount()):
+        times = []
+        for order in (Qt.AscendingOrder, Qt.DescendingOrder):
+            t0 = time.perf_counter()
+            model.sort(c, order)
+            times.append((time.perf_counter() - t0) * 1000)
+        print(f"sort {model.headerData(c, Qt.Horizontal):<14} asc {times[0]:7.1f} ms  desc {times[1]:7.1f} ms")
+    model.sort(-1)
+
+    for label, text in (("filtro (1.ª vez)", needle[:-1]), ("filtro (tecla)", needle)):
+        t0 = time.perf_counter()
+        model.set_filter(text)
+        print(f"{label:<19} {(time.perf_counter() - t0) * 1000:7.1f} ms  → {model.rowCount():,} filas")
+    model.set_filter("")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pintado, orden y filtro de PandasModel con resultados grandes")
+    parser.add_argument("--rows", type=parse_size, default=100_000, help="filas (admite 100k, 1m)")
+    parser.add_argument("--frames", type=int, default=200, help="cuadros a pintar")
+    parser.add_argument("--legacy", action="store_true", help="data() sin caché (para comparar)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication, QTableView
+
+    from YappySA.ui.desktop_pyside.table_model import PandasModel
+
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    t0 = time.perf_counter()
+    df = build_frame(args.rows)
+    print(f"{len(df):,} filas generadas en {time.perf_counter() - t0:.2f}s")
+
+    model = (_legacy_model_class() if args.legacy else PandasModel)()
+    calls, spent = [0], [0.0]
+    original = model.data
+
+    def counted(index, role=0):
+        calls[0] += 1
+        t = time.perf_counter()
+        try:
+            return original(index, role)
+        finally:
+            spent[0] += time.perf_counter() - t
+
+    model.data = counted
+    view = QTableView()
+    view.resize(1250, 750)
+    view.setModel(model)
+    t0 = time.perf_counter()
+    model.set_df(df)
+    print(f"set_df: {(time.perf_counter() - t0) * 1000:.1f} ms")
+    view.show()
+    view.viewport().grab()  # primer pintado (columnas, métricas de fuente)
+
+    label = "legacy" if args.legacy else "caché"
+    for mode in ("scroll", "jump"):
+        calls[0], spent[0] = 0, 0.0
+        times = measure_paint(view, args.frames, mode)
+        print(
+            f"{mode:<6} ({label}): p50 {percentile(times, 50):6.2f} ms  p95 {percentile(times, 95):6.2f} ms  "
+            f"máx. {max(times):6.2f} ms  ·  data(): {spent[0] * 1000 / len(times):5.2f} ms "
+            f"en {calls[0] / len(times):,.0f} llamadas por cuadro"
+        )
+    if not args.legacy:
+        measure_sort_filter(model)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+
+from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
+from PySide6.QtGui import QFontDatabase
+
+from YappySA.ui.desktop_pyside.table_model import (
+    CHUNK_ROWS, ID_COLUMNS, MAX_CHUNKS, _ALIGN, _ASCENDING, _DESCENDING, _DISPLAY, _EDIT, _FONT,
+    _HORIZONTAL, _display_strings,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    from YappySA.infra.db.spill import SpilledResult
+
+
+class ArrowTableModel(QAbstractTableModel):
+    """
+    Vista de solo lectura sobre un SpilledResult (archivo Arrow mapeado).
+
+    Igual que PandasModel, pero los bloques de CHUNK_ROWS filas se leen del
+    archivo al pintarse: abrir un resultado de millones de filas es
+    inmediato y la memoria no crece con el tamaño del resultado.
+    sort() usa pyarrow.compute.sort_indices (solo la permutación queda en RAM).
+    El modelo no es dueño del archivo: quien lo crea llama a result.close().
+    """
+
+    def __init__(self, result: SpilledResult | None = None):
+        super().__init__()
+        self._result = None
+        self._columns: list[str] = []
+        self._chunks: dict[int, list] = {}
+        self._align: list = []
+        self._fonts: list = []
+        self._order: np.ndarray | None = None
+        if result is not None:
+            self._set(result)
+
+    def _set(self, result: SpilledResult | None) -> None:
+        import pyarrow as pa
+
+        self._result = result
+        self._chunks = {}
+        self._order = None
+        self._columns = result.columns if result is not None else []
+        self._align, self._fonts = [], []
+        if result is None:
+            return
+        mono = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        right = int(Qt.AlignRight | Qt.AlignVCenter)
+        for field in result.table.schema:
+            t = field.type
+            numeric = pa.types.is_integer(t) or pa.types.is_floating(t) or pa.types.is_decimal(t)
+            temporal = pa.types.is_temporal(t)
+            self._align.append(right if numeric or temporal else None)
+            self._fonts.append(mono if field.name.lower() in ID_COLUMNS else None)
+
+    def set_result(self, result: SpilledResult | None) -> None:
+        self.beginResetModel()
+        self._set(result)
+        self.endResetModel()
+
+    @property
+    def result(self) -> SpilledResult | None:
+        return self._result
+
+    @property
+    def total_rows(self) -> int:
+        return 0 if self._result is None else self._result.num_rows
+
+    def _chunk(self, n: int) -> list:
+        cols = self._chunks.get(n)
+        if cols is None:
+            block = self._result.frame(n * CHUNK_ROWS, (n + 1) * CHUNK_ROWS, self._order)
+            cols = [_display_strings(block.iloc[:, c]) for c in range(block.shape[1])]
+            if len(self._chunks) >= MAX_CHUNKS:
+                del self._chunks[next(iter(self._chunks))]
+            self._chunks[n] = cols
+        return cols
+
+    def sort(self, column, order=_ASCENDING):
+        """Clic en el encabezado; column < 0 vuelve al orden del archivo."""
+        if self._result is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        if 0 <= column < len(self._columns):
+            import pyarrow.compute as pc
+
+            direction = "descending" if order == _DESCENDING else "ascending"
+            self._order = pc.sort_indices(
+                self._result.table,
+                sort_keys=[(self._columns[column], direction)],  # nulos al final (por defecto)
+            ).to_numpy()
+        else:
+            self._order = None
+        self._chunks = {}
+        self.layoutChanged.emit()
+
+    # ---------- API de Qt ----------
+    def rowCount(self, parent=QModelIndex()):
+        return self.total_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self._columns)
+
+    def data(self, index, role=_DISPLAY):
+        if role == _DISPLAY or role == _EDIT:
+            row = index.row()
+            if row < 0:
+                return None
+            return self._chunk(row // CHUNK_ROWS)[index.column()][row % CHUNK_ROWS]
+        if role == _ALIGN:
+            return self._align[index.column()] if index.isValid() else None
+        if role == _FONT:
+            return self._fonts[index.column()] if index.isValid() else None
+        return None
+
+    def headerData(self, section, orientation, role=_DISPLAY):
+        if role != _DISPLAY:
+            return None
+        if orientation == _HORIZONTAL:
+            return self._columns[section]
+        return str(section + 1)
@@ -1,19 +1,51 @@
 from __future__ import annotations
+import logging
 import sys
+import threading
 from pathlib import Path
 
-import pandas as pd
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QLabel, QPushButton, QVBoxLayout,
-    QHBoxLayout, QFileDialog, QMessageBox, QTableView, QStatusBar, QFrame
+    QHBoxLayout, QFileDialog, QMessageBox, QTableView, QStatusBar, QFrame, QLineEdit
 )
 from PySide6.QtGui import QFont, QPalette, QColor, QPixmap, QIcon
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 
-from YappySA.services.pipeline import run_import_pipeline
-from YappySA.infra.db.queries import fetch_recent_clients
+from YappySA.core import startup
+from YappySA.core.logs import setup_logging
 from YappySA.ui.desktop_pyside.table_model import PandasModel
-from YappySA.ui.desktop_pyside.pdf_utils import export_table_to_pdf
+from YappySA.ui.desktop_pyside.workers import BusySpinner, QueryRunner
+
+# pandas, SQLAlchemy, el pipeline y pdf_utils NO se importan aquí: la ventana
+# aparece sin ellos. Se cargan en segundo plano tras el primer pintado
+# (_preload_backend) o, a más tardar, en el hilo de trabajo que los usa.
+
+log = logging.getLogger("yappysa.ui")
+
+RECENT_LIMIT = 100  # filas de la vista "Ver últimas 100"
+FILTER_DEBOUNCE_MS = 250  # espera tras la última tecla antes de filtrar
+
+# Etiquetas de las etapas de run_import_pipeline (pipeline.STAGES)
+STAGE_LABELS = {
+    "load": "Lectura",
+    "normalize": "Normalización",
+    "validate": "Validación",
+    "classify": "Clasificación",
+    "dedup": "Duplicados",
+    "db_write": "Escritura BD",
+    "failed_export": "CSV de errores",
+}
+
+
+def _timing_summary(s: dict) -> str:
+    """Desglose compacto de tiempos y contadores del resultado de importación."""
+    lines = [f"Tiempo: {s.get('wall_s', 0):.2f} s ({s.get('rows_per_s', 0):,.0f} filas/s)"]
+    for name, t in s["timings"].items():
+        lines.append(f"  {STAGE_LABELS.get(name, name)}: {t['wall_s']:.2f} s")
+    lines.append(f"Sentencias BD: {s.get('db_round_trips', 0)}  ·  Rollbacks: {s.get('rollbacks', 0)}")
+    if s.get("peak_rss_mb") is not None:
+        lines.append(f"Memoria máx.: {s['peak_rss_mb']:.0f} MB")
+    return "\n".join(lines)
 
 
 class MainWindow(QMainWindow):
@@ -22,6 +54,11 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Yappy S.A. – Sistema de Gestión de Clientes")
         self.resize(1250, 750)
         self.current_path = ""
+        self._showing_recent = False  # la tabla contiene la vista de últimos N
+
+        # Consultas y la importación corren en el pool de BD, no en el hilo de la UI
+        self.runner = QueryRunner(self)
+        self.import_runner = QueryRunner(self)
 
         self._apply_theme()
         self._setup_ui()
@@ -133,16 +170,39 @@ class MainWindow(QMainWindow):
         self.btn_pdf = make_button("Imprimir vista (PDF)", "document-print")
         self.btn_pdf.clicked.connect(self.print_view)
 
-        for b in [self.btn_open, self.btn_import, self.btn_preview, self.btn_export, self.btn_pdf]:
+        self.btn_sql = make_button("Diagnóstico SQL", "utilities-system-monitor")
+        self.btn_sql.clicked.connect(self.open_sql_stats)
+
+        for b in [self.btn_open, self.btn_import, self.btn_preview, self.btn_export, self.btn_pdf, self.btn_sql]:
             button_bar.addWidget(b)
 
         main_layout.addLayout(button_bar)
 
+        # ----------------- Filtro rápido -----------------
+        filter_bar = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filtrar la tabla (cualquier columna)…")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.textChanged.connect(lambda _t: self._filter_timer.start())
+        self.filter_count = QLabel()
+        filter_bar.addWidget(self.filter_edit, 1)
+        filter_bar.addWidget(self.filter_count)
+        main_layout.addLayout(filter_bar)
+
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self._filter_timer.timeout.connect(self.apply_filter)
+
         # ----------------- Tabla principal -----------------
         self.table = QTableView()
-        self.model = PandasModel(pd.DataFrame())
+        self.model = PandasModel()
         self.table.setModel(self.model)
         self.table.setAlternatingRowColors(True)
+        # Clic en el encabezado: PandasModel.sort(); sin indicador = orden original
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.model.modelReset.connect(self._update_filter_count)
 
         self.table.setStyleSheet(f"""
             QTableView {{
@@ -163,6 +223,10 @@ class MainWindow(QMainWindow):
     def _setup_statusbar(self):
         status = QStatusBar()
         status.showMessage("Listo.")
+        self.spinner = BusySpinner(status)
+        self.spinner.follow(self.runner)
+        self.spinner.follow(self.import_runner)
+        status.addPermanentWidget(self.spinner)
         self.setStatusBar(status)
         self.status = status
 
@@ -186,40 +250,101 @@ class MainWindow(QMainWindow):
         if not self.current_path:
             QMessageBox.warning(self, "Atención", "Selecciona un archivo primero.")
             return
-        try:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            s = run_import_pipeline(self.current_path)
-        except Exception as e:
-            QMessageBox.critical(self, "Error inesperado", str(e))
+        if self.import_runner.busy:
             return
-        finally:
-            QApplication.restoreOverrideCursor()
+        path = self.current_path
+        self.btn_import.setEnabled(False)
+        self.status.showMessage(f"Importando {path}…")
+        def job(_token):
+            from YappySA.services.pipeline import run_import_pipeline
+            return run_import_pipeline(path)
+
+        self.import_runner.submit(
+            job,
+            self._on_import_done,
+            self._on_import_error,
+        )
 
+    def _on_import_error(self, e: Exception):
+        self.btn_import.setEnabled(True)
+        self.status.showMessage("La importación falló.")
+        QMessageBox.critical(self, "Error inesperado", str(e))
+
+    def _on_import_done(self, s: dict):
+        self.btn_import.setEnabled(True)
         msg = (f"Total filas: {s.get('total', 0)}\n"
                f"Insertadas: {s.get('inserted', 0)}\n"
                f"Omitidas: {s.get('skipped', 0)}")
         failed_csv = s.get("failed_csv")
         if failed_csv:
             msg += f"\n\nSe creó un CSV con los errores:\n{failed_csv}"
+        if s.get("timings"):
+            msg += "\n\n" + _timing_summary(s)
         QMessageBox.information(self, "Resultado de importación", msg)
         self.status.showMessage("Importación completada.")
-        self.preview_recent()
+        self.merge_inserted(s.get("inserted_ids") or [])
+
+    def apply_filter(self):
+        self.model.set_filter(self.filter_edit.text())
+
+    def _update_filter_count(self):
+        shown, total = self.model.rowCount(), self.model.total_rows
+        self.filter_count.setText(f"{shown:,} de {total:,} filas" if shown != total else "")
+
+    def merge_inserted(self, client_ids: list[str]):
+        """
+        Fusiona en la vista actual solo los clientes recién importados.
+        Si la tabla aún no muestra los últimos N, se carga completa.
+        """
+        if not self._showing_recent:
+            self.preview_recent()
+            return
+        if not client_ids:
+            return
+        # Los últimos insertados son los más recientes; no hace falta pedir más de N
+        ids = client_ids[-RECENT_LIMIT:]
+
+        def done(df):
+            self.model.prepend_rows(df, key="client_id", max_rows=RECENT_LIMIT)
+            self.status.showMessage(
+                f"Importación completada. {len(client_ids)} registro(s) nuevos en la vista."
+            )
+
+        def job(token):
+            from YappySA.infra.db.queries import fetch_clients_by_ids
+            return fetch_clients_by_ids(ids, cancel=token)
+
+        self.runner.submit(
+            job,
+            done,
+            lambda e: QMessageBox.critical(self, "Error", f"No se pudo actualizar la vista previa.\n{e}"),
+        )
 
     def preview_recent(self):
-        try:
-            QApplication.setOverrideCursor(Qt.WaitCursor)
-            df = fetch_recent_clients(limit=100)
+        def done(df):
             self.model.set_df(df)
-            self.status.showMessage("Mostrando los últimos 100 registros.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"No se pudo obtener la vista previa.\n{e}")
-        finally:
-            QApplication.restoreOverrideCursor()
+            self._showing_recent = True
+            self.status.showMessage(f"Mostrando los últimos {RECENT_LIMIT} registros.")
+
+        def job(token):
+            from YappySA.infra.db.queries import fetch_recent_clients
+            return fetch_recent_clients(limit=RECENT_LIMIT, cancel=token)
+
+        self.status.showMessage("Consultando…")
+        self.runner.submit(
+            job,
+            done,
+            lambda e: QMessageBox.critical(self, "Error", f"No se pudo obtener la vista previa.\n{e}"),
+        )
 
     def open_export_dialog(self):
         from YappySA.ui.desktop_pyside.query_export_dialog import QueryExportDialog
         QueryExportDialog(self).exec()
 
+    def open_sql_stats(self):
+        from YappySA.ui.desktop_pyside.sql_stats_dialog import SqlStatsDialog
+        SqlStatsDialog(self).exec()
+
     def print_view(self):
         if self.model.rowCount() == 0:
             QMessageBox.information(self, "Sin datos", "No hay datos en la tabla para imprimir.")
@@ -231,6 +356,7 @@ class MainWindow(QMainWindow):
             return
         try:
             QApplication.setOverrideCursor(Qt.WaitCursor)
+            from YappySA.ui.desktop_pyside.pdf_utils import export_table_to_pdf
             export_table_to_pdf(self.table, path)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"No se pudo generar el PDF.\n{e}")
@@ -240,10 +366,36 @@ class MainWindow(QMainWindow):
         QMessageBox.information(self, "PDF generado", f"Archivo guardado: {path}")
 
 
+def _preload_backend():
+    """
+    Tras el primer pintado: importa pandas/SQLAlchemy y abre la primera
+    conexión en segundo plano, así el primer clic no paga esos costos.
+    """
+    startup.mark("first_paint")
+
+    def run():
+        try:
+            import YappySA.infra.db.queries  # noqa: F401  (pandas + SQLAlchemy)
+            from YappySA.infra.db.session import warm_up
+            startup.mark("backend_imported")
+            warm_up().join()
+            startup.mark("db_connected")
+        except Exception as e:
+            log.warning("No se pudo precargar la base de datos: %s", e)
+        finally:
+            startup.write_report()
+
+    threading.Thread(target=run, name="preload", daemon=True).start()
+
+
 def main():
+    setup_logging()
     app = QApplication(sys.argv)
+    startup.mark("qt_app")
     w = MainWindow()
     w.show()
+    startup.mark("window_shown")
+    QTimer.singleShot(0, _preload_backend)
     sys.exit(app.exec())
 
 
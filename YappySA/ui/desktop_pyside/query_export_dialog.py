@@ -1,17 +1,26 @@
 from __future__ import annotations
 from datetime import datetime
+from pathlib import Path
 import re
+import threading
 
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QLineEdit, QCheckBox,
-    QDateEdit, QPushButton, QRadioButton, QFileDialog, QMessageBox, QTableView
+    QDateEdit, QPushButton, QComboBox, QFileDialog, QMessageBox, QTableView
 )
-from PySide6.QtCore import Qt, QDate
+from PySide6.QtCore import Qt, QDate, QTimer
 import pandas as pd
 
-from YappySA.infra.db.queries import query_clients_filtered
-from YappySA.infra.reporting.exporter import export_dataframe
+from YappySA.core.settings import get_settings
+from YappySA.infra.db.cancellation import QueryCancelled
+from YappySA.infra.db.queries import query_clients_filtered, search_clients
+from YappySA.infra.db.replica import replica_available
+from YappySA.infra.reporting.exporter import EXPORT_FORMATS, export_dataframe, export_frames
+from YappySA.ui.desktop_pyside.arrow_model import ArrowTableModel
 from YappySA.ui.desktop_pyside.table_model import PandasModel
+from YappySA.ui.desktop_pyside.workers import BusySpinner, QueryRunner
+
+LIVE_DEBOUNCE_MS = 350  # espera tras la última tecla antes de previsualizar
 
 
 # ------------------------------------
@@ -35,11 +44,40 @@ def _parse_multi_values(text: str | None):
     return parts or None
 
 
+def _until_cancelled(frames, token):
+    """Las partes de `frames` mientras no se cancele la exportación."""
+    for df in frames:
+        token.raise_if_cancelled()
+        yield df
+
+
+def _discard_partial(path: str) -> None:
+    try:
+        Path(path).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
 class QueryExportDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Consultar / Exportar")
         self.resize(900, 600)
+        # Las consultas corren fuera del hilo de la UI; gana la más reciente
+        self.runner = QueryRunner(self)
+        self.export_runner = QueryRunner(self)  # aparte: previsualizar no cancela una exportación
+        self._live_timer = QTimer(self)
+        self._live_timer.setSingleShot(True)
+        self._live_timer.setInterval(LIVE_DEBOUNCE_MS)
+        self._live_timer.timeout.connect(lambda: self.on_preview(live=True))
+        # Resultado de "Ver todo" guardado en disco (SpilledResult) y los filtros que lo generaron
+        self._spilled = None
+        self._spilled_key = None
+        # SpilledResult -> exportaciones que lo están leyendo. Lo cierra el último
+        # que lo suelta: la vista (_release_spilled) o el hilo de la exportación
+        # (_release_export); el lock es porque ese hilo no es el de la UI.
+        self._exporting: dict = {}
+        self._spill_lock = threading.Lock()
         self._build_ui()
 
     def _build_ui(self):
@@ -47,10 +85,10 @@ class QueryExportDialog(QDialog):
 
         # Estilos: texto negro en controles, tabla y calendario
         self.setStyleSheet("""
-            QLabel, QCheckBox, QRadioButton {
+            QLabel, QCheckBox {
                 color: #1e1e1e;
             }
-            QLineEdit, QDateEdit {
+            QLineEdit, QDateEdit, QComboBox {
                 color: #1e1e1e;
                 background-color: white;
                 selection-background-color: #ff8c00;
@@ -96,6 +134,16 @@ class QueryExportDialog(QDialog):
         grid.addWidget(self.cb_commercial, row, 2)
         row += 1
 
+        # Origen: réplica local de solo lectura (si existe)
+        self.cb_replica = QCheckBox("Usar réplica local (sin conexión al servidor)")
+        self.cb_replica.setEnabled(replica_available())
+        self.cb_replica.setToolTip(
+            "Consulta la copia local creada con 'python -m YappySA.tools.replica refresh'.\n"
+            "La búsqueda parcial siempre usa el servidor."
+        )
+        grid.addWidget(self.cb_replica, row, 1, 1, 2)
+        row += 1
+
         # Fecha desde
         self.cb_date = QCheckBox("Desde fecha:")
         self.date_from = QDateEdit(calendarPopup=True)
@@ -135,34 +183,81 @@ class QueryExportDialog(QDialog):
         grid.addWidget(self.le_ruc, row, 1, 1, 2)
         row += 1
 
+        # Búsqueda parcial (usa el índice de trigramas)
+        self.le_search = QLineEdit()
+        self.le_search.setPlaceholderText(
+            "Nombre, email, alias o teléfono (parcial) – ignora UUID / cédula / RUC"
+        )
+        if not get_settings().SEARCH_INDEX_ENABLED:
+            # Sin SEARCH_INDEX_ENABLED nadie llena client_token: toda búsqueda saldría vacía
+            self.le_search.setEnabled(False)
+            self.le_search.setPlaceholderText("Búsqueda parcial desactivada (índice de texto apagado)")
+            self.le_search.setToolTip(
+                "Activa SEARCH_INDEX_ENABLED y construye el índice con:\n"
+                "python -m YappySA.tools.client_search tokens"
+            )
+        grid.addWidget(QLabel("Buscar:"), row, 0)
+        grid.addWidget(self.le_search, row, 1, 1, 2)
+        row += 1
+
         v.addLayout(grid)
 
         # --------- Formato de exportación ---------
         f = QHBoxLayout()
-        self.rb_csv = QRadioButton("CSV")
-        self.rb_xlsx = QRadioButton("Excel")
-        self.rb_csv.setChecked(True)
+        self.cb_format = QComboBox()
+        for fmt, (label, _ext) in EXPORT_FORMATS.items():
+            self.cb_format.addItem(label, fmt)
+        self.cb_format.setToolTip(
+            "Parquet y Feather conservan los tipos de columna y se leen directo\n"
+            "con pandas, DuckDB o Spark; JSON Lines: un objeto por fila."
+        )
         f.addWidget(QLabel("Formato:"))
-        f.addWidget(self.rb_csv)
-        f.addWidget(self.rb_xlsx)
+        f.addWidget(self.cb_format)
         f.addStretch()
         v.addLayout(f)
 
         # --------- Botones ---------
         h = QHBoxLayout()
         btn_preview = QPushButton("Previsualizar")
+        btn_browse = QPushButton("Ver todo")
+        btn_browse.setToolTip(
+            "Carga el resultado completo. Si es grande se guarda en un archivo temporal\n"
+            "y la tabla lo recorre desde el disco; Exportar usa ese archivo."
+        )
         btn_export = QPushButton("Exportar…")
         btn_preview.clicked.connect(self.on_preview)
+        btn_browse.clicked.connect(self.on_browse)
         btn_export.clicked.connect(self.on_export)
+        self.cb_live = QCheckBox("Filtro en vivo")
+        self.cb_live.setToolTip("Previsualiza automáticamente al escribir o cambiar filtros")
+        self.cb_live.toggled.connect(self._schedule_live)
+        self.spinner = BusySpinner(self)
+        self.spinner.follow(self.runner)
+        self.spinner.follow(self.export_runner)
         h.addWidget(btn_preview)
+        h.addWidget(btn_browse)
         h.addWidget(btn_export)
+        h.addWidget(self.cb_live)
         h.addStretch()
+        self.lbl_info = QLabel("")
+        h.addWidget(self.lbl_info)
+        h.addWidget(self.spinner)
         v.addLayout(h)
 
+        # Cualquier cambio de filtro reprograma la previsualización en vivo
+        for le in (self.le_uuid, self.le_nid, self.le_ruc, self.le_search):
+            le.textChanged.connect(self._schedule_live)
+        for cb in (self.cb_personal, self.cb_commercial, self.cb_date, self.cb_replica):
+            cb.toggled.connect(self._schedule_live)
+        self.date_from.dateChanged.connect(self._schedule_live)
+
         # --------- Tabla de preview ---------
         self.table = QTableView()
         self.model = PandasModel(pd.DataFrame())
+        self.arrow_model = ArrowTableModel()
         self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
         v.addWidget(self.table, 1)
 
     # --------- Helpers ---------
@@ -185,53 +280,224 @@ class QueryExportDialog(QDialog):
         nid_list = _parse_multi_values(self.le_nid.text().strip())
         ruc_list = _parse_multi_values(self.le_ruc.text().strip())
 
-        return kinds, since, uuid_list, nid_list, ruc_list
+        # Texto libre
+        search = (self.le_search.isEnabled() and self.le_search.text().strip()) or None
+
+        return kinds, since, uuid_list, nid_list, ruc_list, search
 
-    def _do_query(self, limit=None) -> pd.DataFrame:
-        kinds, since, uuid_list, nid_list, ruc_list = self._gather()
+    def _query_job(self, limit=None, spill=False):
+        """
+        Lee los filtros (en el hilo de la UI) y devuelve la función que
+        ejecuta la consulta en el pool: fn(cancel_token) -> DataFrame.
+        Con spill=True un resultado grande vuelve como SpilledResult.
+        """
+        kinds, since, uuid_list, nid_list, ruc_list, search = self._gather()
         if not kinds:
             raise ValueError("Selecciona al menos un tipo de cliente.")
+        source = "local" if self.cb_replica.isChecked() else "auto"
+        spill_rows = get_settings().SPILL_ROWS if spill else None
 
-        return query_clients_filtered(
+        if search:
+            return lambda token: search_clients(
+                search, kinds=kinds, since_date=since, limit=limit, cancel=token
+            )
+
+        return lambda token: query_clients_filtered(
             kinds=kinds,
             since_date=since,
             uuid=uuid_list,
             national_id=nid_list,
             ruc=ruc_list,
             limit=limit,
+            cancel=token,
+            source=source,
+            spill_rows=spill_rows,
         )
 
+    def _filters_key(self):
+        """Identifica los filtros actuales (para saber si el resultado en disco sigue vigente)."""
+        return self._gather(), self.cb_replica.isChecked()
+
+    def _show_frame(self, df):
+        self._release_spilled()
+        self.table.setModel(self.model)
+        self.model.set_df(df)
+
+    def _show_spilled(self, result, key):
+        self.arrow_model.set_result(result)
+        self.table.setModel(self.arrow_model)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self._release_spilled()
+        with self._spill_lock:
+            self._spilled, self._spilled_key = result, key
+
+    def _release_spilled(self):
+        with self._spill_lock:
+            old, self._spilled, self._spilled_key = self._spilled, None, None
+            exporting = old in self._exporting
+        if old is None:
+            return
+        if self.arrow_model.result is old:
+            self.arrow_model.set_result(None)
+        if not exporting:
+            old.close()
+
+    def _hold_export(self, result):
+        with self._spill_lock:
+            self._exporting[result] = self._exporting.get(result, 0) + 1
+
+    def _release_export(self, result):
+        """Fin de una exportación desde `result` (en su hilo, termine como termine)."""
+        with self._spill_lock:
+            left = self._exporting.pop(result) - 1
+            if left:
+                self._exporting[result] = left
+                return
+            in_view = result is self._spilled
+        if not in_view:
+            result.close()
+
+    def _schedule_live(self, *_):
+        if self.cb_live.isChecked():
+            self._live_timer.start()  # reinicia el debounce
+
     # --------- Slots ---------
-    def on_preview(self):
+    def on_preview(self, checked=False, live=False):
         try:
-            df = self._do_query(limit=200)
-            self.model.set_df(df)
-            if df.empty:
+            job = self._query_job(limit=200)
+        except Exception as e:
+            if live:
+                self.lbl_info.setText(str(e))
+            else:
+                QMessageBox.critical(self, "Error", str(e))
+            return
+
+        def done(df):
+            self._show_frame(df)
+            note = " · búsqueda muy amplia: solo se revisaron los mejores candidatos" \
+                if df.attrs.get("truncated") else ""
+            self.lbl_info.setText(f"{len(df)} fila(s){note}")
+            if df.empty and not live:
                 QMessageBox.information(
                     self, "Sin resultados",
                     "No se encontraron filas con esos filtros."
                 )
+
+        def failed(e):
+            # En vivo no se interrumpe al usuario con ventanas
+            if live:
+                self.lbl_info.setText(f"Error: {str(e).splitlines()[0]}")
+            else:
+                QMessageBox.critical(self, "Error", str(e))
+
+        self.lbl_info.setText("Consultando…")
+        self.runner.submit(job, done, failed)
+
+    def on_browse(self):
+        try:
+            key = self._filters_key()
+            job = self._query_job(limit=None, spill=True)
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
+            return
+
+        def done(res):
+            if isinstance(res, pd.DataFrame):
+                self._show_frame(res)
+                self.lbl_info.setText(f"{len(res):,} fila(s)")
+            else:
+                self._show_spilled(res, key)
+                self.lbl_info.setText(f"{res.num_rows:,} fila(s) · en disco")
+
+        self.lbl_info.setText("Consultando…")
+        self.runner.submit(job, done, lambda e: QMessageBox.critical(self, "Error", str(e)))
 
     def on_export(self):
+        spilled = self._spilled if self._spilled_key == self._filters_key() else None
         try:
-            df = self._do_query(limit=None)
+            job = self._query_job(limit=None)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", str(e))
+            return
+
+        if not self._confirm_cancel_export("¿Cancelarla y empezar esta?"):
+            return
+
+        fmt = self.cb_format.currentData()
+        label, ext = EXPORT_FORMATS[fmt]
+        path, _ = QFileDialog.getSaveFileName(self, "Guardar archivo", f"consulta{ext}", f"{label} (*{ext})")
+        if not path:
+            return
+
+        if spilled is not None:
+            # Lo que muestra "Ver todo": se exporta desde el archivo, sin repetir la consulta.
+            # El archivo se suelta en el hilo de la exportación: si el diálogo se
+            # cierra o empieza otra exportación, los callbacks ya no se llaman.
+            self._hold_export(spilled)
+
+            def export_spilled(token):
+                try:
+                    return export_frames(_until_cancelled(spilled.iter_frames(), token), path, fmt=fmt)
+                except QueryCancelled:
+                    _discard_partial(path)
+                    raise
+                finally:
+                    self._release_export(spilled)
+
+            self.export_runner.submit(
+                export_spilled,
+                lambda n: QMessageBox.information(self, "Listo", f"Archivo guardado ({n:,} filas):\n{path}"),
+                lambda e: QMessageBox.critical(self, "Error", str(e)),
+            )
+            return
+
+        def run(token):
+            df = job(token)
             if df.empty:
+                return 0
+            token.raise_if_cancelled()
+            export_dataframe(df, path, fmt=fmt)
+            if token.cancelled:
+                # Se canceló mientras se escribía: nadie va a enterarse de que terminó
+                _discard_partial(path)
+                raise QueryCancelled()
+            return len(df)
+
+        def done(n):
+            if not n:
                 QMessageBox.information(
                     self, "Sin resultados",
                     "No se encontraron filas para exportar."
                 )
                 return
-
-            default = "consulta.csv" if self.rb_csv.isChecked() else "consulta.xlsx"
-            filt = "CSV (*.csv)" if self.rb_csv.isChecked() else "Excel (*.xlsx)"
-            path, _ = QFileDialog.getSaveFileName(self, "Guardar archivo", default, filt)
-            if not path:
-                return
-
-            fmt = "csv" if self.rb_csv.isChecked() else "xlsx"
-            export_dataframe(df, path, fmt=fmt)
             QMessageBox.information(self, "Listo", f"Archivo guardado:\n{path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", str(e))
+
+        self.export_runner.submit(run, done, lambda e: QMessageBox.critical(self, "Error", str(e)))
+
+    def _confirm_cancel_export(self, question: str) -> bool:
+        """
+        Si hay una exportación en curso, pregunta si cancelarla (su archivo
+        incompleto se elimina). True si no hay ninguna o el usuario acepta.
+        """
+        if not self.export_runner.busy:
+            return True
+        answer = QMessageBox.question(
+            self, "Exportación en curso",
+            f"Hay una exportación en curso. {question}\n"
+            "Si se cancela, el archivo incompleto se elimina.",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No,
+        )
+        if answer != QMessageBox.Yes:
+            return False
+        self.export_runner.cancel()
+        return True
+
+    def done(self, result):
+        # Con una exportación en curso se pregunta; "No" deja el diálogo abierto hasta que termine
+        if not self._confirm_cancel_export("¿Cancelarla y cerrar?"):
+            return
+        self._live_timer.stop()
+        self.runner.cancel()
+        self.export_runner.cancel()
+        self._release_spilled()
+        super().done(result)
@@ -0,0 +1,120 @@
+from __future__ import annotations
+from datetime import datetime
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFileDialog, QMessageBox, QTableView
+)
+import pandas as pd
+
+from YappySA.core.settings import get_settings
+from YappySA.infra.db import instrumentation
+from YappySA.ui.desktop_pyside.table_model import PandasModel
+
+# Columnas de la tabla (claves de instrumentation.summary()["statements"])
+COLUMNS = {
+    "shape": "Sentencia",
+    "count": "Veces",
+    "total_ms": "Total ms",
+    "avg_ms": "Prom. ms",
+    "p95_ms": "p95 ms",
+    "max_ms": "Máx. ms",
+    "rows": "Filas",
+    "db": "Base",
+}
+
+
+class SqlStatsDialog(QDialog):
+    """Resumen de la traza SQL en memoria (ver infra/db/instrumentation.py)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnóstico SQL")
+        self.resize(1000, 550)
+        self._build_ui()
+        self.refresh()
+
+    def _build_ui(self):
+        v = QVBoxLayout(self)
+        self.setStyleSheet("""
+            QLabel { color: #1e1e1e; }
+            QTableView {
+                color: #1e1e1e;
+                gridline-color: #d0d7e2;
+                selection-background-color: #ff8c00;
+                selection-color: #1e1e1e;
+            }
+            QHeaderView::section {
+                background-color: #ff8c00;
+                color: white;
+                font-weight: bold;
+                padding: 4px;
+            }
+        """)
+
+        if not get_settings().SQL_TRACE_ENABLED:
+            off = QLabel(
+                "La traza SQL está apagada: no se registran sentencias ni esperas del pool.\n"
+                "Para activarla agrega SQL_TRACE_ENABLED=true al .env y reinicia la aplicación."
+            )
+            off.setStyleSheet("color: #b35c00; font-weight: bold;")
+            v.addWidget(off)
+
+        self.lbl_totals = QLabel()
+        self.lbl_pool = QLabel()
+        v.addWidget(self.lbl_totals)
+        v.addWidget(self.lbl_pool)
+
+        self.table = QTableView()
+        self.model = PandasModel()
+        self.table.setModel(self.model)
+        self.table.setAlternatingRowColors(True)
+        self.table.setWordWrap(False)
+        v.addWidget(self.table, 1)
+
+        buttons = QHBoxLayout()
+        btn_refresh = QPushButton("Actualizar")
+        btn_refresh.clicked.connect(self.refresh)
+        btn_clear = QPushButton("Limpiar")
+        btn_clear.clicked.connect(self.on_clear)
+        btn_export = QPushButton("Exportar JSON…")
+        btn_export.clicked.connect(self.on_export)
+        btn_close = QPushButton("Cerrar")
+        btn_close.clicked.connect(self.accept)
+        for b in (btn_refresh, btn_clear, btn_export):
+            buttons.addWidget(b)
+        buttons.addStretch()
+        buttons.addWidget(btn_close)
+        v.addLayout(buttons)
+
+    def refresh(self):
+        s = instrumentation.summary()
+        df = pd.DataFrame(s["statements"], columns=list(COLUMNS)).rename(columns=COLUMNS)
+        self.model.set_df(df)
+        total_ms = sum(g["total_ms"] for g in s["statements"])
+        self.lbl_totals.setText(
+            f"Sentencias en el buffer: {s['count']}  ·  Formas distintas: {len(s['statements'])}  ·  "
+            f"Tiempo total: {total_ms:,.0f} ms  ·  Umbral de lentas: {s['slow_ms']} ms"
+        )
+        pool = s["pool"]
+        self.lbl_pool.setText(
+            f"Pool: {pool['checkouts']} conexiones entregadas  ·  espera prom. {pool['avg_ms']} ms, "
+            f"p95 {pool['p95_ms']} ms, máx. {pool['max_ms']} ms"
+        )
+        self.table.resizeColumnsToContents()
+        self.table.setColumnWidth(0, min(self.table.columnWidth(0), 520))
+
+    def on_clear(self):
+        instrumentation.clear()
+        self.refresh()
+
+    def on_export(self):
+        default = f"sql_stats_{datetime.now():%Y%m%d_%H%M%S}.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Exportar diagnóstico", default, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            out = instrumentation.export_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"No se pudo guardar el archivo:\n{e}")
+            return
+        QMessageBox.information(self, "Exportado", f"Diagnóstico guardado en:\n{out}")
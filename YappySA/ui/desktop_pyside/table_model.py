@@ -1,32 +1,284 @@
 from __future__ import annotations
+from typing import TYPE_CHECKING
+
 from PySide6.QtCore import QAbstractTableModel, Qt, QModelIndex
-import pandas as pd
+from PySide6.QtGui import QFontDatabase
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# pandas se importa al recibir el primer DataFrame: la ventana principal
+# crea el modelo vacío antes de cargarlo (ver main.py)
+
+
+def _plain_index(df: pd.DataFrame) -> pd.DataFrame:
+    """reset_index(drop=True) solo si hace falta: evita copiar resultados grandes."""
+    import pandas as pd
+
+    idx = df.index
+    if isinstance(idx, pd.RangeIndex) and idx.start == 0 and idx.step == 1:
+        return df
+    return df.reset_index(drop=True)
+
+
+CHUNK_ROWS = 1024    # filas por bloque de textos precalculados
+MAX_CHUNKS = 256     # bloques en caché (~256k filas visitadas); se descartan los más viejos
+
+# Columnas de identificadores: fuente monoespaciada para leerlas y compararlas
+ID_COLUMNS = {"client_id", "national_id", "ruc", "uuid"}
+
+# Roles como constantes del módulo: leer Qt.DisplayRole cuesta varios µs
+# por acceso en PySide6 y data() se llama miles de veces por cuadro
+_DISPLAY = Qt.ItemDataRole.DisplayRole
+_EDIT = Qt.ItemDataRole.EditRole
+_ALIGN = Qt.ItemDataRole.TextAlignmentRole
+_FONT = Qt.ItemDataRole.FontRole
+_HORIZONTAL = Qt.Orientation.Horizontal
+_ASCENDING = Qt.SortOrder.AscendingOrder
+_DESCENDING = Qt.SortOrder.DescendingOrder
+
+
+def _display_strings(col: pd.Series) -> np.ndarray:
+    """Textos de una columna (vacío para nulos), de una vez para todo el bloque."""
+    out = col.astype(str).to_numpy(dtype=object)
+    out[col.isna().to_numpy()] = ""
+    return out
+
 
 class PandasModel(QAbstractTableModel):
-    def __init__(self, df: pd.DataFrame):
+    """
+    Modelo de solo lectura sobre un DataFrame.
+
+    data() no toca pandas: los textos se calculan vectorizados por bloques
+    de CHUNK_ROWS filas la primera vez que se pintan, y la alineación y
+    la fuente de cada columna se deciden una vez en set_df().
+
+    Ordenar (sort, clic en el encabezado) y filtrar (set_filter) no copian
+    el DataFrame: calculan una permutación de filas (argsort vectorizado)
+    y una máscara booleana, y la vista lee las filas a través de ellas.
+    """
+
+    def __init__(self, df: pd.DataFrame | None = None):
         super().__init__()
-        self._df = df.reset_index(drop=True)
+        self._df = None
+        self._chunks: dict[int, list] = {}
+        self._align: list = []
+        self._fonts: list = []
+        self._sort: tuple[int, bool] | None = None    # (columna, descendente)
+        self._filter = ""
+        self._filter_cols: list[str] | None = None
+        self._haystack: dict[int, pd.Series] = {}     # textos en minúsculas por columna (filtro)
+        self._sort_perm: np.ndarray | None = None     # filas del DataFrame en orden
+        self._mask: np.ndarray | None = None          # filas que pasan el filtro
+        self._order: np.ndarray | None = None         # fila de la vista -> fila del DataFrame
+        if df is not None:
+            self._set(df)
+
+    def _set(self, df: pd.DataFrame) -> None:
+        """Nuevo DataFrame; conserva el orden y el filtro actuales si aplican."""
+        self._df = _plain_index(df)
+        self._reset_cache()
+        if self._sort is not None and self._sort[0] >= len(self._df.columns):
+            self._sort = None
+        self._sort_perm = self._argsort(*self._sort) if self._sort is not None else None
+        self._mask = self._filter_mask()
+        self._apply_view()
+
+    def _reset_cache(self) -> None:
+        """Descarta los textos (vista y filtro) y recalcula los atributos por columna."""
+        import pandas as pd
+
+        self._chunks = {}
+        self._haystack = {}  # son de las filas anteriores
+        self._align, self._fonts = [], []
+        mono = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        right = int(Qt.AlignRight | Qt.AlignVCenter)
+        for name, dtype in self._df.dtypes.items():
+            numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+            temporal = pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype)
+            self._align.append(right if numeric or temporal else None)
+            self._fonts.append(mono if str(name).lower() in ID_COLUMNS else None)
+
+    # ---------- orden / filtro ----------
+    def _argsort(self, column: int, descending: bool) -> np.ndarray:
+        """Posiciones de las filas ordenadas por `column` (estable, nulos al final)."""
+        col = self._df.iloc[:, column]
+        try:
+            ordered = col.sort_values(ascending=not descending, kind="stable", na_position="last")
+        except TypeError:
+            # Columna object con tipos mezclados: se ordena por el texto mostrado
+            ordered = col.astype(str).where(col.notna()).sort_values(
+                ascending=not descending, kind="stable", na_position="last"
+            )
+        return ordered.index.to_numpy()
+
+    def _filter_mask(self) -> np.ndarray | None:
+        """Filas con `self._filter` (sin distinguir mayúsculas) en alguna columna."""
+        if not self._filter:
+            return None
+        import numpy as np
+
+        needle = self._filter.lower()
+        names = list(self._df.columns)
+        cols = range(len(names)) if not self._filter_cols else [
+            names.index(c) for c in self._filter_cols if c in names
+        ]
+        mask = np.zeros(len(self._df.index), dtype=bool)
+        for c in cols:
+            hay = self._haystack.get(c)
+            if hay is None:
+                col = self._df.iloc[:, c]
+                hay = self._haystack[c] = col.astype(str).str.lower().where(col.notna(), "")
+            mask |= hay.str.contains(needle, regex=False).to_numpy(dtype=bool, na_value=False)
+        return mask
+
+    def _apply_view(self) -> None:
+        perm, mask = self._sort_perm, self._mask
+        if perm is None:
+            import numpy as np
+            self._order = None if mask is None else np.flatnonzero(mask)
+        else:
+            self._order = perm if mask is None else perm[mask[perm]]
+        self._chunks = {}  # los bloques son de filas de la vista
+
+    def sort(self, column, order=_ASCENDING):
+        """Qt lo llama al hacer clic en el encabezado; column < 0 vuelve al orden original."""
+        if self._df is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        before = [self.source_row(i.row()) for i in persistent]
+        if 0 <= column < len(self._df.columns):
+            self._sort = (column, order == _DESCENDING)
+            self._sort_perm = self._argsort(*self._sort)
+        else:
+            self._sort, self._sort_perm = None, None
+        self._apply_view()
+        if persistent:
+            import numpy as np
+            where = np.full(len(self._df.index), -1)
+            where[self._order if self._order is not None else slice(None)] = np.arange(self.rowCount())
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(int(where[r]), i.column()) if where[r] >= 0 else QModelIndex()
+                 for r, i in zip(before, persistent)],
+            )
+        self.layoutChanged.emit()
+
+    def set_filter(self, text: str | None, columns: list[str] | None = None) -> None:
+        """Deja visibles las filas que contienen `text` en alguna de `columns` (todas si None)."""
+        text = (text or "").strip()
+        if text == self._filter and columns == self._filter_cols:
+            return
+        self.beginResetModel()
+        self._filter, self._filter_cols = text, columns
+        if self._df is not None:
+            self._mask = self._filter_mask()
+            self._apply_view()
+        self.endResetModel()
+
+    def source_row(self, row: int) -> int:
+        """Fila del DataFrame que se muestra en la fila `row` de la vista."""
+        return row if self._order is None else int(self._order[row])
+
+    @property
+    def total_rows(self) -> int:
+        """Filas del DataFrame, sin aplicar el filtro."""
+        return 0 if self._df is None else len(self._df.index)
+
+    @property
+    def df(self) -> pd.DataFrame | None:
+        """Lo que muestra la vista (ordenado y filtrado); lo usa pdf_utils."""
+        if self._df is None or self._order is None:
+            return self._df
+        return self._df.take(self._order).reset_index(drop=True)
+
+    # ---------- API de Qt ----------
+    def _chunk(self, n: int) -> list:
+        """Textos de las filas de la vista [n*CHUNK_ROWS, (n+1)*CHUNK_ROWS), una lista por columna."""
+        cols = self._chunks.get(n)
+        if cols is None:
+            lo, hi = n * CHUNK_ROWS, (n + 1) * CHUNK_ROWS
+            block = self._df.iloc[lo:hi] if self._order is None else self._df.take(self._order[lo:hi])
+            cols = [_display_strings(block.iloc[:, c]) for c in range(block.shape[1])]
+            if len(self._chunks) >= MAX_CHUNKS:
+                del self._chunks[next(iter(self._chunks))]
+            self._chunks[n] = cols
+        return cols
 
     def rowCount(self, parent=QModelIndex()):
-        return len(self._df.index)
+        if self._df is None:
+            return 0
+        return len(self._df.index) if self._order is None else len(self._order)
 
     def columnCount(self, parent=QModelIndex()):
-        return len(self._df.columns)
+        return 0 if self._df is None else len(self._df.columns)
 
-    def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
-            return None
-        val = self._df.iat[index.row(), index.column()]
-        return "" if pd.isna(val) else str(val)
+    def data(self, index, role=_DISPLAY):
+        if role == _DISPLAY or role == _EDIT:
+            row = index.row()
+            if row < 0:
+                return None
+            return self._chunk(row // CHUNK_ROWS)[index.column()][row % CHUNK_ROWS]
+        if role == _ALIGN:
+            return self._align[index.column()] if index.isValid() else None
+        if role == _FONT:
+            return self._fonts[index.column()] if index.isValid() else None
+        return None
 
-    def headerData(self, section, orientation, role=Qt.DisplayRole):
-        if role != Qt.DisplayRole:
+    def headerData(self, section, orientation, role=_DISPLAY):
+        if role != _DISPLAY:
             return None
-        if orientation == Qt.Horizontal:
+        if orientation == _HORIZONTAL:
             return str(self._df.columns[section])
         return str(section + 1)
 
     def set_df(self, df: pd.DataFrame):
         self.beginResetModel()
-        self._df = df.reset_index(drop=True)
+        self._set(df)
         self.endResetModel()
+
+    def prepend_rows(self, df: pd.DataFrame, key: str | None = None, max_rows: int | None = None):
+        """
+        Inserta filas nuevas al principio sin resetear el modelo.
+
+        - key: columna identificadora; se omiten filas que ya están en la vista.
+        - max_rows: si se supera, se recortan las filas del final.
+        Si las columnas no coinciden con las actuales, o hay un orden o filtro
+        activo, se hace un set_df normal.
+        """
+        if df is None or df.empty:
+            return
+        if self._df is None or list(df.columns) != list(self._df.columns):
+            self.set_df(df.head(max_rows) if max_rows else df)
+            return
+
+        if key is not None and key in df.columns:
+            df = df[~df[key].isin(self._df[key])]
+        if max_rows:
+            df = df.head(max_rows)
+        n = len(df.index)
+        if n == 0:
+            return
+
+        import pandas as pd
+
+        if self._order is not None:
+            # Con orden o filtro activos las filas nuevas no quedan necesariamente
+            # arriba: se recalcula la vista completa
+            combined = pd.concat([df, self._df], ignore_index=True)
+            self.set_df(combined.head(max_rows) if max_rows else combined)
+            return
+
+        self.beginInsertRows(QModelIndex(), 0, n - 1)
+        self._df = pd.concat([df, self._df], ignore_index=True)
+        self._reset_cache()  # los bloques cambian de filas
+        self.endInsertRows()
+
+        total = len(self._df.index)
+        if max_rows and total > max_rows:
+            self.beginRemoveRows(QModelIndex(), max_rows, total - 1)
+            self._df = self._df.iloc[:max_rows].reset_index(drop=True)
+            self._reset_cache()
+            self.endRemoveRows()
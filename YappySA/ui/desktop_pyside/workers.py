@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtWidgets import QProgressBar
+
+from YappySA.infra.db.cancellation import CancelToken, QueryCancelled
+
+# Pool compartido para las llamadas a la base de datos desde la UI
+_POOL: QThreadPool | None = None
+
+
+def db_pool() -> QThreadPool:
+    global _POOL
+    if _POOL is None:
+        _POOL = QThreadPool()
+        _POOL.setMaxThreadCount(4)
+    return _POOL
+
+
+class _JobSignals(QObject):
+    finished = Signal(int, object)
+    failed = Signal(int, object)
+    cancelled = Signal(int)
+
+
+class _Job(QRunnable):
+    def __init__(self, gen: int, fn, token: CancelToken):
+        super().__init__()
+        self.gen = gen
+        self.fn = fn
+        self.token = token
+        self.signals = _JobSignals()
+
+    def run(self):
+        try:
+            result = self.fn(self.token)
+        except QueryCancelled:
+            self.signals.cancelled.emit(self.gen)
+        except Exception as e:
+            self.signals.failed.emit(self.gen, e)
+        else:
+            self.signals.finished.emit(self.gen, result)
+
+
+class QueryRunner(QObject):
+    """
+    Ejecuta funciones de consulta en el pool de BD; gana la petición más reciente.
+
+    submit(fn, on_done, on_error) cancela la petición anterior (CancelToken →
+    cancel del driver) y descarta cualquier resultado que no sea el último.
+    fn recibe el CancelToken y debe pasarlo a las funciones de queries.py.
+    """
+
+    busy_changed = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._gen = 0
+        self._token: CancelToken | None = None
+        self._callbacks: dict[int, tuple] = {}
+        self._jobs: dict[int, _Job] = {}
+
+    @property
+    def busy(self) -> bool:
+        return bool(self._jobs)
+
+    def submit(self, fn, on_done, on_error=None) -> int:
+        self.cancel()
+        self._gen += 1
+        gen = self._gen
+        self._token = CancelToken()
+
+        job = _Job(gen, fn, self._token)
+        job.setAutoDelete(False)
+        job.signals.finished.connect(self._on_finished)
+        job.signals.failed.connect(self._on_failed)
+        job.signals.cancelled.connect(self._on_cancelled)
+        self._callbacks[gen] = (on_done, on_error)
+
+        was_busy = self.busy
+        self._jobs[gen] = job
+        if not was_busy:
+            self.busy_changed.emit(True)
+        db_pool().start(job)
+        return gen
+
+    def cancel(self) -> None:
+        """Cancela la petición en curso (si hay) sin esperar a que termine."""
+        if self._token is not None:
+            self._token.cancel()
+            self._token = None
+        self._callbacks.clear()  # sus resultados ya no interesan
+
+    def _release(self, gen: int):
+        self._jobs.pop(gen, None)
+        callbacks = self._callbacks.pop(gen, (None, None))
+        if not self._jobs:
+            self.busy_changed.emit(False)
+        # Solo cuenta el resultado de la petición más reciente
+        return callbacks if gen == self._gen else (None, None)
+
+    def _on_finished(self, gen: int, result):
+        on_done, _ = self._release(gen)
+        if on_done is not None:
+            on_done(result)
+
+    def _on_failed(self, gen: int, error):
+        _, on_error = self._release(gen)
+        if on_error is not None:
+            on_error(error)
+
+    def _on_cancelled(self, gen: int):
+        self._release(gen)
+
+
+class BusySpinner(QProgressBar):
+    """Indicador de actividad (barra indeterminada) que sigue a uno o más QueryRunner."""
+
+    def __init__(self, parent=None, width: int = 120):
+        super().__init__(parent)
+        self.setRange(0, 0)
+        self.setTextVisible(False)
+        self.setFixedWidth(width)
+        self.setFixedHeight(12)
+        self.hide()
+        self._busy: set[int] = set()
+
+    def follow(self, runner: QueryRunner) -> None:
+        key = id(runner)
+        runner.busy_changed.connect(lambda busy, k=key: self._set_busy(k, busy))
+
+    def _set_busy(self, key: int, busy: bool):
+        if busy:
+            self._busy.add(key)
+        else:
+            self._busy.discard(key)
+        self.setVisible(bool(self._busy))
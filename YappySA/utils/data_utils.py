@@ -40,8 +40,12 @@ def normalize_headers(df: pd.DataFrame) -> pd.DataFrame:
     return df.rename(columns=mapping)
 
 
+def load_excel(path: str) -> pd.DataFrame:
+    return pd.read_excel(path)
+
+
 def load_excel_normalized(path: str) -> pd.DataFrame:
-    df = pd.read_excel(path)
+    df = load_excel(path)
     df = normalize_headers(df)
     return df
 
@@ -0,0 +1,203 @@
+# YappySA/utils/synthetic.py
+"""
+Generador de clientes sintéticos para pruebas de carga.
+
+generate_clients(n, seed=...) arma un DataFrame con la forma de los Excel
+que importa el pipeline. Es determinista (misma semilla → mismas filas) y
+vectorizado con numpy: un millón de filas en pocos segundos.
+
+Defectos configurables (proporción de filas, 0..1):
+  - duplicate_rate:   cédula/RUC repetido de otra fila del mismo tipo
+  - missing_ruc_rate: clientes comerciales sin RUC
+  - bad_email_rate:   correos sin "@dominio"
+  - float_id_rate:    teléfono y RUC como float (p. ej. 60001234.0),
+                      como quedan cuando Excel los guarda como número
+
+Layouts de encabezados:
+  - "canonical": client_type, name, national_id, company_name, ruc, email, phone, alias
+  - "alias":     Tipo, Full_Name, Cedula, Razon_Social, RUC_Empresa, Correo, Telefono, Alias
+                 (ver ALIASES en data_utils.py; tipo en minúsculas y "comercial")
+
+CLI: python -m YappySA.tools.synth_clients
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+CANONICAL_COLUMNS = ["client_type", "name", "national_id", "company_name", "ruc", "email", "phone", "alias"]
+
+ALIAS_HEADERS = {
+    "client_type": "Tipo",
+    "name": "Full_Name",
+    "national_id": "Cedula",
+    "company_name": "Razon_Social",
+    "ruc": "RUC_Empresa",
+    "email": "Correo",
+    "phone": "Telefono",
+    "alias": "Alias",
+}
+
+LAYOUTS = ("canonical", "alias")
+FORMATS = ("xlsx", "csv", "parquet")
+XLSX_MAX_ROWS = 1_048_575  # filas de datos por hoja (más el encabezado)
+
+_FIRST = np.array([
+    "Ana", "Juan", "Lucía", "Carlos", "María", "José", "Sofía", "Luis", "Valeria", "Diego",
+    "Camila", "Andrés", "Isabel", "Jorge", "Gabriela", "Ricardo", "Daniela", "Fernando",
+    "Paola", "Miguel", "Elena", "Raúl", "Natalia", "Héctor",
+], dtype=object)
+_LAST = np.array([
+    "Pérez", "Ríos", "Reyes", "Ruiz", "González", "Rodríguez", "Herrera", "Castillo",
+    "Vásquez", "Moreno", "Jiménez", "Sánchez", "Batista", "Quintero", "Samaniego",
+    "Araúz", "Barría", "Delgado", "Espinosa", "Córdoba",
+], dtype=object)
+_COMPANY_A = np.array([
+    "Alimentos", "Soluciones", "Energía", "Servicios", "Distribuidora", "Comercial",
+    "Inversiones", "Logística", "Constructora", "Tecnología", "Farmacia", "Transportes",
+], dtype=object)
+_COMPANY_B = np.array([
+    "del Norte", "del Istmo", "& Más", "Global", "Panamá", "Central", "del Pacífico",
+    "Caribe", "Andina", "Express", "Integral", "Unidos",
+], dtype=object)
+_COMPANY_SUFFIX = np.array(["S.A.", "Corp.", "Inc.", "S. de R.L.", ""], dtype=object)
+_DOMAINS = np.array(["gmail.com", "hotmail.com", "yahoo.com", "outlook.com", "empresa.com.pa"], dtype=object)
+
+_ASCII = str.maketrans("áéíóúÁÉÍÓÚñÑ", "aeiouAEIOUnN")
+
+
+# Las columnas de texto se arman con take() sobre vocabularios pequeños (y luego
+# concatenando columnas): convertir un millón de objetos str uno a uno es lo lento.
+def _pick(words, codes: np.ndarray) -> pd.Series:
+    return pd.Series(pd.array(list(words), dtype="string").take(codes))
+
+
+def _number(values: np.ndarray, upper: int, width: int = 0) -> pd.Series:
+    """Enteros 0 <= v < upper como texto (con ceros a la izquierda hasta width)."""
+    return _pick((str(i).zfill(width) for i in range(upper)), values)
+
+
+def _slug(words: np.ndarray) -> list:
+    """Versión para correos/alias (sin tildes ni símbolos) de cada palabra del vocabulario."""
+    return ["".join(c for c in w.translate(_ASCII).lower() if c.isalnum()) for w in words]
+
+
+def generate_clients(
+    n: int,
+    *,
+    seed: int = 0,
+    commercial_ratio: float = 0.3,
+    duplicate_rate: float = 0.0,
+    missing_ruc_rate: float = 0.0,
+    bad_email_rate: float = 0.0,
+    float_id_rate: float = 0.0,
+    layout: str = "canonical",
+) -> pd.DataFrame:
+    """N clientes personales/comerciales con los defectos indicados."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Layout no soportado: {layout!r} (usa {', '.join(LAYOUTS)})")
+    n = int(n)
+    rng = np.random.default_rng(seed)
+    idx = np.arange(n)
+    commercial = rng.random(n) < commercial_ratio
+
+    # Se sortean índices del vocabulario; las cadenas se arman una vez por columna
+    fi = rng.integers(0, len(_FIRST), n)
+    li = rng.integers(0, len(_LAST), n)
+    ca = rng.integers(0, len(_COMPANY_A), n)
+    person = _pick(_FIRST, fi) + " " + _pick(_LAST, li)
+    company = (
+        _pick(_COMPANY_A, ca) + " "
+        + _pick(_COMPANY_B, rng.integers(0, len(_COMPANY_B), n)) + " "
+        + _pick(_COMPANY_SUFFIX, rng.integers(0, len(_COMPANY_SUFFIX), n))
+    ).str.rstrip()
+
+    # Identificadores únicos: permutación de 0..n-1 escrita en base mixta
+    perm = rng.permutation(n)
+    nid = (
+        _number(1 + perm % 13, 14) + "-"
+        + _number(perm // 13 % 10_000, 10_000) + "-"
+        + _number(1_000 + perm // 130_000, 1_000 + n // 130_000 + 1)
+    )
+    ruc = (
+        _number(1 + perm % 99, 100) + "-"
+        + _number(perm // 99 % 10_000, 10_000) + "-"
+        + _number(100_000 + perm // 990_000, 100_000 + n // 990_000 + 1)
+    )
+
+    suffix = pd.Series((idx + 1).astype(str), dtype="string")
+    first_slug = _pick(_slug(_FIRST), fi)
+    company_slug = _pick(_slug(_COMPANY_A), ca)
+    user = first_slug + "." + _pick(_slug(_LAST), li) + suffix
+    local = ("ventas" + suffix).where(commercial, user)
+    domain = _pick(_DOMAINS, rng.integers(0, len(_DOMAINS), n))
+    email = local + "@" + (company_slug + ".com").where(commercial, domain)
+
+    phone_digits = rng.integers(60_000_000, 69_999_999, n, endpoint=True)
+    phone = "+507 " + _number(phone_digits // 10_000, 7_000) + "-" + _number(phone_digits % 10_000, 10_000, 4)
+    alias = (company_slug + suffix).where(commercial, _pick([w[:6] for w in _slug(_FIRST)], fi) + suffix)
+
+    df = pd.DataFrame({
+        "client_type": _pick(["PERSONAL", "COMMERCIAL"], commercial.astype(np.int8)),
+        "name": (company + " - Contacto").where(commercial, person),
+        "national_id": nid.where(~commercial, None),
+        "company_name": company.where(commercial, None),
+        "ruc": ruc.where(commercial, None),
+        "email": email,
+        "phone": phone,
+        "alias": alias,
+    })
+
+    # --- Defectos ---
+    def pick(mask: np.ndarray, rate: float) -> np.ndarray:
+        return mask & (rng.random(n) < rate) if rate > 0 else np.zeros(n, dtype=bool)
+
+    personal = ~commercial
+    for col, kind_mask in (("national_id", personal), ("ruc", commercial)):
+        dup = pick(kind_mask, duplicate_rate)
+        pool = np.flatnonzero(kind_mask & ~dup)
+        if dup.any() and len(pool):
+            df.loc[dup, col] = df[col].to_numpy()[rng.choice(pool, size=int(dup.sum()))]
+
+    df.loc[pick(commercial, missing_ruc_rate), "ruc"] = None
+    bad = pick(np.ones(n, dtype=bool), bad_email_rate)
+    df.loc[bad, "email"] = local[bad]
+
+    mangled = pick(np.ones(n, dtype=bool), float_id_rate)
+    if mangled.any():
+        df["phone"] = df["phone"].astype(object)
+        df.loc[mangled, "phone"] = phone_digits[mangled].astype(float)
+        ruc_mangled = mangled & df["ruc"].notna().to_numpy()
+        df["ruc"] = df["ruc"].astype(object)
+        df.loc[ruc_mangled, "ruc"] = (
+            df.loc[ruc_mangled, "ruc"].str.replace("-", "", regex=False).astype(float)
+        )
+
+    if layout == "alias":
+        df["client_type"] = _pick(["personal", "comercial"], commercial.astype(np.int8))
+        df = df.rename(columns=ALIAS_HEADERS)
+    return df
+
+
+def write_clients(df: pd.DataFrame, path: str | Path, fmt: str | None = None) -> Path:
+    """
+    Guarda el DataFrame generado como xlsx, csv (utf-8-sig, como exporter.py)
+    o parquet (requiere pyarrow). Sin fmt se deduce de la extensión.
+    """
+    path = Path(path)
+    fmt = (fmt or path.suffix.lstrip(".")).lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt!r} (usa {', '.join(FORMATS)})")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    elif fmt == "parquet":
+        # Columnas mixtas (float + texto) no entran en un tipo Arrow único
+        df.astype({c: "string" for c in df.columns if df[c].dtype == object}).to_parquet(path, index=False)
+    else:
+        if len(df) > XLSX_MAX_ROWS:
+            raise ValueError(f"Un .xlsx admite {XLSX_MAX_ROWS} filas por hoja; usa csv o parquet.")
+        df.to_excel(path, index=False)
+    return path
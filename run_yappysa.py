@@ -54,6 +54,9 @@ def _load_env_file(env_path: Path) -> None:
 
 
 def main() -> None:
+    # Lo primero: los tiempos de arranque se miden desde aquí
+    from YappySA.core import startup
+
     base_dir = _set_workdir_to_exe_folder()
 
     # Cargar .env manualmente ANTES de importar nada de YappySA.core.settings
@@ -61,6 +64,7 @@ def main() -> None:
 
     # Importar la app principal después de tener el entorno listo
     from YappySA.ui.desktop_pyside.main import main as gui_main
+    startup.mark("ui_imported")
     gui_main()
 
 
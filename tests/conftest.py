@@ -0,0 +1,17 @@
+import pytest
+
+from YappySA.core.settings import Settings, override_settings
+from YappySA.infra.db import migrations, session
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Base SQLite temporal con el esquema y los índices; settings por defecto."""
+    override_settings(Settings.model_construct())
+    session.use_engine(f"sqlite:///{tmp_path / 'yappysa.db'}")
+    engine = session.get_engine()
+    migrations.create_schema(engine)
+    migrations.ensure_indexes(engine)
+    yield engine
+    session.use_engine(None)
+    override_settings(None)
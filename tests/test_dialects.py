@@ -0,0 +1,130 @@
+"""
+repository.py y queries.py se comportan igual en cada motor.
+
+SQLite corre siempre (archivo temporal). SQL Server solo si pyodbc está
+instalado y YAPPYSA_TEST_MSSQL_URL apunta a una base de pruebas, p. ej.
+  YAPPYSA_TEST_MSSQL_URL="mssql+pyodbc://...pruebas..." python -m pytest tests
+Las filas se insertan de verdad (con commit) y se borran al terminar.
+"""
+import importlib.util
+import os
+import time
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import text
+
+from YappySA.core.settings import Settings, override_settings
+from YappySA.infra.db import migrations, session
+from YappySA.infra.db.dialects import Dialect, MSSQLDialect, SQLiteDialect, dialect_of
+from YappySA.infra.db.queries import fetch_clients_by_ids, fetch_recent_clients, query_clients_filtered
+from YappySA.infra.db.repository import upsert_client_and_contacts
+
+_BOTH = ["PERSONAL", "COMMERCIAL"]
+MSSQL_URL = os.environ.get("YAPPYSA_TEST_MSSQL_URL")
+
+
+def _dto(**kw) -> SimpleNamespace:
+    base = dict(name="", national_id="", company_name="", email="", phone="", alias="", ruc="")
+    base.update(kw)
+    return SimpleNamespace(**base)
+
+
+@pytest.fixture(params=[
+    "sqlite",
+    pytest.param("mssql", marks=pytest.mark.skipif(
+        importlib.util.find_spec("pyodbc") is None or not MSSQL_URL,
+        reason="requiere pyodbc y YAPPYSA_TEST_MSSQL_URL",
+    )),
+])
+def ctx(request, tmp_path):
+    url = f"sqlite:///{tmp_path / 'dialects.db'}" if request.param == "sqlite" else MSSQL_URL
+    # Valores por defecto de settings (sin réplicas ni tablas opcionales), con o sin .env
+    override_settings(Settings.model_construct())
+    session.use_engine(url)
+    engine = session.get_engine()
+    migrations.create_schema(engine)
+    migrations.ensure_indexes(engine)
+    assert dialect_of(engine).name == request.param
+
+    tag = uuid.uuid4().hex[:8].upper()
+    state = SimpleNamespace(ids=[], nid=f"CHK-{tag}", ruc=f"CHK-RUC-{tag}")
+    try:
+        state.personal = _insert(state, _dto(name="Persona Prueba", national_id=state.nid,
+                                             email="p@prueba.test"), "PERSONAL")
+        state.commercial = _insert(state, _dto(name="Rep", company_name="Empresa Prueba",
+                                               ruc=state.ruc), "COMMERCIAL")
+        yield state
+    finally:
+        _cleanup(state.ids)
+        session.use_engine(None)
+        override_settings(None)
+
+
+def _insert(state, dto, kind: str) -> str:
+    with session.get_sessionmaker()() as s, s.begin():
+        cid = str(upsert_client_and_contacts(s, dto, kind))
+    state.ids.append(cid)
+    time.sleep(0.01)  # created_at distinto entre inserciones
+    return cid
+
+
+def _cleanup(ids) -> None:
+    if not ids:
+        return
+    params = {f"id_{i}": cid for i, cid in enumerate(ids)}
+    holders = ", ".join(f":{k}" for k in params)
+    with session.get_engine().begin() as conn:
+        for table in ("contact_info", "personal_client", "commercial_client", "client"):
+            conn.execute(text(f"DELETE FROM {table} WHERE client_id IN ({holders})"), params)
+
+
+def test_insert_returns_uuid(ctx):
+    assert len(ctx.personal) == 36 and len(ctx.commercial) == 36
+
+
+def test_recent_order(ctx):
+    df = fetch_recent_clients(limit=2, source="primary")
+    assert [str(x).upper() for x in df["client_id"]] == [ctx.commercial.upper(), ctx.personal.upper()]
+
+
+def test_display_name(ctx):
+    df = fetch_clients_by_ids([ctx.personal, ctx.commercial])
+    names = dict(zip((str(x).upper() for x in df["client_id"]), df["display_name"]))
+    assert names[ctx.personal.upper()] == "Persona Prueba"
+    assert names[ctx.commercial.upper()] == "Empresa Prueba"
+
+
+def test_filter_national_id(ctx):
+    df = query_clients_filtered(kinds=_BOTH, national_id=ctx.nid, source="primary")
+    assert len(df) == 1 and df.iloc[0]["email"] == "p@prueba.test"
+
+
+def test_filter_ruc_and_kind(ctx):
+    assert len(query_clients_filtered(kinds=["COMMERCIAL"], ruc=ctx.ruc, source="primary")) == 1
+    assert len(query_clients_filtered(kinds=["PERSONAL"], ruc=ctx.ruc, source="primary")) == 0
+
+
+@pytest.mark.parametrize("case", [str.lower, str.upper])
+def test_filter_uuid_any_case(ctx, case):
+    assert len(query_clients_filtered(kinds=_BOTH, uuid=case(ctx.personal), source="primary")) == 1
+
+
+def test_limit(ctx):
+    assert len(query_clients_filtered(kinds=_BOTH, limit=1, source="primary")) == 1
+
+
+def test_duplicate_national_id_rolls_back(ctx):
+    with pytest.raises(ValueError, match=ctx.nid):
+        _insert(ctx, _dto(name="Otra", national_id=ctx.nid), "PERSONAL")
+    assert len(query_clients_filtered(kinds=_BOTH, national_id=ctx.nid, source="primary")) == 1
+
+
+def test_dialect_requires_overrides():
+    class Partial(Dialect):
+        name = "parcial"
+
+    with pytest.raises(TypeError):
+        Partial()
+    assert {d.name for d in (MSSQLDialect(), SQLiteDialect())} == {"mssql", "sqlite"}
@@ -0,0 +1,32 @@
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from YappySA.infra.reporting.exporter import export_frames
+
+
+def _parts():
+    # Primera parte sin valores en "email": pyarrow la tipa como null
+    yield pd.DataFrame({"client_id": ["a", "b"], "email": [None, None]})
+    yield pd.DataFrame({"client_id": ["c"], "email": ["c@x.com"]})
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_columnar_export_with_leading_null_part(tmp_path, fmt):
+    path = tmp_path / f"out.{fmt}"
+    assert export_frames(_parts(), str(path), fmt) == 3
+
+    back = pd.read_parquet(path) if fmt == "parquet" else pd.read_feather(path)
+    assert back["client_id"].tolist() == ["a", "b", "c"]
+    assert back["email"].isna().tolist() == [True, True, False]
+    assert back["email"].iloc[2] == "c@x.com"
+
+
+def test_jsonl_export_with_leading_null_part(tmp_path):
+    path = tmp_path / "out.jsonl.gz"
+    assert export_frames(_parts(), str(path), "jsonl.gz") == 3
+
+    lines = pa.input_stream(str(path), compression="gzip").read().decode().splitlines()
+    assert [json.loads(line)["email"] for line in lines] == [None, None, "c@x.com"]
@@ -0,0 +1,48 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pandas as pd
+import pytest
+from PySide6.QtWidgets import QApplication, QTableView
+
+from YappySA.ui.desktop_pyside import pdf_utils
+from YappySA.ui.desktop_pyside.table_model import PandasModel
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def _frame(n=5):
+    return pd.DataFrame({
+        "client_id": [f"id-{i}" for i in range(n)],
+        "email": [None if i % 2 else f"c{i}@x.com" for i in range(n)],
+        "n": list(range(n)),
+    })
+
+
+def test_blocks_come_from_dataframe_columns(monkeypatch):
+    model = PandasModel(_frame())
+    monkeypatch.setattr(model, "index", lambda *a: pytest.fail("lectura celda por celda del modelo"))
+
+    blocks = list(pdf_utils._iter_blocks(model, model.df, 5))
+    assert blocks[0][0] == [f"id-{i}" for i in range(5)]
+    assert blocks[0][2] == [str(i) for i in range(5)]
+
+
+def test_model_without_dataframe_uses_view_texts():
+    model = PandasModel(_frame(3))
+    blocks = list(pdf_utils._iter_blocks(model, None, 3))
+    assert blocks == [[
+        [model.index(r, c).data() or "" for r in range(3)] for c in range(3)
+    ]]
+
+
+def test_export_table_to_pdf(tmp_path):
+    table = QTableView()
+    table.setModel(PandasModel(_frame(50)))
+    path = tmp_path / "tabla.pdf"
+    assert pdf_utils.export_table_to_pdf(table, str(path)) >= 1
+    assert path.read_bytes().startswith(b"%PDF")
@@ -0,0 +1,65 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pandas as pd
+import pytest
+from PySide6.QtWidgets import QApplication, QMessageBox
+
+from YappySA.infra.db.cancellation import CancelToken, QueryCancelled
+from YappySA.infra.reporting.exporter import export_frames
+from YappySA.ui.desktop_pyside import query_export_dialog as qed
+
+
+@pytest.fixture
+def dialog(sqlite_db):
+    app = QApplication.instance() or QApplication([])
+    dlg = qed.QueryExportDialog()
+    yield dlg
+    dlg.export_runner._jobs.clear()
+    app.processEvents()
+
+
+def _exporting(dlg):
+    dlg.export_runner._jobs[1] = object()  # como si hubiera una exportación en el pool
+    dlg.export_runner._token = token = CancelToken()
+    return token
+
+
+def test_close_during_export_keeps_it_running_if_not_confirmed(dialog, monkeypatch):
+    token = _exporting(dialog)
+    monkeypatch.setattr(QMessageBox, "question", lambda *a, **k: QMessageBox.No)
+    closed = []
+    monkeypatch.setattr(qed.QDialog, "done", lambda self, r: closed.append(r))
+
+    dialog.done(0)
+    assert closed == [] and not token.cancelled
+
+
+def test_close_during_export_cancels_when_confirmed(dialog, monkeypatch):
+    token = _exporting(dialog)
+    monkeypatch.setattr(QMessageBox, "question", lambda *a, **k: QMessageBox.Yes)
+    closed = []
+    monkeypatch.setattr(qed.QDialog, "done", lambda self, r: closed.append(r))
+
+    dialog.done(0)
+    assert closed == [0] and token.cancelled
+
+
+@pytest.mark.parametrize("fmt", ["csv", "xlsx", "parquet"])
+def test_cancelled_export_leaves_no_file(tmp_path, fmt):
+    token = CancelToken()
+    path = tmp_path / f"out.{fmt}"
+
+    def frames():
+        yield pd.DataFrame({"a": ["x"]})
+        token.cancel()
+        yield pd.DataFrame({"a": ["y"]})
+
+    with pytest.raises(QueryCancelled):
+        try:
+            export_frames(qed._until_cancelled(frames(), token), str(path), fmt=fmt)
+        except QueryCancelled:
+            qed._discard_partial(str(path))
+            raise
+    assert not path.exists()
@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError, ProgrammingError
+
+from YappySA.infra.db import queries
+
+
+@pytest.fixture
+def routing(monkeypatch, tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    marked = []
+    monkeypatch.setattr(queries, "get_engine", lambda: primary)
+    monkeypatch.setattr(queries, "_engine_for", lambda source="auto": replica)
+    monkeypatch.setattr(queries, "mark_unhealthy", marked.append)
+    return primary, replica, marked
+
+
+def test_query_error_on_replica_is_not_a_failover(routing):
+    _, _, marked = routing
+
+    def work(conn):
+        raise ProgrammingError("SELECT ...", {}, Exception("sintaxis"))
+
+    with pytest.raises(ProgrammingError):
+        queries._run_read("auto", work)
+    assert marked == []
+
+
+def test_pandas_wrapped_error_is_not_a_failover(routing):
+    _, _, marked = routing
+    with pytest.raises(pd.errors.DatabaseError):
+        queries._run_read("auto", lambda conn: pd.read_sql_query(text("SELEC 1"), conn))
+    assert marked == []
+
+
+def test_lost_connection_fails_over_to_primary(routing):
+    primary, replica, marked = routing
+
+    def work(conn):
+        if conn.engine is replica:
+            raise DBAPIError("SELECT 1", {}, Exception("red"), connection_invalidated=True)
+        return "primary"
+
+    assert queries._run_read("auto", work) == "primary"
+    assert marked == [replica]
+
+
+def test_connect_error_fails_over_to_primary(routing, monkeypatch, tmp_path):
+    primary, _, marked = routing
+    down = create_engine(f"sqlite:///{tmp_path / 'no' / 'existe.db'}")
+    monkeypatch.setattr(queries, "_engine_for", lambda source="auto": down)
+
+    assert queries._run_read("auto", lambda conn: conn.engine is primary)
+    assert marked == [down]
@@ -0,0 +1,55 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from types import SimpleNamespace
+
+import pytest
+
+from YappySA.core.settings import get_settings
+from YappySA.infra.db import search_index, session
+from YappySA.infra.db.queries import search_clients
+from YappySA.infra.db.repository import upsert_client_and_contacts
+
+
+def _add_client(name, email):
+    dto = SimpleNamespace(name=name, national_id="", company_name="", email=email,
+                          phone="", alias="", ruc="")
+    with session.get_sessionmaker()() as s, s.begin():
+        upsert_client_and_contacts(s, dto, "PERSONAL")
+
+
+def test_search_with_empty_index_is_an_error(sqlite_db):
+    with sqlite_db.begin() as conn:
+        search_index.create_table(conn)
+    _add_client("Ana Pérez", "ana@example.com")
+
+    with pytest.raises(RuntimeError, match="client_token"):
+        search_clients("ana")
+
+
+def test_search_after_building_index(sqlite_db):
+    with sqlite_db.begin() as conn:
+        search_index.create_table(conn)
+    _add_client("Ana Pérez", "ana@example.com")
+    with sqlite_db.begin() as conn:
+        search_index.rebuild(conn)
+
+    assert search_clients("perez")["display_name"].tolist() == ["Ana Pérez"]
+    assert search_clients("zzzz").empty  # índice con filas: sin coincidencias no es error
+
+
+def test_dialog_disables_search_without_index(sqlite_db):
+    from PySide6.QtWidgets import QApplication
+    from YappySA.ui.desktop_pyside.query_export_dialog import QueryExportDialog
+
+    app = QApplication.instance() or QApplication([])
+    assert not get_settings().SEARCH_INDEX_ENABLED
+    dlg = QueryExportDialog()
+    assert not dlg.le_search.isEnabled()
+    dlg.le_search.setText("ana")
+    assert dlg._gather()[-1] is None
+
+    get_settings().SEARCH_INDEX_ENABLED = True
+    assert QueryExportDialog().le_search.isEnabled()
+    app.processEvents()
@@ -0,0 +1,40 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pandas as pd
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from YappySA.ui.desktop_pyside.table_model import PandasModel
+
+
+@pytest.fixture(scope="module", autouse=True)
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def _names(model):
+    return [model.data(model.index(r, 0)) for r in range(model.rowCount())]
+
+
+def test_filter_after_prepend_sees_new_rows():
+    model = PandasModel(pd.DataFrame({"name": ["bob", "dan", "eve"]}))
+    model.set_filter("bob")
+    model.set_filter("")
+    model.prepend_rows(pd.DataFrame({"name": ["zed"]}), key="name")
+
+    model.set_filter("zed")
+    assert _names(model) == ["zed"]
+    model.set_filter("eve")
+    assert _names(model) == ["eve"]
+
+
+def test_filter_after_prepend_with_trim():
+    model = PandasModel(pd.DataFrame({"name": ["bob", "dan", "eve"]}))
+    model.set_filter("e")
+    model.set_filter("")
+    model.prepend_rows(pd.DataFrame({"name": ["zed", "amy"]}), key="name", max_rows=3)
+
+    model.set_filter("e")
+    assert _names(model) == ["zed"]